@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Checkpoints of resumable conversions
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Generator
+from zope.interface import implementer
+from vzg.jconv.archives.sources import SourceMember
+from vzg.jconv.interfaces import ISource
+
+
+class Checkpoint:
+    """Progress of a conversion
+
+    The checkpoint file is a JSON object with the delivery signature,
+    the number of converters, the completed archive members with their
+    CRC, size and output locations and the positions of the output files,
+    their sizes or for ZIP files the offset and the central directory.
+
+    It is committed atomically, at most once per `interval` seconds
+    and only after a completed member. Before the commit the sink and
+    the index are flushed, so the outputs hold exactly the articles of
+    the completed members and the index has all of them. A resumed run
+    truncates the outputs to these positions. After the commit the
+    functions in `commits` are called, e.g. to make the keys of the
+    deduplication durable.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the checkpoint file
+    interval : float
+        Minimal number of seconds between two commits
+    """
+
+    def __init__(self, path: Path, interval: float = 60) -> None:
+        self.path = Path(path)
+        self.interval = interval
+
+        self.signature = str(uuid.uuid4())
+        self.counter = 0
+        self.finished = False
+        self.members = {}
+        self.positions = {}
+
+        self.sink = None
+        self.index = None
+        self.commits = []
+        self.outputs = []
+        self.committed = time.monotonic()
+
+    def load(self) -> bool:
+        """Read the checkpoint of a former run, if there is one"""
+        logger = logging.getLogger(__name__)
+
+        if not self.path.is_file():
+            msg = f"No checkpoint {self.path}, starting from scratch"
+            logger.warning(msg)
+            return False
+
+        with self.path.open() as fh:
+            data = json.load(fh)
+
+        self.signature = data["signature"]
+        self.counter = data["counter"]
+        self.finished = data["finished"]
+        self.members = data["members"]
+        self.positions = data["positions"]
+
+        msg = f"Resume {self.path}: {len(self.members)} completed member(s)"
+        logger.info(msg)
+
+        return True
+
+    def done(self, member: SourceMember) -> bool:
+        """Has the member been converted completely?"""
+        entry = self.members.get(member.name)
+
+        if entry is None:
+            return False
+
+        return entry["size"] == member.size and entry["crc"] == member.crc
+
+    def output(self, location: str) -> None:
+        """Remember the location of an article of the current member"""
+        self.outputs.append(location)
+
+    def complete(self, member: SourceMember) -> None:
+        """All articles of the member have been written"""
+        self.members[member.name] = {
+            "crc": member.crc,
+            "size": member.size,
+            "outputs": self.outputs,
+        }
+        self.outputs = []
+
+        if time.monotonic() - self.committed >= self.interval:
+            self.save()
+
+    def save(self) -> None:
+        """Flush the sink and the index and write the checkpoint atomically"""
+        logger = logging.getLogger(__name__)
+
+        if self.sink is not None:
+            self.positions = self.sink.flush()
+
+        # Rows of articles written again after a resume are replaced
+        if self.index is not None:
+            self.index.flush()
+
+        data = {
+            "signature": self.signature,
+            "counter": self.counter,
+            "finished": self.finished,
+            "positions": self.positions,
+            "members": self.members,
+        }
+
+        tmppath = self.path.with_name(f"{self.path.name}.tmp")
+
+        with tmppath.open("w") as fh:
+            json.dump(data, fh)
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        os.replace(tmppath, self.path)
+
+        for commit in self.commits:
+            commit()
+
+        self.committed = time.monotonic()
+
+        msg = f"Checkpoint {self.path}: {len(self.members)} member(s)"
+        logger.debug(msg)
+
+
+@implementer(ISource)
+class CheckpointSource:
+    """Skip completed members of a source and record the completed ones
+
+    A member is complete when the next one is requested, because the
+    archives create the converters of a member before reading the next.
+    """
+
+    def __init__(self, source: ISource, checkpoint: Checkpoint) -> None:
+        self.source = source
+        self.checkpoint = checkpoint
+
+    @property
+    def members(self) -> Generator[SourceMember, None, None]:
+        logger = logging.getLogger(__name__)
+
+        for member in self.source.members:
+            if self.checkpoint.done(member):
+                msg = f"Übersprungen {member.name}"
+                logger.debug(msg)
+                continue
+
+            yield member
+
+            self.checkpoint.complete(member)
+
+    @property
+    def num_files(self) -> int:
+        return self.source.num_files
@@ -10,20 +10,30 @@
 """
 
 import datetime
+import gzip
+import io
 import logging
 import pymarc
-import tempfile
-import zipfile
 from dataclasses import dataclass, field
 from lxml import etree
 from pathlib import Path
-from typing import Generator
+from types import MappingProxyType
+from typing import BinaryIO, Generator
 from zope.interface import implementer
 from vzg.jconv.gapi import NAMESPACES, OAI_DC_RECORD_XPATHS
+from vzg.jconv.gapi import OAI_DC_TAG, OAI_DC_RECORD_TAGS
 from vzg.jconv.gapi import OAI_DC_HEADER_XPATHS, OAI_ARTICLES_TYPES
+from vzg.jconv.gapi import MARC_BINARY_SUFFIXES
+from vzg.jconv import stats
 from vzg.jconv.interfaces import IArchive
+from vzg.jconv.archives.sources import SourceMember, is_glob, open_source
+from vzg.jconv.archives.watermark import Watermark
+from vzg.jconv.cache import ResultCache
 from vzg.jconv.converter.MarcXmlConverter import MarcConverter
 from vzg.jconv.converter.oai import OAIDCConverter
+from vzg.jconv.converter.snapshot import CachedConverter
+
+GZIP_MAGIC = b"\x1f\x8b"
 
 
 @dataclass
@@ -66,9 +76,42 @@ class Header:
 
 
 class Metadata:
-    def __init__(self, element, map):
+    """OAI-DC metadata of a record
+
+    The children of oai_dc:dc are decoded in a single walk into an
+    immutable mapping of field names to tuples of values.
+    """
+
+    def __init__(self, element, map=OAI_DC_RECORD_XPATHS):
         self._element = element
         self._map = map
+        self.fields = self.__decode__()
+
+    def __decode__(self) -> MappingProxyType:
+        values = {name: [] for name in self._map}
+        langkey = f"{{{NAMESPACES['xml']}}}lang"
+
+        dcnode = next(self._element.iter(OAI_DC_TAG), None)
+
+        if dcnode is None:
+            return MappingProxyType({name: () for name in values})
+
+        for node in dcnode:
+            name = OAI_DC_RECORD_TAGS.get(node.tag)
+
+            if name not in values:
+                continue
+
+            if node.text is not None:
+                values[name].append(node.text)
+
+            if len(node) > 0:
+                values[name] += [child.tail for child in node if child.tail]
+
+            if name == "description" and langkey in node.attrib:
+                values["description_language"].append(node.attrib[langkey])
+
+        return MappingProxyType({name: tuple(val) for name, val in values.items()})
 
     def element(self):
         return self._element
@@ -77,135 +120,379 @@ class Metadata:
         return self._map
 
     def getField(self, name):
-        if name not in self._map:
-            return None
-
-        rtype, xstm = self._map[name]
-
-        return self._element.xpath(xstm, namespaces=NAMESPACES)
+        return self.fields.get(name)
 
     __getitem__ = getField
 
 
 @implementer(IArchive)
 class ArchiveOAIDC:
-    def __init__(self, archivepath: Path, converter_kwargs: dict = {}) -> None:
+    """Archive of OAI-DC records
+
+    The archive can be a ZIP or tar file, a directory or a glob pattern.
+    By default every archive member holds exactly one record. With
+    `listrecords` the members are complete OAI-PMH (ListRecords)
+    responses, which are parsed incrementally record by record.
+    Each record element is cleared as soon as the next converter is
+    requested, so the converters must be processed one at a time.
+
+    With a `watermark` records which have already been converted
+    are skipped before any article is created. A record is added to
+    the watermark when the next converter is requested, i.e. after its
+    articles have been written. With a `cache`
+    unchanged records are not converted again.
+    """
+
+    def __init__(
+        self,
+        archivepath: Path,
+        converter_kwargs: dict = {},
+        listrecords=False,
+        watermark: Watermark = None,
+        cache: ResultCache = None,
+    ) -> None:
         self.archivepath = archivepath
         self.converter_kwargs = converter_kwargs
+        self.listrecords = listrecords
+        self.watermark = watermark
+        self.cache = cache
+        self.source = open_source(archivepath)
+
+    def __cachekey__(self, data: bytes) -> str | None:
+        if self.cache is None:
+            return None
+
+        return self.cache.key(data, "oai", **self.converter_kwargs)
+
+    def __converter__(
+        self, dom: etree._Element, name: str, key: str = None
+    ) -> OAIDCConverter | CachedConverter | None:
+        """Create the converter for a single record"""
+        logger = logging.getLogger(__name__)
+
+        header = None
+
+        try:
+            header = Header(dom)
+
+            if self.watermark is not None and self.watermark.skip(header):
+                msg = f"Unverändert {header.identifier}"
+                logger.debug(msg)
+                stats.count("skipped")
+                return None
+
+            if key is not None:
+                cached = self.cache.converter(key, name=name, header=header)
+
+                if cached is not None:
+                    return cached
+
+            record = Metadata(dom, OAI_DC_RECORD_XPATHS)
+
+            # Deleted records have no metadata, they become tombstones
+            if (
+                not header.deleted
+                and self.converter_kwargs.get("article_type")
+                == OAI_ARTICLES_TYPES.openedition
+            ):
+                if "article" not in record.getField("type"):
+                    stats.count("skipped")
+                    return None
+            oiaconv = OAIDCConverter(header, record, name=name, **self.converter_kwargs)
+        except (
+            etree.Error,
+            KeyError,
+            ValueError,
+            IndexError,
+            OSError,
+            TypeError,
+        ):
+            msg = "Konvertierungsproblem in "
+            msg += f"{self.archivename}-> {name}"
+            stats.problem(logger, msg, example=name)
+            stats.count("failed")
+
+            if self.watermark is not None and header is not None:
+                self.watermark.fail(header)
+
+            return None
+
+        return oiaconv
+
+    def __converted__(self, oiaconv: OAIDCConverter | CachedConverter) -> None:
+        """The articles of the converter have been written"""
+        if self.watermark is not None:
+            self.watermark.update(oiaconv.header)
+
+    @property
+    def archivename(self) -> str:
+        if isinstance(self.archivepath, Path):
+            return self.archivepath.as_posix()
+
+        return self.archivepath
 
     @property
     def converters(self) -> Generator[OAIDCConverter, None, None]:
         """Create the converters"""
         logger = logging.getLogger(__name__)
 
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            for i, zinfo in enumerate(zfh.infolist()):
-                msg = f"Bearbeite {zinfo.filename} ({i})"
-                logger.debug(msg)
+        for i, member in enumerate(self.source.members):
+            msg = f"Bearbeite {member.name} ({i})"
+            logger.debug(msg)
+            stats.count("bytes_in", member.size)
 
-                try:
-                    dom = etree.fromstring(zfh.read(zinfo))
-                    header = Header(dom)
-                    record = Metadata(dom, OAI_DC_RECORD_XPATHS)
-
-                    if (
-                        self.converter_kwargs.get("article_type")
-                        == OAI_ARTICLES_TYPES.openedition
-                    ):
-                        if "article" not in record.getField("type"):
-                            continue
-                    oiaconv = OAIDCConverter(header, record, **self.converter_kwargs)
-                except (
-                    etree.Error,
-                    KeyError,
-                    ValueError,
-                    IndexError,
-                    OSError,
-                    TypeError,
-                ):
-                    _path = (
-                        self.archivepath.as_posix()
-                        if isinstance(self.archivepath, Path)
-                        else self.archivepath
-                    )
-                    msg = "Konvertierungsproblem in "
-                    msg += f"{_path}-> {zinfo.filename}"
-                    logger.error(msg, exc_info=True)
+            if self.listrecords:
+                yield from self.__listrecords__(member)
+                continue
 
-                    continue
+            try:
+                data = member.read()
+                dom = etree.fromstring(data)
+            except (etree.Error, OSError):
+                msg = "Konvertierungsproblem in "
+                msg += f"{self.archivename}-> {member.name}"
+                stats.problem(logger, msg, example=member.name)
+                stats.count("failed")
 
+                continue
+
+            key = self.__cachekey__(data)
+            oiaconv = self.__converter__(dom, member.name, key)
+
+            if oiaconv is not None:
                 yield oiaconv
 
-    @property
-    def num_files(self) -> int:
-        """How many files are in the archive"""
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            num = len(zfh.namelist())
+                self.__converted__(oiaconv)
+
+                if key is not None:
+                    self.cache.put(key, oiaconv)
+
+    def __listrecords__(
+        self, member: SourceMember
+    ) -> Generator[OAIDCConverter, None, None]:
+        """Stream the records of an OAI-PMH response"""
+        logger = logging.getLogger(__name__)
+
+        tag = f"{{{NAMESPACES['oai']}}}record"
+
+        with member.open() as fh:
+            try:
+                for event, elem in etree.iterparse(fh, events=("end",), tag=tag):
+                    key = None
+                    if self.cache is not None:
+                        key = self.__cachekey__(etree.tostring(elem))
 
-        return num
+                    oiaconv = self.__converter__(elem, member.name, key)
+
+                    if oiaconv is not None:
+                        yield oiaconv
+
+                        self.__converted__(oiaconv)
+
+                        if key is not None:
+                            self.cache.put(key, oiaconv)
+
+                    elem.clear(keep_tail=False)
+                    while elem.getprevious() is not None:
+                        del elem.getparent()[0]
+            except (etree.Error, OSError):
+                msg = "Konvertierungsproblem in "
+                msg += f"{self.archivename}-> {member.name}"
+                stats.problem(logger, msg, example=member.name)
+                stats.count("failed")
+
+    @property
+    def num_files(self) -> int | None:
+        """How many files are in the archive, None for streamed tar files"""
+        return self.source.num_files
 
 
 @implementer(IArchive)
 class MarcArchive:
-    """Archive of MARCXML files"""
+    """Archive of MARC records
 
-    def __init__(self, archivepath: Path, **converter_kwargs) -> None:
-        self.archivepath = archivepath
-        self.converter_kwargs = converter_kwargs
+    Either a raw or gzipped file with binary MARC (ISO 2709) records,
+    or a ZIP or tar file, a directory or a glob pattern with MARCXML
+    files. Members ending with .mrc or .mrc.gz are read as binary MARC.
+
+    With a `cache` unchanged records are not converted again.
+    """
 
-        if not self.archivepath.exists():
-            raise FileNotFoundError(f"Archive {self.archivepath} does not exist")
+    def __init__(
+        self, archivepath: Path, cache: ResultCache = None, **converter_kwargs
+    ) -> None:
+        self.archivepath = Path(archivepath)
+        self.converter_kwargs = converter_kwargs
+        self.cache = cache
+        self.source = None
 
-        if not self.archivepath.is_file():
-            raise IsADirectoryError(f"{self.archivepath} is not a file")
+        if not is_glob(self.archivepath):
+            if not self.archivepath.exists():
+                msg = f"Archive {self.archivepath} does not exist"
+                raise FileNotFoundError(msg)
 
-        if not self.archivepath.suffix == ".zip":
-            raise ValueError("Archive must be a .zip file")
-        if not self.archivepath.stat().st_size > 0:
-            raise ValueError("Archive must not be empty")
+            if self.archivepath.is_file() and not self.archivepath.stat().st_size > 0:
+                raise ValueError("Archive must not be empty")
 
         if not self.archivepath.is_absolute():
             self.archivepath = Path.cwd() / self.archivepath
 
+        if not self.is_binary:
+            self.source = open_source(self.archivepath)
+
         self.converter_kwargs.setdefault("validate", True)
 
+    @property
+    def is_binary(self) -> bool:
+        """Is the archive a file with binary MARC records"""
+        if is_glob(self.archivepath) or not self.archivepath.is_file():
+            return False
+
+        return is_marc_binary(self.archivepath.name)
+
     @property
     def converters(self) -> Generator[MarcConverter, None, None]:
-        logger = logging.getLogger(__name__)
+        if self.is_binary:
+            stats.count("bytes_in", self.archivepath.stat().st_size)
 
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            for i, zinfo in enumerate(zfh.infolist()):
-                msg = f"Bearbeite {zinfo.filename} ({i})"
-                logger.debug(msg)
+            with open(self.archivepath, "rb") as fh:
+                yield from self.__binary_converters__(fh, self.archivepath.name)
+            return
 
-                with tempfile.NamedTemporaryFile("w+b") as tmpfh:
-                    tmpfh.write(zfh.read(zinfo))
-                    tmpfh.flush()
-
-                    try:
-                        reader = pymarc.parse_xml_to_array(tmpfh.name)
-                        record = reader[0] if reader else None
-                        myconv = MarcConverter(record, **self.converter_kwargs)
-                    except (
-                        pymarc.PymarcException,
-                        KeyError,
-                        ValueError,
-                        IndexError,
-                        OSError,
-                        TypeError,
-                    ):
-                        msg = "Konvertierungsproblem in "
-                        msg += f"{self.archivepath.as_posix()} -> {zinfo.filename}"
-                        logger.error(msg, exc_info=True)
+        logger = logging.getLogger(__name__)
 
+        for i, member in enumerate(self.source.members):
+            msg = f"Bearbeite {member.name} ({i})"
+            logger.debug(msg)
+            stats.count("bytes_in", member.size)
+
+            if is_marc_binary(member.name):
+                with member.open() as fh:
+                    yield from self.__binary_converters__(fh, member.name)
+                continue
+
+            key = None
+
+            try:
+                if self.cache is None:
+                    with member.open() as fh:
+                        reader = pymarc.parse_xml_to_array(fh)
+                else:
+                    data = member.read()
+                    key = self.cache.key(data, "marc", **self.converter_kwargs)
+                    cached = self.cache.converter(key, name=member.name)
+
+                    if cached is not None:
+                        yield cached
                         continue
 
-                    yield myconv
+                    reader = pymarc.parse_xml_to_array(io.BytesIO(data))
+
+                record = reader[0] if reader else None
+                myconv = MarcConverter(
+                    record, name=member.name, **self.converter_kwargs
+                )
+            except (
+                pymarc.PymarcException,
+                KeyError,
+                ValueError,
+                IndexError,
+                OSError,
+                TypeError,
+            ):
+                msg = "Konvertierungsproblem in "
+                msg += f"{self.archivepath.as_posix()} -> {member.name}"
+                stats.problem(logger, msg, example=member.name)
+                stats.count("failed")
+
+                continue
+
+            yield myconv
+
+            if key is not None:
+                self.cache.put(key, myconv)
+
+    def __binary_converters__(
+        self, fh: BinaryIO, name: str
+    ) -> Generator[MarcConverter, None, None]:
+        """Stream the records of a binary MARC file, gzipped or not
+
+        The converters are named by the file and the index of the record.
+        """
+        logger = logging.getLogger(__name__)
+
+        with open_marc_binary(fh) as mfh:
+            reader = pymarc.MARCReader(mfh, to_unicode=True, permissive=True)
+
+            for i, record in enumerate(reader):
+                if record is None:
+                    msg = "Konvertierungsproblem in "
+                    msg += f"{self.archivepath.as_posix()} -> {name} record {i}"
+                    stats.problem(
+                        logger, msg, example=name, exc_info=reader.current_exception
+                    )
+                    stats.count("failed")
+
+                    continue
+
+                key = None
+
+                try:
+                    if self.cache is not None:
+                        key = self.cache.key(
+                            record.as_marc(), "marc", **self.converter_kwargs
+                        )
+                        cached = self.cache.converter(key, name=f"{name}#{i}")
+
+                        if cached is not None:
+                            yield cached
+                            continue
+
+                    myconv = MarcConverter(
+                        record, name=f"{name}#{i}", **self.converter_kwargs
+                    )
+                except (KeyError, ValueError, IndexError, TypeError):
+                    msg = "Konvertierungsproblem in "
+                    msg += f"{self.archivepath.as_posix()} -> {name} record {i}"
+                    stats.problem(logger, msg, example=name)
+                    stats.count("failed")
+
+                    continue
+
+                yield myconv
+
+                if key is not None:
+                    self.cache.put(key, myconv)
 
     @property
-    def num_files(self) -> int:
-        """How many files are in the archive"""
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            num = len(zfh.namelist())
+    def num_files(self) -> int | None:
+        """How many files are in the archive
+
+        The records of binary MARC files are not counted beforehand,
+        this would read and decompress the file twice.
+        """
+        if self.is_binary:
+            return None
+
+        return self.source.num_files
+
+
+def is_marc_binary(name: str) -> bool:
+    """Has the file name a suffix of binary MARC (ISO 2709) files"""
+    suffixes = [suffix.lower() for suffix in Path(name).suffixes]
+
+    if len(suffixes) > 1 and suffixes[-1] == ".gz":
+        suffixes.pop()
+
+    return len(suffixes) > 0 and suffixes[-1] in MARC_BINARY_SUFFIXES
+
+
+def open_marc_binary(fh: BinaryIO) -> BinaryIO:
+    """Decompress gzipped MARC records on the fly"""
+    if not isinstance(fh, io.BufferedReader):
+        fh = io.BufferedReader(fh)
+
+    if fh.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=fh, mode="rb")
 
-        return num
+    return fh
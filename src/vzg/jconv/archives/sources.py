@@ -0,0 +1,245 @@
+# -*- coding: utf-8 -*-
+"""Sources of archive members
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import glob
+import os
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Callable, Generator
+from zope.interface import implementer
+from vzg.jconv import stats
+from vzg.jconv.gapi import MARC_BINARY_SUFFIXES
+from vzg.jconv.interfaces import ISource
+
+GLOB_CHARS = ("*", "?", "[")
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tgz", ".gz", ".bz2", ".xz")
+
+# Suffixes of single record files, stripped from the source names
+RECORD_SUFFIXES = (".xml",) + MARC_BINARY_SUFFIXES
+
+
+@dataclass
+class SourceMember:
+    """A single file of a source
+
+    Parameters
+    ----------
+    name : str
+        Name of the member within the source
+    size : int
+        Uncompressed size in bytes
+    crc : int
+        CRC-32 of the content, if the source provides one
+    path : pathlib.Path
+        Path of the file, if the member is a file on disk
+    """
+
+    name: str
+    size: int
+    opener: Callable[[], BinaryIO]
+    crc: int | None = None
+    path: Path | None = None
+
+    def open(self) -> BinaryIO:
+        """Open the member for reading"""
+        return self.opener()
+
+    def read(self) -> bytes:
+        """The content of the member"""
+        with stats.timer("read"), self.open() as fh:
+            return fh.read()
+
+
+@implementer(ISource)
+class ZipSource:
+    """Members of a ZIP file"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    @property
+    def members(self) -> Generator[SourceMember, None, None]:
+        with zipfile.ZipFile(self.path, "r") as zfh:
+            for zinfo in zfh.infolist():
+                if zinfo.is_dir():
+                    continue
+
+                yield SourceMember(
+                    name=zinfo.filename,
+                    size=zinfo.file_size,
+                    crc=zinfo.CRC,
+                    opener=lambda zinfo=zinfo: zfh.open(zinfo),
+                )
+
+    @property
+    def num_files(self) -> int:
+        with zipfile.ZipFile(self.path, "r") as zfh:
+            num = len([zinfo for zinfo in zfh.infolist() if not zinfo.is_dir()])
+
+        return num
+
+
+@implementer(ISource)
+class TarSource:
+    """Members of a (compressed) tar file
+
+    The tar file is read as a stream. A member can only be read
+    until the next member is requested. The members are not counted
+    beforehand, this would read and decompress the file twice.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    @property
+    def members(self) -> Generator[SourceMember, None, None]:
+        with tarfile.open(self.path, "r|*") as tfh:
+            for tinfo in tfh:
+                if not tinfo.isfile():
+                    continue
+
+                yield SourceMember(
+                    name=tinfo.name,
+                    size=tinfo.size,
+                    opener=lambda tinfo=tinfo: tfh.extractfile(tinfo),
+                )
+
+    @property
+    def num_files(self) -> int | None:
+        return None
+
+
+@implementer(ISource)
+class DirectorySource:
+    """Files of a directory tree, e.g. an unpacked delivery"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def __walk__(self, path: str) -> Generator[os.DirEntry, None, None]:
+        with os.scandir(path) as entries:
+            entries = sorted(entries, key=lambda entry: entry.name)
+
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from self.__walk__(entry.path)
+            elif entry.is_file():
+                yield entry
+
+    @property
+    def members(self) -> Generator[SourceMember, None, None]:
+        for entry in self.__walk__(self.path):
+            fpath = Path(entry.path)
+
+            yield SourceMember(
+                name=fpath.relative_to(self.path).as_posix(),
+                size=entry.stat().st_size,
+                path=fpath,
+                opener=lambda fpath=fpath: fpath.open("rb"),
+            )
+
+    @property
+    def num_files(self) -> int:
+        return sum(1 for entry in self.__walk__(self.path))
+
+
+@implementer(ISource)
+class GlobSource:
+    """Files matching a glob pattern, `**` matches subdirectories"""
+
+    def __init__(self, pattern: str) -> None:
+        self.pattern = str(pattern)
+
+    @property
+    def paths(self) -> list[Path]:
+        return [
+            Path(fname)
+            for fname in sorted(glob.glob(self.pattern, recursive=True))
+            if os.path.isfile(fname)
+        ]
+
+    @property
+    def members(self) -> Generator[SourceMember, None, None]:
+        for fpath in self.paths:
+            yield SourceMember(
+                name=fpath.as_posix(),
+                size=fpath.stat().st_size,
+                path=fpath,
+                opener=lambda fpath=fpath: fpath.open("rb"),
+            )
+
+    @property
+    def num_files(self) -> int:
+        return len(self.paths)
+
+
+def is_glob(location: str | Path) -> bool:
+    return any(char in str(location) for char in GLOB_CHARS)
+
+
+def open_source(location: str | Path) -> ISource:
+    """Create the source for a ZIP or tar file, a directory or a glob pattern
+
+    Raises
+    ------
+    FileNotFoundError
+        If the location does not exist
+    ValueError
+        Unknown archive type
+    """
+    if is_glob(location):
+        return GlobSource(location)
+
+    path = Path(location)
+
+    if path.is_dir():
+        return DirectorySource(path)
+
+    if not path.is_file():
+        raise FileNotFoundError(f"Archive {path} does not exist")
+
+    if zipfile.is_zipfile(path):
+        return ZipSource(path)
+
+    if tarfile.is_tarfile(path):
+        return TarSource(path)
+
+    raise ValueError(f"Unknown archive type: {path}")
+
+
+def source_name(location: str | Path) -> str:
+    """Name of a source without archive and record file suffixes
+
+    Used to name the output of a delivery, e.g. delivery for
+    delivery.tar.gz or records for records.mrc.gz.
+    """
+    path = Path(location)
+
+    if is_glob(location):
+        parts = []
+        for part in path.parts:
+            if is_glob(part):
+                break
+            parts.append(part)
+
+        path = Path(*parts) if len(parts) > 0 else Path.cwd()
+
+    name = path.absolute().name
+
+    suffixes = ARCHIVE_SUFFIXES + RECORD_SUFFIXES
+
+    while Path(name).suffix.lower() in suffixes and Path(name).stem != "":
+        name = Path(name).stem
+
+    return name
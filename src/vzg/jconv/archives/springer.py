@@ -11,60 +11,155 @@
 
 import logging
 import tempfile
-import zipfile
 from lxml import etree
 from pathlib import Path
 from typing import Generator
 from zope.interface import implementer
+from vzg.jconv import stats
 from vzg.jconv.interfaces import IArchive
+from vzg.jconv.archives.sources import SourceMember, open_source
+from vzg.jconv.cache import ResultCache
 from vzg.jconv.converter.jats import JatsConverter
+from vzg.jconv.converter.snapshot import CachedConverter
+from vzg.jconv.dedup import DEDUP_POLICIES, Deduplicator, UpdateConverter, jats_keys
 
 
 @implementer(IArchive)
 class ArchiveSpringer:
-    def __init__(self, archivepath: Path, converter_kwargs: dict = {}) -> None:
+    """Archive of JATS files
+
+    The archive can be a ZIP or tar file, a directory or a glob pattern.
+
+    With a `cache` unchanged files are not converted again,
+    the articles of the former conversion are used.
+
+    With `dedup` documents whose DOI and publication types have been
+    seen in former deliveries are skipped, converted as usual or
+    marked as updates, depending on the policy. Only the article-meta
+    is parsed before this decision.
+    """
+
+    def __init__(
+        self,
+        archivepath: Path,
+        converter_kwargs: dict = None,
+        cache: ResultCache = None,
+        dedup: Deduplicator = None,
+    ) -> None:
         self.archivepath = archivepath
-        self.converter_kwargs = converter_kwargs
+        self.converter_kwargs = dict(converter_kwargs or {})
+        self.cache = cache
+        self.dedup = dedup
+        self.source = open_source(archivepath)
+
+    def __converter__(
+        self, member: SourceMember, jatspath: Path
+    ) -> JatsConverter | None:
+        logger = logging.getLogger(__name__)
+
+        try:
+            jconv = JatsConverter(jatspath, name=member.name, **self.converter_kwargs)
+        except (
+            etree.Error,
+            KeyError,
+            ValueError,
+            IndexError,
+            OSError,
+            TypeError,
+        ):
+            msg = "Konvertierungsproblem in "
+            msg += f"{Path(self.archivepath).as_posix()} -> {member.name}"
+            stats.problem(logger, msg, example=member.name)
+            stats.count("failed")
+
+            return None
+
+        return jconv
 
     @property
     def converters(self) -> Generator[JatsConverter, None, None]:
         """Create the converters"""
         logger = logging.getLogger(__name__)
 
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            for i, zinfo in enumerate(zfh.infolist()):
-                msg = f"Bearbteite {zinfo.filename} ({i})"
-                logger.debug(msg)
-
-                self.converter_kwargs["name"] = zinfo.filename
-
-                with tempfile.NamedTemporaryFile("w+b") as tmpfh:
-                    tmpfh.write(zfh.read(zinfo))
-                    tmpfh.flush()
-
-                    try:
-                        jatspath = Path(tmpfh.name)
-                        jconv = JatsConverter(jatspath, **self.converter_kwargs)
-                    except (
-                        etree.Error,
-                        KeyError,
-                        ValueError,
-                        IndexError,
-                        OSError,
-                        TypeError,
-                    ):
-                        msg = "Konvertierungsproblem in "
-                        msg += f"{self.archivepath.as_posix()} -> {zinfo.filename}"
-                        logger.error(msg, exc_info=True)
+        for i, member in enumerate(self.source.members):
+            msg = f"Bearbteite {member.name} ({i})"
+            logger.debug(msg)
+            stats.count("bytes_in", member.size)
+
+            if self.cache is None and self.dedup is None:
+                yield from self.__converters__(member)
+                continue
+
+            data = member.read()
+            keys = []
+
+            if self.dedup is not None:
+                keys = jats_keys(data)
+
+                if self.dedup.duplicate(keys):
+                    msg = f"Duplikat {member.name}: {', '.join(keys)}"
+                    logger.info(msg)
+
+                    if self.dedup.policy == DEDUP_POLICIES.skip:
+                        stats.count("skipped")
+                        continue
 
+                    if self.dedup.policy == DEDUP_POLICIES.update:
+                        for jconv in self.__cached_converters__(member, data):
+                            yield UpdateConverter(jconv)
                         continue
 
-                    yield jconv
+            converted = False
 
-    @property
-    def num_files(self) -> int:
-        """How many files are in the archive"""
-        with zipfile.ZipFile(self.archivepath, "r") as zfh:
-            num = len(zfh.namelist())
+            for jconv in self.__cached_converters__(member, data):
+                yield jconv
+                converted = True
+
+            if converted and len(keys) > 0:
+                self.dedup.add(keys, Path(self.archivepath).as_posix())
+
+    def __cached_converters__(
+        self, member: SourceMember, data: bytes
+    ) -> Generator[JatsConverter | CachedConverter, None, None]:
+        """The converter of a member, from the cache if possible"""
+        if self.cache is None:
+            yield from self.__converters__(member, data)
+            return None
+
+        key = self.cache.key(data, "jats", **self.converter_kwargs)
+        jconv = self.cache.converter(key, name=member.name)
+
+        if jconv is not None:
+            yield jconv
+            return None
+
+        for jconv in self.__converters__(member, data):
+            yield jconv
+            self.cache.put(key, jconv)
 
-        return num
+    def __converters__(
+        self, member: SourceMember, data: bytes = None
+    ) -> Generator[JatsConverter, None, None]:
+        """The converter of a member, if it can be parsed"""
+        # Files on disk are parsed directly
+        if member.path is not None:
+            jconv = self.__converter__(member, member.path)
+
+            if jconv is not None:
+                yield jconv
+
+            return None
+
+        with tempfile.NamedTemporaryFile("w+b") as tmpfh:
+            tmpfh.write(member.read() if data is None else data)
+            tmpfh.flush()
+
+            jconv = self.__converter__(member, Path(tmpfh.name))
+
+            if jconv is not None:
+                yield jconv
+
+    @property
+    def num_files(self) -> int | None:
+        """How many files are in the archive, None for streamed tar files"""
+        return self.source.num_files
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Datestamp watermarks for incremental OAI conversions
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import datetime
+import json
+import logging
+import os
+from pathlib import Path
+
+
+class Watermark:
+    """Persistent datestamp watermark of a source set
+
+    The watermark file is a JSON object with one entry per source set,
+    holding the highest converted datestamp and the identifiers
+    converted with exactly this datestamp.
+
+    Records below the watermark are skipped. Records at the watermark
+    are only skipped if they have already been converted, because
+    OAI-PMH datestamps may have a granularity of a day.
+
+    The watermark never passes a record which failed, so it is
+    converted again by the next run.
+
+    The watermark is only written by `save`, which should be called
+    after a complete run. The records of the running conversion are
+    skipped by the watermark of its start.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the watermark file
+    setname : str
+        Name of the source set
+    """
+
+    def __init__(self, path: Path, setname: str) -> None:
+        self.path = Path(path)
+        self.setname = setname
+
+        self.datestamp = None
+        self.identifiers = set()
+
+        if self.path.is_file():
+            with self.path.open() as fh:
+                entry = json.load(fh).get(self.setname)
+
+            if entry is not None:
+                self.datestamp = datetime.datetime.fromisoformat(entry["datestamp"])
+                self.identifiers = set(entry["identifiers"])
+
+        self.__next_datestamp__ = self.datestamp
+        self.__next_identifiers__ = set(self.identifiers)
+        self.__failed__ = None
+
+    @staticmethod
+    def normalize(datestamp: datetime.datetime) -> datetime.datetime:
+        """Datestamps without a timezone are UTC"""
+        if datestamp.tzinfo is None:
+            return datestamp.replace(tzinfo=datetime.timezone.utc)
+
+        return datestamp
+
+    def skip(self, header) -> bool:
+        """Has the record already been converted?"""
+        if self.datestamp is None:
+            return False
+
+        datestamp = self.normalize(header.datestamp)
+
+        if datestamp < self.datestamp:
+            return True
+
+        if datestamp == self.datestamp:
+            return header.identifier in self.identifiers
+
+        return False
+
+    def update(self, header) -> None:
+        """Remember a converted record"""
+        datestamp = self.normalize(header.datestamp)
+
+        if self.__next_datestamp__ is None or datestamp > self.__next_datestamp__:
+            self.__next_datestamp__ = datestamp
+            self.__next_identifiers__ = set()
+
+        if datestamp == self.__next_datestamp__:
+            self.__next_identifiers__.add(header.identifier)
+
+    def fail(self, header) -> None:
+        """Remember a record, which could not be converted"""
+        datestamp = self.normalize(header.datestamp)
+
+        if self.__failed__ is None or datestamp < self.__failed__:
+            self.__failed__ = datestamp
+
+    def save(self) -> None:
+        """Write the watermark atomically"""
+        logger = logging.getLogger(__name__)
+
+        datestamp = self.__next_datestamp__
+        identifiers = self.__next_identifiers__
+
+        if datestamp is None:
+            return None
+
+        # The records at the datestamp of a failed one are converted again
+        if self.__failed__ is not None and self.__failed__ < datestamp:
+            datestamp = self.__failed__
+            identifiers = set()
+
+        data = {}
+
+        if self.path.is_file():
+            with self.path.open() as fh:
+                data = json.load(fh)
+
+        data[self.setname] = {
+            "datestamp": datestamp.isoformat(),
+            "identifiers": sorted(identifiers),
+        }
+
+        tmppath = self.path.with_name(f"{self.path.name}.tmp")
+
+        with tmppath.open("w") as fh:
+            json.dump(data, fh, indent=2)
+
+        os.replace(tmppath, self.path)
+
+        msg = f"Watermark {self.setname}: {data[self.setname]['datestamp']}"
+        logger.info(msg)
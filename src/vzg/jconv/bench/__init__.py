@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""Measurements of the conversion
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import datetime
+import hashlib
+import json
+import math
+import platform
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from vzg.jconv.cache import converter_version
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+STAGES = ("parse", "extract", "validate", "serialize", "write")
+
+PERCENTILES = (50, 95, 99)
+
+REPORT_FORMAT = 1
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """The q-th percentile, linear interpolation between the closest ranks"""
+    if len(values) == 0:
+        return None
+
+    values = sorted(values)
+    rank = (len(values) - 1) * q / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+def peak_rss() -> int | None:
+    """Peak resident set size of the process in bytes"""
+    if resource is None:
+        return None
+
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Linux reports KiB, macOS bytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def git_commit(path: Path = None) -> str | None:
+    """Commit of the working tree, if it is a git repository"""
+    path = Path(__file__).parent if path is None else Path(path)
+
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return proc.stdout.strip()
+
+
+def file_digest(*paths: Path) -> str:
+    """SHA-256 of the concatenated contents of files"""
+    digest = hashlib.sha256()
+
+    for path in paths:
+        with open(path, "rb") as fh:
+            while chunk := fh.read(1 << 20):
+                digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def summary(values: list[float]) -> dict:
+    """Mean, maximum and percentiles of durations in seconds"""
+    sdict = {
+        "mean": sum(values) / len(values) if len(values) > 0 else None,
+        "max": max(values) if len(values) > 0 else None,
+    }
+
+    for q in PERCENTILES:
+        sdict[f"p{q}"] = percentile(values, q)
+
+    return sdict
+
+
+class StageTimer:
+    """Durations of the stages of every document
+
+    The stages of a document are measured with `stage` and
+    recorded with `done`. The latency of a document is the sum
+    of its stages.
+    """
+
+    def __init__(self) -> None:
+        self.stages = {stage: [] for stage in STAGES}
+        self.latencies = []
+
+        self.__current__ = dict.fromkeys(STAGES, 0.0)
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.__current__[name] += time.perf_counter() - start
+
+    def done(self) -> None:
+        """Record the stages of the current document"""
+        for name, duration in self.__current__.items():
+            self.stages[name].append(duration)
+
+        self.latencies.append(sum(self.__current__.values()))
+        self.__current__ = dict.fromkeys(STAGES, 0.0)
+
+    def discard(self) -> None:
+        """Forget the stages of the current document"""
+        self.__current__ = dict.fromkeys(STAGES, 0.0)
+
+
+@dataclass
+class Result:
+    """Result of a benchmark
+
+    Parameters
+    ----------
+    name : str
+        Name of the benchmark, like jats/converter
+    documents : int
+        Number of converted documents (converters)
+    articles : int
+        Number of written articles
+    invalid : int
+        Number of articles failing the JSON Schema validation
+    bytes : int
+        Size of the input
+    seconds : float
+        Duration of the benchmark
+    latencies : list
+        Durations of the single documents, empty if unknown
+    stages : dict
+        Durations of the single documents per stage
+    peak_rss : int
+        Peak resident set size of the process after the benchmark
+    digest : str
+        SHA-256 of the written articles
+    """
+
+    name: str
+    documents: int = 0
+    articles: int = 0
+    invalid: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    stages: dict[str, list[float]] = field(default_factory=dict)
+    peak_rss: int | None = None
+    digest: str | None = None
+
+    def as_dict(self) -> dict:
+        """Summary for the report"""
+        seconds = self.seconds if self.seconds > 0 else math.nan
+
+        rdict = {
+            "documents": self.documents,
+            "articles": self.articles,
+            "invalid": self.invalid,
+            "bytes": self.bytes,
+            "seconds": self.seconds,
+            "docs_per_s": self.documents / seconds,
+            "mb_per_s": self.bytes / 1e6 / seconds,
+            "latency": summary(self.latencies) if len(self.latencies) > 0 else None,
+            "stages": {},
+            "peak_rss": self.peak_rss,
+            "digest": self.digest,
+        }
+
+        for name, durations in self.stages.items():
+            total = sum(durations)
+            rdict["stages"][name] = summary(durations) | {
+                "seconds": total,
+                "share": total / seconds,
+            }
+
+        return rdict
+
+
+class Report:
+    """Machine readable report of benchmarks
+
+    The JSON report holds the environment and a summary of
+    every result, keyed by the name of the benchmark.
+    """
+
+    def __init__(self, meta: dict = None) -> None:
+        self.meta = self.environment() if meta is None else meta
+        self.results = {}
+
+    @staticmethod
+    def environment() -> dict:
+        return {
+            "format": REPORT_FORMAT,
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "version": converter_version(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        }
+
+    def add(self, result: Result) -> None:
+        self.results[result.name] = result.as_dict()
+
+    def as_dict(self) -> dict:
+        return self.meta | {"results": self.results}
+
+    def dumps(self) -> str:
+        return json.dumps(self.as_dict(), indent=2)
+
+    def save(self, path: Path) -> None:
+        with open(path, "w") as fh:
+            fh.write(self.dumps())
+            fh.write("\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "Report":
+        with open(path) as fh:
+            data = json.load(fh)
+
+        report = cls(meta={key: val for key, val in data.items() if key != "results"})
+        report.results = data.get("results", {})
+
+        return report
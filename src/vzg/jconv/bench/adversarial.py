@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""Pathological documents for scaling tests
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import gc
+import re
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+from vzg.jconv.archives.oai import ArchiveOAIDC, MarcArchive
+from vzg.jconv.archives.springer import ArchiveSpringer
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.converter.snapshot import materialize
+from vzg.jconv.gapi import OAI_ARTICLES_TYPES
+from vzg.jconv.journal import JOURNAL_META_CACHE
+import pymarc
+
+# Nesting of the MathML formulas, libxml2 refuses documents deeper than 256
+MATHML_DEPTH = 128
+
+
+def jats(**knobs) -> bytes:
+    return CorpusGenerator(CorpusSpec("jats", "springer", **knobs)).jats(0)
+
+
+def authors(size: int) -> bytes:
+    """Contrib group with `size` authors and affiliations"""
+    return jats(authors=(size, size), affiliations=size)
+
+
+def abstract(size: int) -> bytes:
+    """Abstract of `size` words with sub- and superscripts"""
+    return jats(abstract_paragraphs=1, abstract_words=size, scripts=0.2)
+
+
+def long_word(size: int) -> bytes:
+    """Abstract with a single word and a whitespace run of `size` chars"""
+    text = f"{'w' * size}<sub>1</sub> {' ' * size}x"
+    return re.sub(rb"<p>.*?</p>", f"<p>{text}</p>".encode(), jats(), count=1)
+
+
+def mathml(size: int) -> bytes:
+    """Abstract with `size` deeply nested MathML formulas"""
+    formula = (
+        "<mml:mrow>" * MATHML_DEPTH
+        + "<mml:mi>x</mml:mi>"
+        + "</mml:mrow>" * MATHML_DEPTH
+    )
+    paras = "".join(
+        f'<p>Formula <inline-formula id="IEq{i}"><alternatives>'
+        f'<tex-math id="IEq{i}_TeX">\\documentclass{{minimal}}'
+        f"\\begin{{document}}$x_{{{i}}}$\\end{{document}}</tex-math>"
+        f'<mml:math id="IEq{i}_Math">{formula}</mml:math>'
+        "</alternatives></inline-formula>.</p>"
+        for i in range(size)
+    )
+    return jats().replace(b"</abstract>", f"{paras}</abstract>".encode())
+
+
+def tex(size: int) -> bytes:
+    """Abstract of `size` words with a TeX formula in every sentence"""
+    return jats(abstract_paragraphs=1, abstract_words=size, tex=1.0)
+
+
+def keywords(size: int) -> bytes:
+    """Keyword group with `size` keywords"""
+    return jats(keywords=size)
+
+
+def pubdates(size: int) -> bytes:
+    """Article with `size` additional publication dates"""
+    dates = "".join(
+        f'<pub-date date-type="{kind}" publication-format="{fmt}">'
+        f"<day>{i % 28 + 1:02}</day><month>{i % 12 + 1:02}</month>"
+        f"<year>{2000 + i % 25}</year></pub-date>"
+        for i in range(size)
+        for kind, fmt in (("pub", "print"), ("epub", "electronic"))
+    )
+    return jats().replace(b"<volume>", f"{dates}<volume>".encode())
+
+
+def cairn_source(size: int) -> bytes:
+    """Cairn record with a title of `size` chars in its dc:source"""
+    record = CorpusGenerator(CorpusSpec("oai", "cairn")).oai(0)
+    title = "Revue " * (size // 6)
+    record = re.sub(r"<dc:source>[^|]*", f"<dc:source>{title}", record)
+
+    return ('<?xml version="1.0" encoding="UTF-8"?>\n' + record).encode("utf-8")
+
+
+def marc_persons(size: int) -> bytes:
+    """MARCXML record with `size` authors in 100 and 700"""
+    record = CorpusGenerator(CorpusSpec("marc", "marcxml", authors=(size, size)))
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<collection xmlns="http://www.loc.gov/MARC21/slim">'
+        + pymarc.record_to_xml(record.marc(0), namespace=False)
+        + b"</collection>\n"
+    )
+
+
+@dataclass
+class WorstCase:
+    """A pathological document, growing with its size
+
+    Parameters
+    ----------
+    name : str
+        Name of the case
+    kind : str
+        jats, oai or marc
+    build : callable
+        Content of the document of a size
+    size : int
+        Size of a production worst case
+    """
+
+    name: str
+    kind: str
+    build: Callable[[int], bytes]
+    size: int
+
+
+WORST_CASES = (
+    WorstCase("authors", "jats", authors, 2000),
+    WorstCase("abstract", "jats", abstract, 200000),
+    WorstCase("long-word", "jats", long_word, 100000),
+    WorstCase("mathml", "jats", mathml, 1000),
+    WorstCase("tex", "jats", tex, 50000),
+    WorstCase("keywords", "jats", keywords, 5000),
+    WorstCase("pubdates", "jats", pubdates, 200),
+    WorstCase("cairn-source", "oai", cairn_source, 1000000),
+    WorstCase("marc-persons", "marc", marc_persons, 500),
+)
+
+
+@dataclass
+class Measurement:
+    """Conversion of a worst case
+
+    Parameters
+    ----------
+    name : str
+        Name of the case
+    size : int
+        Size of the document
+    bytes : int
+        Length of the document
+    seconds : float
+        Fastest conversion
+    peak : int
+        Peak of the Python allocations in bytes, the trees of lxml
+        are not included
+    articles : int
+        Number of converted articles
+    """
+
+    name: str
+    size: int
+    bytes: int
+    seconds: float
+    peak: int
+    articles: int
+
+
+def convert_file(kind: str, path: Path) -> int:
+    """Convert a document like simple-conv, the number of articles"""
+    if kind == "jats":
+        archive = ArchiveSpringer(path.parent)
+    elif kind == "oai":
+        archive = ArchiveOAIDC(
+            path.parent, converter_kwargs={"article_type": OAI_ARTICLES_TYPES.cairn}
+        )
+    else:
+        archive = MarcArchive(path.parent)
+
+    articles = 0
+
+    for conv in archive.converters:
+        conv.run()
+        materialize(conv)
+
+        for article in conv.articles:
+            article.json
+            articles += 1
+
+    return articles
+
+
+def measure(case: WorstCase, size: int, workdir: Path, repeat: int = 3) -> Measurement:
+    """Convert the document of a case, the fastest of `repeat` runs
+
+    The peak memory is taken from an additional run with tracemalloc.
+    """
+    path = Path(workdir) / case.name / "document.xml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = case.build(size)
+    path.write_bytes(data)
+
+    seconds = float("inf")
+
+    for _ in range(repeat):
+        JOURNAL_META_CACHE.clear()
+        gc.collect()
+
+        start = time.perf_counter()
+        articles = convert_file(case.kind, path)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    JOURNAL_META_CACHE.clear()
+    tracemalloc.start()
+
+    try:
+        convert_file(case.kind, path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(case.name, size, len(data), seconds, peak, articles)
@@ -0,0 +1,653 @@
+# -*- coding: utf-8 -*-
+"""Synthetic deliveries for load tests
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import datetime
+import logging
+import pymarc
+import random
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator
+from vzg.jconv.bench.targets import Corpus
+from vzg.jconv.gapi import NAMESPACES
+
+DIALECTS = {
+    "jats": ("springer", "degruyter", "emerald"),
+    "oai": ("cairn", "openedition"),
+    "marc": ("marcxml", "binary"),
+}
+
+# Fixed timestamp of the ZIP members, the same seed gives the same bytes
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+SYLLABLES = (
+    "ba be bi bo bu da de di do du fa fe fi fo fu ka ke ki ko ku la le li lo lu "
+    "ma me mi mo mu na ne ni no nu pa pe pi po pu ra re ri ro ru sa se si so su "
+    "ta te ti to tu va ve vi vo vu"
+).split()
+
+GIVEN_NAMES = (
+    "Anna Ben Clara David Elena Felix Greta Hannes Ines Jonas Katrin Lars Maria "
+    "Nils Olga Paul Rosa Stefan Tanja Ulrich Vera Wim Xenia Yusuf Zoe"
+).split()
+
+SURNAMES = (
+    "Albrecht Becker Dubois Eriksen Fischer Garcia Hansen Ito Jansen Kowalski "
+    "Lehmann Martin Novak Olsen Petrov Quinn Rossi Schmidt Tanaka Urban Vogel "
+    "Weber Xu Yilmaz Zimmermann"
+).split()
+
+INSTITUTIONS = (
+    "University of Göttingen",
+    "Leibniz University Hannover",
+    "University of Oslo",
+    "Sorbonne University",
+    "Kyoto University",
+    "University of Toronto",
+    "Technical University of Munich",
+    "University of Cape Town",
+)
+
+FORMULAS = (
+    (
+        "x_{i}^{2}",
+        "<mml:msubsup><mml:mi>x</mml:mi><mml:mi>i</mml:mi>"
+        "<mml:mn>2</mml:mn></mml:msubsup>",
+    ),
+    (
+        "\\upalpha + \\upbeta",
+        "<mml:mi>α</mml:mi><mml:mo>+</mml:mo><mml:mi>β</mml:mi>",
+    ),
+    ("\\frac{a}{b}", "<mml:mfrac><mml:mi>a</mml:mi><mml:mi>b</mml:mi></mml:mfrac>"),
+    ("\\sqrt{n}", "<mml:msqrt><mml:mi>n</mml:mi></mml:msqrt>"),
+)
+
+PUBLISHERS = {
+    "springer": ("Springer Berlin Heidelberg", "Berlin/Heidelberg", "10.1007"),
+    "degruyter": ("De Gruyter", "Berlin", "10.1515"),
+    "emerald": ("Emerald Publishing Limited", "Bingley", "10.1108"),
+    "cairn": ("Cairn", "Paris", "10.3917"),
+    "openedition": ("OpenEdition", "Marseille", "10.4000"),
+}
+
+JATS = """<?xml version="1.0" encoding="UTF-8"?>
+<article xmlns:mml="{mml}" xmlns:xlink="{xlink}"
+         article-type="research-article" xml:lang="en">
+  <front>
+    <journal-meta>
+      {journal_ids}
+      <journal-title-group>
+        <journal-title>{journal}</journal-title>
+      </journal-title-group>
+      {issns}
+      <publisher>
+        <publisher-name>{publisher}</publisher-name>
+        <publisher-loc>{place}</publisher-loc>
+      </publisher>
+    </journal-meta>
+    <article-meta>
+      <article-id pub-id-type="publisher-id">s{num:08}</article-id>
+      <article-id pub-id-type="doi">{doi}</article-id>
+      <title-group><article-title xml:lang="en">{title}</article-title></title-group>
+      <contrib-group>{contribs}{affs}
+      </contrib-group>
+      {pubdates}
+      <volume>{volume}</volume>
+      <issue>{issue}</issue>
+      <fpage>{fpage}</fpage>
+      <lpage>{lpage}</lpage>
+      <permissions>
+        <copyright-statement>© The Author(s) {year}</copyright-statement>{license}
+      </permissions>
+      {abstracts}
+      <kwd-group xml:lang="en"><title>Keywords</title>{keywords}</kwd-group>
+      <custom-meta-group>
+        <custom-meta>
+          <meta-name>article-type</meta-name><meta-value>OriginalPaper</meta-value>
+        </custom-meta>
+        <custom-meta>
+          <meta-name>open-access</meta-name><meta-value>{open_access}</meta-value>
+        </custom-meta>
+      </custom-meta-group>
+    </article-meta>
+  </front>
+  <body>{body}
+  </body>
+</article>
+"""
+
+JOURNAL_ID = '<journal-id journal-id-type="{jidtype}">{jid}</journal-id>'
+
+AFF = """
+        <aff id="Aff{num}">
+          <institution-wrap>
+            <institution-id institution-id-type="ROR">{ror}</institution-id>
+            <institution content-type="org-name">{institution}</institution>
+          </institution-wrap>
+        </aff>"""
+
+CONTRIB = """
+        <contrib contrib-type="author">{orcid}
+          <name><surname>{surname}</surname><given-names>{given}</given-names></name>
+          <xref ref-type="aff" rid="Aff{aff}"/>
+        </contrib>"""
+
+ORCID = """
+          <contrib-id contrib-id-type="orcid">{orcid}</contrib-id>"""
+
+OAI_RECORD = """<record xmlns="{oai}">
+  <header>
+    <identifier>oai:{dialect}.example.org:{num:08}</identifier>
+    <datestamp>{datestamp}</datestamp>
+    <setSpec>{dialect}</setSpec>
+  </header>
+  <metadata>
+    <oai_dc:dc xmlns:oai_dc="{oai_dc}" xmlns:dc="{dc}" xmlns:dcterms="{dcterms}">
+      <dc:title>{title}</dc:title>{creators}{subjects}
+      <dc:description xml:lang="fr">{abstract}</dc:description>
+      <dc:publisher>{journal}</dc:publisher>
+      <dc:date>{date}</dc:date>
+      <dc:type>article</dc:type>
+      <dc:identifier>https://{dialect}.example.org/{num:08}</dc:identifier>
+      <dc:identifier>https://doi.org/{doi}</dc:identifier>{source}
+      <dc:language>{language}</dc:language>
+      <dc:relation>info:eu-repo/semantics/reference/issn/{issn}</dc:relation>
+      <dc:rights>{rights}</dc:rights>
+      <dcterms:accessRights>{access}</dcterms:accessRights>
+    </oai_dc:dc>
+  </metadata>
+</record>"""
+
+LISTRECORDS = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="{oai}">
+  <responseDate>{datestamp}</responseDate>
+  <request verb="ListRecords">https://oai.example.org</request>
+  <ListRecords>{records}</ListRecords>
+</OAI-PMH>
+"""
+
+
+@dataclass
+class CorpusSpec:
+    """Knobs of a synthetic delivery
+
+    Parameters
+    ----------
+    kind : str
+        jats, oai or marc
+    dialect : str
+        springer, degruyter or emerald (JATS), cairn or openedition (OAI),
+        marcxml or binary (MARC)
+    documents : int
+        Number of documents (records)
+    max_bytes : int
+        Stop after this uncompressed size, 0 means unlimited
+    seed : int
+        Seed of the random numbers
+    authors : tuple
+        Minimal and maximal number of authors
+    affiliations : int
+        Maximal number of affiliations per document
+    abstract_paragraphs : int
+        Paragraphs of the abstract
+    abstract_words : int
+        Words per paragraph of the abstract
+    keywords : int
+        Number of keywords
+    mathml : float
+        Probability of a MathML formula per sentence
+    tex : float
+        Probability of a TeX formula per sentence
+    scripts : float
+        Probability of sub- or superscript per word
+    body_paragraphs : int
+        Paragraphs of the full text
+    body_words : int
+        Words per paragraph of the full text
+    records : int
+        Records per OAI response or MARC collection,
+        MarcArchive reads only the first record of a MARCXML file
+    """
+
+    kind: str = "jats"
+    dialect: str = "springer"
+    documents: int = 100
+    max_bytes: int = 0
+    seed: int = 0
+    authors: tuple[int, int] = (1, 6)
+    affiliations: int = 3
+    abstract_paragraphs: int = 2
+    abstract_words: int = 60
+    keywords: int = 5
+    mathml: float = 0.0
+    tex: float = 0.0
+    scripts: float = 0.0
+    body_paragraphs: int = 0
+    body_words: int = 120
+    records: int = 1
+
+    def __post_init__(self):
+        if self.dialect not in DIALECTS.get(self.kind, ()):
+            msg = f"Unknown dialect {self.dialect} of {self.kind}"
+            raise ValueError(msg)
+
+
+class CorpusGenerator:
+    """Seeded generator of JATS, OAI-DC and MARC deliveries
+
+    Every document is generated from its own random generator, seeded
+    with the seed and the number of the document. A delivery with more
+    documents starts with the documents of a smaller one.
+
+    Parameters
+    ----------
+    spec : CorpusSpec
+        Knobs of the delivery
+    """
+
+    def __init__(self, spec: CorpusSpec) -> None:
+        self.spec = spec
+
+    def __rng__(self, num: int) -> random.Random:
+        return random.Random(f"{self.spec.seed}:{self.spec.dialect}:{num}")
+
+    def word(self, rng: random.Random) -> str:
+        return "".join(rng.choices(SYLLABLES, k=rng.randint(1, 4)))
+
+    def words(self, rng: random.Random, num: int, scripts: float = 0.0) -> str:
+        words = []
+
+        for _ in range(num):
+            word = self.word(rng)
+
+            if rng.random() < scripts:
+                tag = rng.choice(("sub", "sup"))
+                word += f"<{tag}>{rng.randint(1, 9)}</{tag}>"
+
+            words.append(word)
+
+        return " ".join(words)
+
+    def formula(self, rng: random.Random, num: int, mathml: bool, tex: bool) -> str:
+        texcode, mmlcode = rng.choice(FORMULAS)
+        alternatives = []
+
+        if tex:
+            alternatives.append(
+                f'<tex-math id="IEq{num}_TeX">\\documentclass[12pt]{{minimal}}'
+                f"\\begin{{document}}${texcode}$\\end{{document}}</tex-math>"
+            )
+
+        if mathml:
+            alternatives.append(f'<mml:math id="IEq{num}_Math">{mmlcode}</mml:math>')
+
+        content = "".join(alternatives)
+
+        if len(alternatives) > 1:
+            content = f"<alternatives>{content}</alternatives>"
+
+        return f'<inline-formula id="IEq{num}">{content}</inline-formula>'
+
+    def paragraph(self, rng: random.Random, num: int) -> str:
+        """A paragraph of sentences with formulas and sub/sup"""
+        sentences = []
+        remaining = num
+
+        while remaining > 0:
+            size = min(remaining, rng.randint(6, 20))
+            remaining -= size
+
+            sentence = self.words(rng, size, self.spec.scripts).capitalize()
+
+            mathml = rng.random() < self.spec.mathml
+            tex = rng.random() < self.spec.tex
+
+            if mathml or tex:
+                sentence += " " + self.formula(rng, len(sentences), mathml, tex)
+
+            sentences.append(sentence + ".")
+
+        return f"<p>{' '.join(sentences)}</p>"
+
+    def date(self, rng: random.Random) -> datetime.date:
+        return datetime.date(2020, 1, 1) + datetime.timedelta(days=rng.randint(0, 1800))
+
+    def person(self, rng: random.Random) -> tuple[str, str]:
+        return rng.choice(GIVEN_NAMES), rng.choice(SURNAMES)
+
+    def jats(self, num: int) -> bytes:
+        """A JATS document of the dialect"""
+        rng = self.__rng__(num)
+        dialect = self.spec.dialect
+        publisher, place, prefix = PUBLISHERS[dialect]
+
+        journal_num = rng.randint(1, 50)
+        issns = (
+            f"{1000 + journal_num}-{2000 + journal_num}",
+            f"{3000 + journal_num}-{4000 + journal_num}",
+        )
+        epub = self.date(rng)
+        ppub = epub + datetime.timedelta(days=rng.randint(0, 90))
+
+        def pubdate(pubtype: str, pdate: datetime.date) -> str:
+            attrs = {
+                "springer": 'date-type="pub" publication-format="{fmt}"',
+                "degruyter": 'pub-type="{pubtype}"',
+                "emerald": 'date-type="{pubtype}"',
+            }[dialect].format(
+                pubtype=pubtype, fmt="electronic" if pubtype == "epub" else "print"
+            )
+            return (
+                f"<pub-date {attrs}><day>{pdate.day:02}</day>"
+                f"<month>{pdate.month:02}</month><year>{pdate.year}</year></pub-date>"
+            )
+
+        if dialect == "springer":
+            issn_xml = (
+                f'<issn publication-format="print">{issns[0]}</issn>'
+                f'<issn publication-format="electronic">{issns[1]}</issn>'
+            )
+            jid = JOURNAL_ID.format(jidtype="publisher-id", jid=journal_num)
+        else:
+            issn_xml = (
+                f'<issn pub-type="ppub">{issns[0]}</issn>'
+                f'<issn pub-type="epub">{issns[1]}</issn>'
+            )
+            jidtype = "publisher" if dialect == "emerald" else "publisher-id"
+            jid = JOURNAL_ID.format(jidtype=jidtype, jid=f"J{journal_num:03}")
+
+        num_affs = rng.randint(1, max(1, self.spec.affiliations))
+        affs = "".join(
+            AFF.format(
+                num=i + 1,
+                ror=f"https://ror.org/0{rng.randint(10000, 99999)}",
+                institution=rng.choice(INSTITUTIONS),
+            )
+            for i in range(num_affs)
+        )
+
+        contribs = []
+        for i in range(rng.randint(*self.spec.authors)):
+            given, surname = self.person(rng)
+            orcid = ""
+            if rng.random() < 0.5:
+                parts = "-".join(str(rng.randint(1000, 9999)) for _ in range(3))
+                orcid = ORCID.format(orcid=f"https://orcid.org/0000-{parts}")
+            contribs.append(
+                CONTRIB.format(
+                    orcid=orcid,
+                    surname=surname,
+                    given=given,
+                    aff=rng.randint(1, num_affs),
+                )
+            )
+
+        paras = "".join(
+            self.paragraph(rng, self.spec.abstract_words)
+            for _ in range(self.spec.abstract_paragraphs)
+        )
+        abstracts = f'<abstract xml:lang="en"><title>Abstract</title>{paras}</abstract>'
+
+        keywords = "".join(
+            f"<kwd>{self.word(rng)}</kwd>" for _ in range(self.spec.keywords)
+        )
+
+        body = "".join(
+            f"\n    <sec><title>{self.words(rng, 3).capitalize()}</title>"
+            f"{self.paragraph(rng, self.spec.body_words)}</sec>"
+            for _ in range(self.spec.body_paragraphs)
+        )
+
+        open_access = rng.random() < 0.3
+        license = ""
+        if open_access:
+            license = (
+                '\n        <license license-type="open-access" '
+                'xlink:href="https://creativecommons.org/licenses/by/4.0/"/>'
+            )
+
+        fpage = rng.randint(1, 900)
+
+        document = JATS.format(
+            mml=NAMESPACES["mml"],
+            xlink=NAMESPACES["xlink"],
+            journal_ids=jid,
+            journal=f"Journal of {self.word(rng).capitalize()} Studies {journal_num}",
+            issns=issn_xml,
+            publisher=publisher,
+            place=place,
+            num=num,
+            doi=f"{prefix}/s{journal_num:05}-{epub.year}-{num:08}",
+            title=self.words(rng, rng.randint(5, 15), self.spec.scripts).capitalize(),
+            contribs="".join(contribs),
+            affs=affs,
+            pubdates=pubdate("epub", epub) + pubdate("ppub", ppub),
+            volume=epub.year - 1950,
+            issue=rng.randint(1, 12),
+            fpage=fpage,
+            lpage=fpage + rng.randint(5, 40),
+            year=epub.year,
+            license=license,
+            abstracts=abstracts,
+            keywords=keywords,
+            open_access="true" if open_access else "false",
+            body=body,
+        )
+
+        return document.encode("utf-8")
+
+    def oai(self, num: int) -> str:
+        """An OAI-DC record of the dialect"""
+        rng = self.__rng__(num)
+        dialect = self.spec.dialect
+        publisher, place, prefix = PUBLISHERS[dialect]
+
+        journal_num = rng.randint(1, 50)
+        issn = f"{1000 + journal_num}-{2000 + journal_num}"
+        pdate = self.date(rng)
+        fpage = rng.randint(1, 300)
+
+        creators = "".join(
+            "\n      <dc:creator>{1}, {0}</dc:creator>".format(*self.person(rng))
+            for _ in range(rng.randint(*self.spec.authors))
+        )
+
+        subjects = "".join(
+            f"\n      <dc:subject>{self.word(rng)} / {self.word(rng)}</dc:subject>"
+            for _ in range(self.spec.keywords)
+        )
+
+        abstract = " ".join(
+            self.words(rng, self.spec.abstract_words).capitalize() + "."
+            for _ in range(self.spec.abstract_paragraphs)
+        )
+
+        journal = f"Revue {self.word(rng).capitalize()} {journal_num}"
+
+        source = ""
+        if dialect == "cairn":
+            source = (
+                f"\n      <dc:source>{journal} | {pdate.year}/{rng.randint(1, 4)} | "
+                f"{pdate.year - 1950} | {pdate.isoformat()} | "
+                f"p. {fpage}-{fpage + rng.randint(5, 30)} | {issn}</dc:source>"
+            )
+
+        open_access = rng.random() < 0.5
+
+        if dialect == "cairn":
+            # Cairn gives ISO 639-2 codes
+            language = "fre"
+            rights = "CC BY"
+            access = "free access" if open_access else "restricted access"
+        else:
+            language = "fr"
+            rights = "info:eu-repo/semantics/openAccess"
+            access = "free access"
+
+        return OAI_RECORD.format(
+            oai=NAMESPACES["oai"],
+            oai_dc=NAMESPACES["oai_dc"],
+            dc=NAMESPACES["dc"],
+            dcterms=NAMESPACES["dcterms"],
+            dialect=dialect,
+            num=num,
+            datestamp=f"{pdate.isoformat()}T10:00:00Z",
+            title=self.words(rng, rng.randint(5, 15)).capitalize(),
+            creators=creators,
+            subjects=subjects,
+            abstract=abstract,
+            journal=journal,
+            date=pdate.isoformat(),
+            doi=f"{prefix}/{dialect}.{journal_num:03}.{num:08}",
+            source=source,
+            issn=issn,
+            language=language,
+            rights=rights,
+            access=access,
+        )
+
+    def marc(self, num: int) -> pymarc.Record:
+        """A MARC record of an article"""
+        rng = self.__rng__(num)
+        pdate = self.date(rng)
+
+        record = pymarc.Record()
+        record.add_field(pymarc.Field(tag="001", data=f"marc{num:08}"))
+
+        def field(tag: str, indicators: str, **subfields) -> pymarc.Field:
+            return pymarc.Field(
+                tag=tag,
+                indicators=pymarc.Indicators(*indicators),
+                subfields=[
+                    pymarc.Subfield(code=code.removeprefix("_"), value=value)
+                    for code, value in subfields.items()
+                ],
+            )
+
+        journal_num = rng.randint(1, 50)
+        issn = f"{1000 + journal_num}-{2000 + journal_num}"
+
+        # The ISSN of the journal is taken from the DOI
+        doi = f"https://doi.org/10.1007/{issn}.{num:08}"
+        record.add_field(field("024", "7 ", a=doi, _2="doi"))
+        record.add_field(field("024", "7 ", a=f"urn:nbn:de:example-{num:08}", _2="urn"))
+        record.add_field(field("041", "  ", a="eng"))
+
+        for i in range(rng.randint(*self.spec.authors)):
+            given, surname = self.person(rng)
+            record.add_field(
+                field(
+                    "100" if i == 0 else "700", "1 ", a=f"{surname}, {given}", _4="aut"
+                )
+            )
+
+        title = self.words(rng, rng.randint(5, 15)).capitalize()
+        record.add_field(field("245", "00", a=title))
+
+        journal = f"Journal of {self.word(rng).capitalize()} Studies {journal_num}"
+        volume = pdate.year - 1950
+        record.add_field(field("490", "0 ", a=f"In: {journal}; {volume}"))
+        record.add_field(
+            field("264", " 1", b=PUBLISHERS["springer"][0], c=str(pdate.year))
+        )
+
+        for _ in range(self.spec.abstract_paragraphs):
+            abstract = self.words(rng, self.spec.abstract_words).capitalize() + "."
+            record.add_field(field("520", "  ", a=abstract))
+
+        for _ in range(self.spec.keywords):
+            record.add_field(field("650", " 4", a=self.word(rng)))
+
+        record.add_field(field("856", "40", u=f"https://example.org/marc/{num:08}"))
+
+        return record
+
+    def members(self) -> Generator[tuple[str, bytes], None, None]:
+        """Names and contents of the members of the delivery"""
+        spec = self.spec
+        # Every JATS document is a file of its own
+        records = 1 if spec.kind == "jats" else max(1, spec.records)
+        size = 0
+        num = 0
+
+        while num < spec.documents:
+            if spec.max_bytes > 0 and size >= spec.max_bytes:
+                break
+
+            nums = range(num, min(num + records, spec.documents))
+            num = nums.stop
+
+            if spec.kind == "jats":
+                name, data = f"{spec.dialect}-{nums.start:08}.xml", self.jats(
+                    nums.start
+                )
+
+            elif spec.kind == "oai":
+                if records == 1:
+                    data = '<?xml version="1.0" encoding="UTF-8"?>\n'
+                    data += self.oai(nums.start)
+                else:
+                    data = LISTRECORDS.format(
+                        oai=NAMESPACES["oai"],
+                        datestamp="2025-01-01T00:00:00Z",
+                        records="".join(self.oai(i) for i in nums),
+                    )
+                name, data = f"{spec.dialect}-{nums.start:08}.xml", data.encode("utf-8")
+
+            elif spec.dialect == "binary":
+                name = f"records-{nums.start:08}.mrc"
+                data = b"".join(self.marc(i).as_marc() for i in nums)
+
+            else:
+                name = f"records-{nums.start:08}.xml"
+                data = b'<?xml version="1.0" encoding="UTF-8"?>\n'
+                data += b'<collection xmlns="http://www.loc.gov/MARC21/slim">'
+                data += b"".join(
+                    pymarc.record_to_xml(self.marc(i), namespace=False) for i in nums
+                )
+                data += b"</collection>\n"
+
+            size += len(data)
+
+            yield name, data
+
+    def write(self, path: Path) -> Corpus:
+        """Write the delivery as ZIP file
+
+        Returns
+        -------
+        Corpus
+            Input of the benchmarks
+        """
+        logger = logging.getLogger(__name__)
+
+        path = Path(path)
+        members = size = 0
+
+        with zipfile.ZipFile(path, "w") as zfh:
+            for name, data in self.members():
+                zinfo = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+                zinfo.compress_type = zipfile.ZIP_DEFLATED
+                zfh.writestr(zinfo, data)
+
+                members += 1
+                size += len(data)
+
+        msg = f"{path.name}: {members} members, {size} bytes"
+        logger.info(msg)
+
+        return Corpus(
+            self.spec.kind,
+            path,
+            publisher=self.spec.dialect,
+            listrecords=self.spec.kind == "oai" and self.spec.records > 1,
+        )
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""Extraction times of the single fields of a JATS document
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import functools
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from lxml import etree
+from pathlib import Path
+from types import FunctionType
+from typing import Generator
+from vzg.jconv.converter.jats import JatsArticle, JatsConverter
+from vzg.jconv.journal import JOURNAL_META_CACHE, JatsJournal
+from vzg.jconv.person import Person
+
+FIELD_CLASSES = (JatsConverter, JatsArticle, JatsJournal, Person)
+
+# Methods which are no fields or wrap every field
+IGNORED_METHODS = ("__init__", "run", "release", "xpath")
+
+# Field profiler of the running inspection
+__active__ = None
+
+
+class CountingElement(etree.ElementBase):
+    """Element counting its XPath evaluations"""
+
+    def xpath(self, *args, **kwargs):
+        if __active__ is not None:
+            __active__.xpath()
+
+        return super().xpath(*args, **kwargs)
+
+
+class CountingTree:
+    """Element tree counting its XPath evaluations"""
+
+    def __init__(self, tree: etree._ElementTree) -> None:
+        self.__tree__ = tree
+
+    def xpath(self, *args, **kwargs):
+        if __active__ is not None:
+            __active__.xpath()
+
+        return self.__tree__.xpath(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.__tree__, name)
+
+
+@dataclass
+class FieldTiming:
+    """Measurements of a field
+
+    Parameters
+    ----------
+    name : str
+        Class and name of the property or method
+    calls : int
+        Number of accesses
+    seconds : float
+        Time including the nested fields
+    own : float
+        Time without the nested fields
+    xpaths : int
+        XPath evaluations without the nested fields
+    """
+
+    name: str
+    calls: int = 0
+    seconds: float = 0.0
+    own: float = 0.0
+    xpaths: int = 0
+
+
+class FieldProfiler:
+    """Time the properties and methods of the JATS classes
+
+    Within `instrument` the properties and methods of the classes
+    are replaced by timed versions and the parsed documents count
+    their XPath evaluations. Times and XPath evaluations of a field
+    are split into its own ones and those of the nested fields.
+    """
+
+    def __init__(self, classes: tuple = FIELD_CLASSES) -> None:
+        self.classes = classes
+        self.fields = {}
+        self.stack = []
+        self.total_xpaths = 0
+
+    def xpath(self) -> None:
+        self.total_xpaths += 1
+
+        if len(self.stack) > 0:
+            self.stack[-1][2] += 1
+
+    def timed(self, name: str, func):
+        """The function, timing its calls as the field name"""
+        timing = self.fields.setdefault(name, FieldTiming(name))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Start time, time of the nested fields, own XPath evaluations
+            entry = [time.perf_counter(), 0.0, 0]
+            self.stack.append(entry)
+
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - entry[0]
+                self.stack.pop()
+
+                timing.calls += 1
+                timing.seconds += elapsed
+                timing.own += elapsed - entry[1]
+                timing.xpaths += entry[2]
+
+                if len(self.stack) > 0:
+                    self.stack[-1][1] += elapsed
+
+        return wrapper
+
+    def __replacements__(self, cls: type) -> dict:
+        """The timed versions of the fields of a class"""
+        replacements = {}
+
+        for name, attr in vars(cls).items():
+            qualname = f"{cls.__name__}.{name}"
+
+            if isinstance(attr, property) and attr.fget is not None:
+                replacements[name] = attr.getter(self.timed(qualname, attr.fget))
+            elif isinstance(attr, functools.cached_property):
+                cached = functools.cached_property(self.timed(qualname, attr.func))
+                cached.__set_name__(cls, name)
+                replacements[name] = cached
+            elif isinstance(attr, FunctionType) and name not in IGNORED_METHODS:
+                replacements[name] = self.timed(qualname, attr)
+
+        return replacements
+
+    @contextmanager
+    def instrument(self) -> Generator["FieldProfiler", None, None]:
+        """Time the fields within the context"""
+        global __active__
+
+        originals = []
+
+        for cls in self.classes:
+            for name, replacement in self.__replacements__(cls).items():
+                originals.append((cls, name, vars(cls)[name]))
+                setattr(cls, name, replacement)
+
+        parser = etree.XMLParser()
+        parser.set_element_class_lookup(
+            etree.ElementDefaultClassLookup(element=CountingElement)
+        )
+        etree.set_default_parser(parser)
+
+        previous = __active__
+        __active__ = self
+
+        try:
+            yield self
+        finally:
+            __active__ = previous
+            etree.set_default_parser()
+
+            for cls, name, original in originals:
+                setattr(cls, name, original)
+
+    def ranked(self) -> list[FieldTiming]:
+        """The accessed fields, the highest own time first"""
+        return sorted(
+            (timing for timing in self.fields.values() if timing.calls > 0),
+            key=lambda timing: timing.own,
+            reverse=True,
+        )
+
+
+@dataclass
+class Inspection:
+    """Field times of the conversion of a document
+
+    Parameters
+    ----------
+    name : str
+        Name of the document
+    repeat : int
+        Number of conversions
+    articles : int
+        Number of articles of a conversion
+    parse : float
+        Time of parsing
+    seconds : float
+        Time of the conversions, without parsing
+    xpaths : int
+        All XPath evaluations
+    fields : list
+        The fields, the highest own time first
+    """
+
+    name: str
+    repeat: int
+    articles: int
+    parse: float
+    seconds: float
+    xpaths: int
+    fields: list[FieldTiming]
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "repeat": self.repeat,
+            "articles": self.articles,
+            "parse": self.parse,
+            "seconds": self.seconds,
+            "xpaths": self.xpaths,
+            "fields": [vars(timing) for timing in self.fields],
+        }
+
+    def summary(self, top: int = 0) -> str:
+        """Ranked breakdown, top limits the number of fields"""
+        fields = self.fields if top < 1 else self.fields[:top]
+        seconds = self.seconds if self.seconds > 0 else float("nan")
+
+        lines = [
+            f"{self.name}: {self.articles} article(s), {self.repeat} conversion(s)",
+            f"parse {self.parse * 1000:.3f} ms, fields {self.seconds * 1000:.3f} ms, "
+            f"{self.xpaths} XPath evaluations",
+            f"{'field':<32} {'calls':>6} {'own ms':>10} {'share':>7} "
+            f"{'total ms':>10} {'xpaths':>7}",
+        ]
+
+        for timing in fields:
+            lines.append(
+                f"{timing.name:<32} {timing.calls:6} {timing.own * 1000:10.3f} "
+                f"{timing.own / seconds:7.1%} {timing.seconds * 1000:10.3f} "
+                f"{timing.xpaths:7}"
+            )
+
+        return "\n".join(lines)
+
+
+def inspect_document(jatspath: Path, name: str = "", repeat: int = 1) -> Inspection:
+    """Convert a JATS file with timed fields
+
+    Every conversion starts with an empty journal cache, like
+    the first document of a delivery.
+    """
+    profiler = FieldProfiler()
+    articles = 0
+    parse = seconds = 0.0
+
+    with profiler.instrument():
+        for _ in range(repeat):
+            JOURNAL_META_CACHE.clear()
+
+            start = time.perf_counter()
+            conv = JatsConverter(jatspath, name=name)
+            conv.dom = CountingTree(conv.dom)
+            parse += time.perf_counter() - start
+
+            start = time.perf_counter()
+            conv.run()
+            for article in conv.articles:
+                article.json
+            seconds += time.perf_counter() - start
+
+            articles = len(conv.articles)
+
+    return Inspection(
+        name=name or Path(jatspath).name,
+        repeat=repeat,
+        articles=articles,
+        parse=parse,
+        seconds=seconds,
+        xpaths=profiler.total_xpaths,
+        fields=profiler.ranked(),
+    )
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+"""Performance regression gate
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import logging
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+from vzg.jconv.bench import STAGES, Report, file_digest
+from vzg.jconv.bench.adversarial import WORST_CASES, WorstCase, measure
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.bench.targets import TARGETS, run_benchmarks
+
+# The fixed corpus of the gate, changes invalidate the baselines
+GATE_CORPORA = (
+    CorpusSpec(
+        "jats",
+        "springer",
+        documents=100,
+        seed=1,
+        mathml=0.1,
+        tex=0.1,
+        scripts=0.02,
+        body_paragraphs=2,
+    ),
+    CorpusSpec("jats", "degruyter", documents=50, seed=2),
+    CorpusSpec("oai", "cairn", documents=200, seed=3, records=50),
+    CorpusSpec("oai", "openedition", documents=100, seed=4),
+    CorpusSpec("marc", "binary", documents=200, seed=5, records=100),
+)
+
+# Seconds of a production worst case, the cases take below half a second
+WORST_CASE_SECONDS = 5.0
+
+
+@dataclass
+class GateResult:
+    """Outcome of the comparison with a baseline
+
+    Parameters
+    ----------
+    lines : list
+        Human readable diff
+    failures : list
+        Reasons of the failure, empty if the gate passed
+    """
+
+    lines: list[str] = field(default_factory=list)
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return len(self.failures) == 0
+
+    def fail(self, msg: str) -> None:
+        self.failures.append(msg)
+        self.lines.append(f"  FAIL {msg}")
+
+
+def change(old: float, new: float) -> str:
+    if not old:
+        return ""
+
+    return f" ({(new - old) / old:+.1%})"
+
+
+def megabytes(value: int | None) -> str:
+    return "-" if value is None else f"{value / 1e6:.1f} MB"
+
+
+def best_of(reports: list[Report]) -> Report:
+    """The fastest result of every benchmark
+
+    The peak RSS is the maximum of all rounds.
+    """
+    best = Report(meta=reports[0].meta)
+
+    for name in reports[0].results:
+        results = [report.results[name] for report in reports]
+
+        best.results[name] = dict(max(results, key=lambda res: res["docs_per_s"]))
+
+        peaks = [res["peak_rss"] for res in results if res["peak_rss"] is not None]
+        if len(peaks) > 0:
+            best.results[name]["peak_rss"] = max(peaks)
+
+    return best
+
+
+def run_gate_benchmarks(
+    workdir: Path,
+    specs: Iterable[CorpusSpec] = GATE_CORPORA,
+    targets: Iterable[str] = TARGETS,
+    rounds: int = 3,
+) -> Report:
+    """Generate the corpora and run the benchmarks
+
+    The report holds the digests of the corpora in `corpora`.
+    """
+    logger = logging.getLogger(__name__)
+
+    corpora = []
+    digests = {}
+
+    for spec in specs:
+        name = f"{spec.kind}-{spec.dialect}"
+        corpus = CorpusGenerator(spec).write(workdir / f"{name}.zip")
+        corpus.name = name
+
+        corpora.append(corpus)
+        digests[name] = file_digest(corpus.path)
+
+    reports = []
+
+    for num in range(rounds):
+        msg = f"Runde {num + 1}/{rounds}"
+        logger.info(msg)
+
+        reports.append(run_benchmarks(corpora, targets=targets))
+
+    report = best_of(reports)
+    report.meta["corpora"] = digests
+
+    return report
+
+
+def compare(
+    baseline: Report,
+    current: Report,
+    throughput_tolerance: float = 0.1,
+    memory_tolerance: float = 0.1,
+) -> GateResult:
+    """Compare a report with the baseline
+
+    The gate fails if the throughput of a benchmark drops or its
+    peak memory grows beyond the tolerances, or if the written
+    articles differ. The stages are shown, but do not fail the
+    gate, small stages are too noisy.
+    """
+    result = GateResult()
+
+    if baseline.meta.get("corpora") != current.meta.get("corpora"):
+        result.fail("the corpora differ from the baseline, update the baseline")
+
+    for key in ("commit", "python", "platform"):
+        if baseline.meta.get(key) != current.meta.get(key):
+            result.lines.append(
+                f"{key}: {baseline.meta.get(key)} -> {current.meta.get(key)}"
+            )
+
+    for name, old in baseline.results.items():
+        new = current.results.get(name)
+
+        if new is None:
+            result.lines.append(name)
+            result.fail(f"{name}: missing")
+            continue
+
+        result.lines.append(
+            f"{name}: {old['docs_per_s']:.1f} -> {new['docs_per_s']:.1f} docs/s"
+            f"{change(old['docs_per_s'], new['docs_per_s'])}"
+        )
+
+        for stage in STAGES:
+            if stage not in old["stages"] or stage not in new["stages"]:
+                continue
+
+            old_ms = old["stages"][stage]["mean"] * 1000
+            new_ms = new["stages"][stage]["mean"] * 1000
+            result.lines.append(
+                f"  {stage:<10} {old_ms:8.3f} -> {new_ms:8.3f} ms/doc"
+                f"{change(old_ms, new_ms)}"
+            )
+
+        result.lines.append(
+            f"  peak RSS   {megabytes(old['peak_rss'])} -> "
+            f"{megabytes(new['peak_rss'])}"
+        )
+
+        if new["docs_per_s"] < old["docs_per_s"] * (1 - throughput_tolerance):
+            result.fail(
+                f"{name}: throughput dropped by more than {throughput_tolerance:.0%}"
+            )
+
+        if old["peak_rss"] is not None and new["peak_rss"] is not None:
+            if new["peak_rss"] > old["peak_rss"] * (1 + memory_tolerance):
+                result.fail(
+                    f"{name}: peak memory grew by more than {memory_tolerance:.0%}"
+                )
+
+        for key in ("documents", "articles", "invalid"):
+            if old[key] != new[key]:
+                result.fail(f"{name}: {key} {old[key]} -> {new[key]}")
+
+        if old["digest"] != new["digest"]:
+            result.fail(f"{name}: the output JSON differs")
+
+    return result
+
+
+def check_worst_cases(
+    result: GateResult,
+    workdir: Path,
+    max_seconds: float = WORST_CASE_SECONDS,
+    cases: Iterable[WorstCase] = WORST_CASES,
+) -> None:
+    """Fail the gate, if a worst case of production size is too slow
+
+    The tests only check the growth of the pathological documents,
+    absolute limits depend on the machine.
+    """
+    for case in cases:
+        measurement = measure(case, case.size, workdir)
+
+        result.lines.append(f"worst case {case.name}: {measurement.seconds:.3f} s")
+
+        if measurement.seconds > max_seconds:
+            result.fail(
+                f"worst case {case.name}: {measurement.seconds:.1f} s "
+                f"> {max_seconds} s"
+            )
+
+
+def run_gate(
+    baseline_path: Path,
+    update: bool = False,
+    throughput_tolerance: float = 0.1,
+    memory_tolerance: float = 0.1,
+    targets: Iterable[str] = TARGETS,
+    rounds: int = 3,
+    worst_case_seconds: float = WORST_CASE_SECONDS,
+) -> GateResult:
+    """Run the gate against the stored baseline
+
+    Without a baseline, or with `update`, the results are stored
+    as the new baseline and the gate passes. Otherwise the worst
+    cases must be converted within `worst_case_seconds`, 0 skips
+    them.
+    """
+    logger = logging.getLogger(__name__)
+
+    baseline_path = Path(baseline_path)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        current = run_gate_benchmarks(Path(tmpdir), targets=targets, rounds=rounds)
+
+    if update or not baseline_path.is_file():
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        current.save(baseline_path)
+
+        msg = f"Baseline {baseline_path} gespeichert"
+        logger.info(msg)
+
+        return GateResult(lines=[f"baseline written to {baseline_path}"])
+
+    result = compare(
+        Report.load(baseline_path),
+        current,
+        throughput_tolerance=throughput_tolerance,
+        memory_tolerance=memory_tolerance,
+    )
+
+    if worst_case_seconds > 0:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            check_worst_cases(result, Path(tmpdir), max_seconds=worst_case_seconds)
+
+    return result
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+"""Benchmarks of the converters, the archives and simple-conv
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import io
+import json
+import jsonschema
+import logging
+import pymarc
+import tempfile
+import time
+from dataclasses import dataclass
+from lxml import etree
+from pathlib import Path
+from typing import Callable, Generator, Iterable
+from vzg.jconv.archives.oai import ArchiveOAIDC, Header, MarcArchive, Metadata
+from vzg.jconv.archives.oai import is_marc_binary, open_marc_binary
+from vzg.jconv.archives.sources import open_source
+from vzg.jconv.archives.springer import ArchiveSpringer
+from vzg.jconv.bench import Report, Result, StageTimer, file_digest, peak_rss
+from vzg.jconv.converter.MarcXmlConverter import MarcConverter
+from vzg.jconv.converter.jats import JatsConverter
+from vzg.jconv.converter.oai import OAIDCConverter
+from vzg.jconv.gapi import JSON_VALIDATOR, NAMESPACES, OAI_ARTICLES_TYPES
+from vzg.jconv.interfaces import IArchive, IConverter, ISink
+from vzg.jconv.sinks.jsonl import JsonLinesSink
+from vzg.jconv.tools.simple_conv import create_parser
+
+KINDS = ("jats", "oai", "marc")
+
+
+@dataclass
+class Corpus:
+    """Input of the benchmarks
+
+    Parameters
+    ----------
+    kind : str
+        jats, oai or marc
+    path : pathlib.Path
+        ZIP or tar file, directory or glob pattern,
+        for MARC also a file with binary records
+    publisher : str
+        Article type of OAI records
+    listrecords : bool
+        The OAI members are ListRecords responses
+    name : str
+        Name of the corpus in the report, default: the kind
+    """
+
+    kind: str
+    path: Path
+    publisher: str = "cairn"
+    listrecords: bool = False
+    name: str = ""
+
+    def __post_init__(self):
+        if self.name == "":
+            self.name = self.kind
+
+    @property
+    def is_marc_binary(self) -> bool:
+        path = Path(self.path)
+        return self.kind == "marc" and path.is_file() and is_marc_binary(path.name)
+
+    @property
+    def documents(self) -> Generator[tuple[str, bytes], None, None]:
+        """Names and contents of the input files"""
+        if self.is_marc_binary:
+            yield Path(self.path).name, Path(self.path).read_bytes()
+            return None
+
+        for member in open_source(self.path).members:
+            yield member.name, member.read()
+
+    @property
+    def num_files(self) -> int:
+        if self.is_marc_binary:
+            return 1
+
+        return open_source(self.path).num_files
+
+    @property
+    def size(self) -> int:
+        """Size of the input in bytes"""
+        if self.is_marc_binary:
+            return Path(self.path).stat().st_size
+
+        return sum(member.size for member in open_source(self.path).members)
+
+
+def jats_converters(
+    corpus: Corpus, documents: list[tuple[str, bytes]], workdir: Path
+) -> Callable[[], Generator[IConverter, None, None]]:
+    """JatsConverter reads files, the documents are stored beforehand"""
+    paths = []
+
+    for i, (name, data) in enumerate(documents):
+        fpath = workdir / f"{i}.xml"
+        fpath.write_bytes(data)
+        paths.append((name, fpath))
+
+    def converters():
+        logger = logging.getLogger(__name__)
+
+        for name, fpath in paths:
+            try:
+                yield JatsConverter(fpath, name=name)
+            except (etree.Error, ValueError, OSError):
+                msg = f"Konvertierungsproblem in {name}"
+                logger.error(msg, exc_info=True)
+
+    return converters
+
+
+def oai_converters(
+    corpus: Corpus, documents: list[tuple[str, bytes]], workdir: Path
+) -> Callable[[], Generator[IConverter, None, None]]:
+    """Every record of a document, single records or ListRecords responses"""
+    atype = getattr(OAI_ARTICLES_TYPES, corpus.publisher, OAI_ARTICLES_TYPES.unknown)
+    tag = f"{{{NAMESPACES['oai']}}}record"
+
+    def converters():
+        logger = logging.getLogger(__name__)
+
+        for name, data in documents:
+            try:
+                for event, elem in etree.iterparse(io.BytesIO(data), tag=tag):
+                    yield OAIDCConverter(
+                        Header(elem), Metadata(elem), article_type=atype, name=name
+                    )
+            except (etree.Error, ValueError, KeyError, IndexError, TypeError):
+                msg = f"Konvertierungsproblem in {name}"
+                logger.error(msg, exc_info=True)
+
+    return converters
+
+
+def marc_converters(
+    corpus: Corpus, documents: list[tuple[str, bytes]], workdir: Path
+) -> Callable[[], Generator[IConverter, None, None]]:
+    """Every record of MARCXML or binary MARC documents"""
+
+    def records(name: str, data: bytes):
+        if is_marc_binary(name):
+            with open_marc_binary(io.BytesIO(data)) as fh:
+                reader = pymarc.MARCReader(fh, to_unicode=True, permissive=True)
+                yield from (record for record in reader if record is not None)
+            return None
+
+        yield from pymarc.parse_xml_to_array(io.BytesIO(data))
+
+    def converters():
+        logger = logging.getLogger(__name__)
+
+        for name, data in documents:
+            try:
+                for record in records(name, data):
+                    yield MarcConverter(record)
+            except (pymarc.PymarcException, ValueError, KeyError, IndexError):
+                msg = f"Konvertierungsproblem in {name}"
+                logger.error(msg, exc_info=True)
+
+    return converters
+
+
+CONVERTERS = {
+    "jats": jats_converters,
+    "oai": oai_converters,
+    "marc": marc_converters,
+}
+
+
+def create_archive(corpus: Corpus) -> IArchive:
+    """The archive of a corpus, the converters do not validate"""
+    if corpus.kind == "jats":
+        return ArchiveSpringer(corpus.path, converter_kwargs={})
+
+    if corpus.kind == "oai":
+        atype = getattr(
+            OAI_ARTICLES_TYPES, corpus.publisher, OAI_ARTICLES_TYPES.unknown
+        )
+        return ArchiveOAIDC(
+            corpus.path,
+            converter_kwargs={"article_type": atype},
+            listrecords=corpus.listrecords,
+        )
+
+    return MarcArchive(corpus.path, validate=False)
+
+
+def measure(
+    converters: Iterable[IConverter], timer: StageTimer, sink: ISink
+) -> tuple[int, int, int]:
+    """Convert, validate, serialize and write the articles of the converters
+
+    Parsing is the creation of the next converter.
+
+    Returns
+    -------
+    tuple
+        The number of documents, articles and invalid articles
+    """
+    converters = iter(converters)
+    documents = articles = invalid = 0
+
+    while True:
+        with timer.stage("parse"):
+            conv = next(converters, None)
+
+        if conv is None:
+            timer.discard()
+            break
+
+        with timer.stage("extract"):
+            conv.run()
+            jdicts = [article.jdict for article in conv.articles]
+
+        with timer.stage("validate"):
+            for jdict in jdicts:
+                try:
+                    JSON_VALIDATOR.validate(jdict)
+                except jsonschema.ValidationError:
+                    invalid += 1
+
+        with timer.stage("serialize"):
+            texts = [json.dumps(jdict) for jdict in jdicts]
+
+        with timer.stage("write"):
+            for j, text in enumerate(texts):
+                sink.write(f"{documents}-{j}.json", text)
+
+        timer.done()
+
+        documents += 1
+        articles += len(texts)
+
+        del conv
+
+    return documents, articles, invalid
+
+
+def bench_stages(
+    name: str,
+    corpus: Corpus,
+    repeat: int,
+    converters: Callable[[], Iterable[IConverter]],
+    workdir: Path,
+) -> Result:
+    """Run `measure` repeat times, the durations are pooled"""
+    timer = StageTimer()
+    result = Result(name)
+
+    with JsonLinesSink(workdir / "bench.jsonl") as sink:
+        start = time.perf_counter()
+
+        for _ in range(repeat):
+            documents, articles, invalid = measure(converters(), timer, sink)
+
+            result.documents += documents
+            result.articles += articles
+            result.invalid += invalid
+
+        result.seconds = time.perf_counter() - start
+
+    result.bytes = corpus.size * repeat
+    result.digest = file_digest(workdir / "bench.jsonl")
+    result.latencies = timer.latencies
+    result.stages = timer.stages
+    result.peak_rss = peak_rss()
+
+    return result
+
+
+def bench_converter(corpus: Corpus, repeat: int = 1) -> Result:
+    """The converters, the documents are read into memory beforehand"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        documents = list(corpus.documents)
+        converters = CONVERTERS[corpus.kind](corpus, documents, workdir)
+
+        return bench_stages(
+            f"{corpus.name}/converter", corpus, repeat, converters, workdir
+        )
+
+
+def bench_archive(corpus: Corpus, repeat: int = 1) -> Result:
+    """The archives, reading the input is part of parsing"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        return bench_stages(
+            f"{corpus.name}/archive",
+            corpus,
+            repeat,
+            lambda: create_archive(corpus).converters,
+            Path(tmpdir),
+        )
+
+
+def bench_cli(corpus: Corpus, repeat: int = 1) -> Result:
+    """simple-conv end to end, with validation and JSON Lines output
+
+    Only the totals are known, there are no latencies and stages.
+    The documents are the converted records from the stats of the runs,
+    a file of binary MARC records or a ListRecords response has many.
+    """
+    result = Result(f"{corpus.name}/cli")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        opath = Path(tmpdir) / "output"
+        spath = Path(tmpdir) / "stats.json"
+
+        args = [corpus.kind, "-o", str(opath), "-f", "jsonl", "--validate"]
+        args += ["--stats", str(spath)]
+        if corpus.kind == "oai":
+            args += ["-p", corpus.publisher]
+            if corpus.listrecords:
+                args.append("--listrecords")
+
+        options = create_parser().parse_args(args + [str(corpus.path)])
+
+        start = time.perf_counter()
+
+        for _ in range(repeat):
+            options.func(options)
+
+            with open(spath) as fh:
+                result.documents += json.load(fh)["counters"].get("documents", 0)
+
+        result.seconds = time.perf_counter() - start
+
+        outputs = sorted(opath.glob("*.jsonl"))
+
+        for fpath in outputs:
+            with open(fpath, "rb") as fh:
+                result.articles += sum(1 for line in fh)
+
+        result.digest = file_digest(*outputs)
+
+    result.articles *= repeat
+    result.bytes = corpus.size * repeat
+    result.peak_rss = peak_rss()
+
+    return result
+
+
+TARGETS = {
+    "converter": bench_converter,
+    "archive": bench_archive,
+    "cli": bench_cli,
+}
+
+
+def run_benchmarks(
+    corpora: Iterable[Corpus], targets: Iterable[str] = TARGETS, repeat: int = 1
+) -> Report:
+    """Run the benchmarks of the targets for every corpus
+
+    The peak RSS is the one of the process, so the order of
+    the benchmarks must be kept to compare reports.
+    """
+    logger = logging.getLogger(__name__)
+
+    report = Report()
+
+    for corpus in corpora:
+        for target in targets:
+            msg = f"Benchmark {corpus.name}/{target}: {corpus.path}"
+            logger.info(msg)
+
+            report.add(TARGETS[target](corpus, repeat=repeat))
+
+    return report
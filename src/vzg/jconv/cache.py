@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""Content-addressed cache of conversion results
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from vzg.jconv.converter.snapshot import CachedConverter
+from vzg.jconv.gapi import __schema_path__
+from vzg.jconv.interfaces import IConverter
+
+CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    articles TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+"""
+
+
+# Version of the conversion, increase it with every change of the
+# converted articles, the package version is not always bumped
+CONVERTER_VERSION = 1
+
+
+@functools.cache
+def package_version() -> str:
+    """Version of the package and hash of the article schema"""
+    try:
+        version = importlib.metadata.version("vzg.jconv")
+    except importlib.metadata.PackageNotFoundError:
+        version = "0"
+
+    with open(__schema_path__, "rb") as fh:
+        schema = hashlib.sha256(fh.read()).hexdigest()
+
+    return f"{version}:{schema}"
+
+
+def converter_version() -> str:
+    """Version of the conversion, the package and the article schema
+
+    Part of every cache key, so results of other versions are not used.
+    """
+    return f"{CONVERTER_VERSION}:{package_version()}"
+
+
+class ResultCache:
+    """Persistent cache of converted articles in a SQLite database
+
+    The key is a hash of the input document, the converter options
+    and the converter version. The value are the articles as JSON.
+    If the cache grows beyond `max_bytes`, the least recently used
+    results are removed.
+
+    Changes are committed every `batch_size` operations and on `close`.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the SQLite database
+    max_bytes : int
+        Maximal size of the cached articles, 0 means unlimited
+    batch_size : int
+        Number of operations per transaction
+    """
+
+    def __init__(self, path: Path, max_bytes: int = 0, batch_size: int = 1000) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.batch_size = batch_size
+
+        self.hits = 0
+        self.misses = 0
+        self.pending = 0
+
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(CACHE_SCHEMA)
+
+        self.size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM results")
+        self.size = self.size.fetchone()[0]
+
+        self.__evict__()
+        self.db.commit()
+
+    @staticmethod
+    def key(data: bytes, kind: str, **options) -> str:
+        """Hash of the input, the converter options and version
+
+        Parameters
+        ----------
+        data : bytes
+            The input document
+        kind : str
+            Type of the converter, e.g. jats
+        options : dict
+            Options of the converter, the name of the file is ignored
+        """
+        options = {key: str(val) for key, val in options.items() if key != "name"}
+
+        digest = hashlib.sha256(data)
+        digest.update(b"\0")
+        digest.update(json.dumps([kind, options, converter_version()]).encode())
+
+        return digest.hexdigest()
+
+    def converter(self, key: str, name: str = "", header=None) -> IConverter | None:
+        """Converter with the cached articles, None if there are none"""
+        row = self.db.execute(
+            "SELECT articles FROM results WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.db.execute(
+            "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+        )
+        self.__commit__()
+
+        return CachedConverter(json.loads(row[0]), name=name, header=header)
+
+    def put(self, key: str, converter: IConverter) -> None:
+        """Store the articles of a converter, which has run
+
+        Results with validation errors are not stored.
+        """
+        if isinstance(converter, CachedConverter) or converter.validation_failed:
+            return None
+
+        articles = json.dumps([article.json for article in converter.articles])
+        size = len(articles)
+
+        old = self.db.execute("SELECT size FROM results WHERE key = ?", (key,))
+        old = old.fetchone()
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            (key, articles, size, time.time()),
+        )
+        self.size += size - (0 if old is None else old[0])
+
+        self.__evict__()
+        self.__commit__()
+
+    def __evict__(self) -> None:
+        """Remove the least recently used results"""
+        if self.max_bytes <= 0 or self.size <= self.max_bytes:
+            return None
+
+        rows = self.db.execute("SELECT key, size FROM results ORDER BY accessed")
+
+        keys = []
+        for key, size in rows:
+            if self.size <= self.max_bytes:
+                break
+
+            keys.append((key,))
+            self.size -= size
+
+        self.db.executemany("DELETE FROM results WHERE key = ?", keys)
+
+    def __commit__(self, force: bool = False) -> None:
+        self.pending += 1
+
+        if force or self.pending >= self.batch_size:
+            self.db.commit()
+            self.pending = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    @property
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "size": self.size,
+        }
+
+    def close(self) -> None:
+        logger = logging.getLogger(__name__)
+
+        self.__commit__(force=True)
+        self.db.close()
+
+        msg = f"Cache {self.path}: {self.hits} hit(s), {self.misses} miss(es) "
+        msg += f"({self.hit_rate:.1%}), {self.size} bytes"
+        logger.info(msg)
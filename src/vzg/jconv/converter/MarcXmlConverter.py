@@ -9,17 +9,20 @@
 ##############################################################################
 """
 
-from vzg.jconv.gapi import JSON_SCHEMA
+from vzg.jconv.gapi import JSON_VALIDATOR
 from vzg.jconv.interfaces import IArticle
 from vzg.jconv.interfaces import IConverter
 from vzg.jconv.journal import MarcJournal
 from vzg.jconv.langcode import ISO_639
+from vzg.jconv import stats
 from zope.interface import implementer
 import json
 import jsonschema
 import logging
 import pymarc
 
+logger = logging.getLogger(__name__)
+
 
 @implementer(IArticle)
 class MarcArticle:
@@ -46,7 +49,10 @@ class MarcArticle:
 
     @property
     def json(self) -> str:
-        return json.dumps(self.jdict)
+        jdict = self.jdict
+
+        with stats.timer("serialize"):
+            return json.dumps(jdict)
 
     @property
     def lang_code(self):
@@ -158,24 +164,30 @@ class MarcArticle:
 
 @implementer(IConverter)
 class MarcConverter:
-    def __init__(self, record: pymarc.Record, validate: bool = False):
+    def __init__(self, record: pymarc.Record, validate: bool = False, name: str = ""):
         self.record = record
         self.validate = validate
+        self.name = name
         self.validation_failed = False
 
         self.articles = []
 
     def run(self) -> None:
-        logger = logging.getLogger(__name__)
-
         article = MarcArticle(self.record)
 
         if self.validate:
+            jdict = article.jdict
+
             try:
-                jsonschema.validate(instance=article.jdict, schema=JSON_SCHEMA)
+                with stats.timer("validate"):
+                    JSON_VALIDATOR.validate(jdict)
                 self.articles.append(article)
             except jsonschema.ValidationError as Exc:
-                logger.info(Exc, exc_info=False)
+                stats.invalid(logger, Exc)
                 self.validation_failed = True
         else:
             self.articles.append(article)
+
+    def release(self) -> None:
+        """Drop the record, the articles must have been materialized"""
+        self.record = None
@@ -14,7 +14,7 @@ from zope.interface import implementer
 from vzg.jconv.interfaces import IArticle
 from vzg.jconv.interfaces import IConverter
 from vzg.jconv.gapi import NAMESPACES
-from vzg.jconv.gapi import JSON_SCHEMA
+from vzg.jconv.gapi import JSON_VALIDATOR
 from vzg.jconv.gapi import JATS_SPRINGER_PUBTYPE
 from vzg.jconv.gapi import JATS_XPATHS
 from vzg.jconv.gapi import PUBTYPE_SOURCES
@@ -25,11 +25,34 @@ from vzg.jconv.errors import NoPublisherError
 from vzg.jconv.utils import node2text
 from vzg.jconv.utils import get_pubtype_suffix
 from vzg.jconv.utils.date import JatsDate
+from vzg.jconv import stats
 from lxml import etree
+import copy
+import functools
 import logging
 import json
 import jsonschema
 
+logger = logging.getLogger(__name__)
+
+
+def shared_property(method):
+    """Property, which does not depend on the publication type
+
+    The value is extracted once and shared by the articles of a document.
+    Each access returns a copy.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self):
+        if name not in self.shared:
+            self.shared[name] = method(self)
+
+        return copy.deepcopy(self.shared[name])
+
+    return property(wrapper)
+
 
 @implementer(IArticle)
 class JatsArticle:
@@ -46,6 +69,10 @@ class JatsArticle:
     publisher : string
         Set or override the publisher entry
 
+    shared : dict
+        Values of the document, which do not depend on the publication type.
+        Articles of the same document can share them.
+
     Returns
     -------
     None
@@ -58,20 +85,20 @@ class JatsArticle:
         iso639=None,
         publisher=None,
         pubtype_source=PUBTYPE_SOURCES.basic,
+        shared: dict = None,
     ):
         self.dom = dom
+        self.shared = {} if shared is None else shared
         self.iso639 = ISO_639() if isinstance(iso639, type(None)) else iso639
         self.pubtype = pubtype
         self.publisher = publisher
         self.pubtype_source = pubtype_source
         self._journal = JatsJournal(article=self)
 
-    @property
+    @shared_property
     def abstracts(self):
         """Article abstracts"""
 
-        logger = logging.getLogger(__name__)
-
         abstracts = []
         langkey = f"{{{NAMESPACES['xml']}}}lang"
 
@@ -82,6 +109,7 @@ class JatsArticle:
             try:
                 abstract["lang_code"] = self.iso639.i1toi2[node.attrib[langkey]]
             except (IndexError, KeyError):
+                stats.event("missing", "abstracts.lang_code")
                 logger.debug("abstracts: no lang_code")
 
             secnodes = node.xpath(JATS_XPATHS["abstracts-sec-node"])
@@ -112,11 +140,9 @@ class JatsArticle:
 
         return abstracts
 
-    @property
+    @shared_property
     def copyright(self):
         """Article copyright"""
-        logger = logging.getLogger(__name__)
-
         stms = ("article-copyright", "article-copyright-short")
         copyr = "no copyright information available"
 
@@ -128,6 +154,8 @@ class JatsArticle:
                 break
             except IndexError:
                 logger.debug("no copyright")
+        else:
+            stats.event("missing", "copyright")
 
         return copyr
 
@@ -153,16 +181,16 @@ class JatsArticle:
 
         return dateOfProduction
 
-    @property
+    @shared_property
     def lang_code(self):
         """Article lang_code"""
-        logger = logging.getLogger(__name__)
         attributes = self.xpath(JATS_XPATHS["primary_lang_code"])
         lcode = []
 
         try:
             lcode.append(self.iso639.i1toi2[attributes[0]])
         except (IndexError, KeyError):
+            stats.event("missing", "lang_code")
             logger.debug("no lang_code")
 
         return lcode
@@ -201,12 +229,14 @@ class JatsArticle:
     @property
     def json(self):
         """"""
-        return json.dumps(self.jdict)
+        jdict = self.jdict
 
-    @property
+        with stats.timer("serialize"):
+            return json.dumps(jdict)
+
+    @shared_property
     def other_ids(self):
         """Article other_ids"""
-        logger = logging.getLogger(__name__)
         expression = JATS_XPATHS["other_ids_doi"]
         node = self.xpath(expression)
 
@@ -214,22 +244,26 @@ class JatsArticle:
         try:
             pdict["id"] = node[0]
         except IndexError:
-            logger.debug(("no other_id (doi)", self.pubtype.value))
+            stats.event("missing", "other_ids.doi")
+            logger.debug("no other_id (doi) %s", self.pubtype.value)
 
         return [pdict]
 
-    @property
+    @shared_property
     def persons(self):
         """Article persons"""
-        from vzg.jconv.person import Person
+        from vzg.jconv.person import Person, affiliation_index
 
         persons = []
 
         expression = JATS_XPATHS["article-persons"]
         nodes = self.xpath(expression)
 
+        # One lookup table instead of a search of the document per person
+        affiliations = affiliation_index(self.dom) if len(nodes) > 0 else {}
+
         for elem in nodes:
-            person = Person(elem).as_dict()
+            person = Person(elem, affiliations=affiliations).as_dict()
 
             if person is None:
                 continue
@@ -245,8 +279,6 @@ class JatsArticle:
         The primary_id needs to be extracted from the DOI.
         The publisher-id is not reliable enough.
         """
-        logger = logging.getLogger(__name__)
-
         pdict = {"type": "unknown", "id": ""}
 
         publisher = self.publisher
@@ -262,6 +294,7 @@ class JatsArticle:
         try:
             pdict["type"] = getPublisherId(publisher)
         except NoPublisherError:
+            stats.event("missing", "publisher")
             logger.debug("no publisher", exc_info=True)
 
         expression = JATS_XPATHS["other_ids_doi"]
@@ -283,15 +316,14 @@ class JatsArticle:
             pdict["id"] = node[0]
             pdict["id"] += get_pubtype_suffix(self.pubtype.value)
         except IndexError:
+            stats.event("missing", "primary_id")
             logger.debug("no primary_id")
 
         return pdict
 
-    @property
+    @shared_property
     def subjects(self):
         """Article subject_terms"""
-        logger = logging.getLogger(__name__)
-
         subjects = []
 
         def form_():
@@ -360,16 +392,15 @@ class JatsArticle:
 
         return subjects
 
-    @property
+    @shared_property
     def title(self):
         """Article title"""
-        logger = logging.getLogger(__name__)
-
         expression = JATS_XPATHS["article-title"]
 
         try:
             node = self.xpath(expression)[0]
         except IndexError:
+            stats.event("missing", "title")
             logger.debug("no title")
             return ""
 
@@ -378,8 +409,6 @@ class JatsArticle:
     @property
     def urls(self):
         """Article URLs"""
-        logger = logging.getLogger(__name__)
-
         udict = {}
 
         expression = JATS_XPATHS["other_ids_doi"]
@@ -387,6 +416,7 @@ class JatsArticle:
         try:
             doi = self.xpath(expression)[0]
         except IndexError:
+            stats.event("missing", "urls.doi")
             logger.debug("no doi (url)")
             return []
 
@@ -485,8 +515,6 @@ class JatsConverter:
 
         Springer sets the date-type attribute to certain values
         """
-        logger = logging.getLogger(__name__)
-
         pubtypes = []
 
         # Springer
@@ -524,24 +552,40 @@ class JatsConverter:
 
     def run(self):
         """"""
-        logger = logging.getLogger(__name__)
-
         if self.dom.docinfo.root_name != "article":
             return None
 
-        for pubtype in self.pubtypes:
+        # Values of the document, shared by the articles of all publication types
+        shared = {}
+
+        with stats.timer("pubtype"):
+            pubtypes = self.pubtypes
+
+        for pubtype in pubtypes:
             article = JatsArticle(
-                self.dom, pubtype, self.iso639, self.publisher, self.pubtype_source
+                self.dom,
+                pubtype,
+                self.iso639,
+                self.publisher,
+                self.pubtype_source,
+                shared=shared,
             )
 
             if self.validate:
+                jdict = article.jdict
+
                 try:
-                    jsonschema.validate(instance=article.jdict, schema=JSON_SCHEMA)
+                    with stats.timer("validate"):
+                        JSON_VALIDATOR.validate(jdict)
                     self.articles.append(article)
                 except jsonschema.ValidationError as Exc:
-                    logger.info(Exc, exc_info=False)
+                    stats.invalid(logger, Exc)
                     self.validation_failed = True
 
                 continue
 
             self.articles.append(article)
+
+    def release(self) -> None:
+        """Drop the DOM, the articles must have been materialized"""
+        self.dom = None
@@ -13,13 +13,16 @@ import json
 import jsonschema
 import logging
 from zope.interface import implementer
-from vzg.jconv.gapi import JSON_SCHEMA
+from vzg.jconv.gapi import JSON_VALIDATOR
 from vzg.jconv.gapi import OAI_ARTICLES_TYPES
 from vzg.jconv.gapi import JATS_SPRINGER_JOURNALTYPE
 from vzg.jconv.interfaces import IArticle
 from vzg.jconv.interfaces import IConverter
 from vzg.jconv.journal import CairnJournal
 from vzg.jconv.langcode import ISO_639
+from vzg.jconv import stats
+
+logger = logging.getLogger(__name__)
 
 
 @implementer(IArticle)
@@ -27,6 +30,7 @@ class OAIArticle_Base:
     def __init__(self, header, record) -> None:
         self.header = header
         self.record = record
+        self.fields = record.fields
 
         self.iso639 = ISO_639()
 
@@ -34,13 +38,13 @@ class OAIArticle_Base:
     def abstracts(self) -> str:
         abstracts = []
 
-        if len(self.record.getField("description")) > 0:
-            for index, description in enumerate(self.record.getField("description")):
+        if len(self.fields["description"]) > 0:
+            for index, description in enumerate(self.fields["description"]):
                 try:
                     abstracts.append(
                         {
                             "lang_code": self.iso639.i1toi2[
-                                self.record.getField("description_language")[index]
+                                self.fields["description_language"][index]
                             ],
                             "text": description,
                         }
@@ -76,14 +80,17 @@ class OAIArticle_Base:
     @property
     def json(self) -> str:
         """"""
-        return json.dumps(self.jdict)
+        jdict = self.jdict
+
+        with stats.timer("serialize"):
+            return json.dumps(jdict)
 
     @property
     def lang_code(self) -> list:
         """Article lang_code"""
         lang_code = []
 
-        for language in self.record.getField("language"):
+        for language in self.fields["language"]:
             if language in self.iso639.i2toi1:
                 lang_code.append(language)
             else:
@@ -94,14 +101,12 @@ class OAIArticle_Base:
     @property
     def other_ids(self):
         """Article other_ids"""
-        logger = logging.getLogger(__name__)
-
         ids = []
 
         doi_marker = ("urn:doi:", "https://doi.org/")
         dois = []
 
-        for value in self.record.getField("identifier"):
+        for value in self.fields["identifier"]:
             for marker in doi_marker:
                 if value.startswith(marker):
                     dois.append(value.replace(marker, ""))
@@ -118,7 +123,7 @@ class OAIArticle_Base:
         """Article persons"""
         persons = []
 
-        for creator in self.record.getField("creator"):
+        for creator in self.fields["creator"]:
             try:
                 creatorParts = creator.split(",")
                 persons.append(
@@ -147,24 +152,26 @@ class OAIArticle_Base:
         """Article subject_terms"""
         subject_terms = []
 
-        for subject in self.record.getField("subject"):
-            try:
-                subjectTerm = {}
+        if len(self.fields["subject"]) == 0 or len(self.fields["language"]) == 0:
+            return subject_terms
+
+        # The language is the same for all subjects
+        lang = self.fields["language"][0]
 
-                lang = self.record.getField("language")[0]
+        if lang in self.iso639.i2toi1:
+            lang_code = lang
+        else:
+            lang_code = self.iso639.i1toi2[lang]
 
-                if lang in self.iso639.i2toi1:
-                    subjectTerm["lang_code"] = lang
-                else:
-                    subjectTerm["lang_code"] = self.iso639.i1toi2[lang]
+        for subject in self.fields["subject"]:
+            subjectTerm = {}
 
-                subjectTerm["scheme"] = "OpenEdition"
-                subjectTerm["terms"] = []
-                for subjectPart in subject.split(" / "):
-                    subjectTerm["terms"].append(subjectPart)
-                subject_terms.append(subjectTerm)
-            except IndexError:
-                pass
+            subjectTerm["lang_code"] = lang_code
+            subjectTerm["scheme"] = "OpenEdition"
+            subjectTerm["terms"] = []
+            for subjectPart in subject.split(" / "):
+                subjectTerm["terms"].append(subjectPart)
+            subject_terms.append(subjectTerm)
 
         return subject_terms
 
@@ -172,7 +179,7 @@ class OAIArticle_Base:
     def title(self) -> str:
         """Article title"""
         try:
-            return self.record.getField("title")[0]
+            return self.fields["title"][0]
         except IndexError:
             pass
 
@@ -184,11 +191,11 @@ class OAIArticle_Base:
         identifier = None
         oaccess = False
 
-        for value in self.record.getField("identifier"):
+        for value in self.fields["identifier"]:
             identifier = value
             break
 
-        for value in self.record.getField("rights"):
+        for value in self.fields["rights"]:
             if value == "info:eu-repo/semantics/openAccess":
                 oaccess = True
                 break
@@ -210,7 +217,7 @@ class OAIArticle_Cairn(OAIArticle_Base):
         copyright = ""
 
         try:
-            copyright = self.record.getField("rights")[0]
+            copyright = self.fields["rights"][0]
         except IndexError:
             pass
 
@@ -221,7 +228,7 @@ class OAIArticle_Cairn(OAIArticle_Base):
         date_of_production = ""
 
         try:
-            date_of_production = self.record.getField("date")[0]
+            date_of_production = self.fields["date"][0]
         except IndexError:
             pass
 
@@ -247,15 +254,15 @@ class OAIArticle_Cairn(OAIArticle_Base):
 
     @property
     def journal(self) -> dict:
-        logger = logging.getLogger(__name__)
-
         journal = {}
 
         try:
             cairn_journal = CairnJournal(self.record)
             journal = cairn_journal.as_dict()
         except TypeError:
-            logger.error("No journal data", exc_info=True)
+            stats.problem(
+                logger, "No journal data", key="journal", example=self.header.identifier
+            )
 
         return journal
 
@@ -264,7 +271,7 @@ class OAIArticle_Cairn(OAIArticle_Base):
         """Article lang_code"""
         lang_code = []
 
-        for language in self.record.getField("language"):
+        for language in self.fields["language"]:
             lang_code.append(language)
 
         return lang_code
@@ -275,11 +282,11 @@ class OAIArticle_Cairn(OAIArticle_Base):
         identifier = None
         access_info = None
 
-        for value in self.record.getField("identifier"):
+        for value in self.fields["identifier"]:
             identifier = value
             break
 
-        for value in self.record.getField("access_rights"):
+        for value in self.fields["access_rights"]:
             if value == "free access":
                 access_info = "LF"
                 break
@@ -303,15 +310,15 @@ class OAIArticle_Openedition(OAIArticle_Base):
         """Article journal"""
         journal = {}
 
-        journal["title"] = self.record.getField("publisher")[0]
+        journal["title"] = self.fields["publisher"][0]
 
-        recordDateParts = self.record.getField("date")[0].split("-")
+        recordDateParts = self.fields["date"][0].split("-")
         journal["year"] = recordDateParts[0]
 
         # Identifier
         issn = []
 
-        for relation in self.record.getField("relation"):
+        for relation in self.fields["relation"]:
             if relation.startswith("info:eu-repo/semantics/reference/issn/"):
                 issn.append(
                     relation.replace("info:eu-repo/semantics/reference/issn/", "")
@@ -327,6 +334,44 @@ class OAIArticle_Openedition(OAIArticle_Base):
         return journal
 
 
+@implementer(IArticle)
+class OAITombstone:
+    """Lightweight entry of a deleted record"""
+
+    def __init__(self, header) -> None:
+        self.header = header
+
+        self.journal = {}
+        self.lang_code = []
+        self.title = ""
+
+    @property
+    def jdict(self) -> dict:
+        """"""
+        jdict = {
+            "deleted": True,
+            "datestamp": self.header.datestamp.isoformat(),
+            "primary_id": self.primary_id,
+        }
+
+        return jdict
+
+    @property
+    def json(self) -> str:
+        """"""
+        jdict = self.jdict
+
+        with stats.timer("serialize"):
+            return json.dumps(jdict)
+
+    @property
+    def primary_id(self) -> dict:
+        """Article primary_id"""
+        pdict = {"type": "oai_id", "id": self.header.identifier}
+
+        return pdict
+
+
 @implementer(IConverter)
 class OAIDCConverter:
     """_summary_"""
@@ -337,9 +382,11 @@ class OAIDCConverter:
         record,
         article_type=OAI_ARTICLES_TYPES.unknown,
         validate: bool = False,
+        name: str = "",
     ) -> None:
         self.header = header
         self.record = record
+        self.name = name
         self.article_type = article_type
         self.validate = validate
         self.validation_failed = False
@@ -352,23 +399,32 @@ class OAIDCConverter:
         }
 
     def run(self) -> None:
-        logger = logging.getLogger(__name__)
-
         article_cls = self.__article_types__.get(self.article_type, None)
 
         if article_cls is None:
-            msg = "No valid article type found: {}".format(self.article_type)
-            logger.debug(msg)
+            logger.debug("No valid article type found: %s", self.article_type)
+            return None
+
+        if self.header.deleted:
+            self.articles.append(OAITombstone(self.header))
             return None
 
         article = article_cls(self.header, self.record)
 
         if self.validate:
+            jdict = article.jdict
+
             try:
-                jsonschema.validate(instance=article.jdict, schema=JSON_SCHEMA)
+                with stats.timer("validate"):
+                    JSON_VALIDATOR.validate(jdict)
                 self.articles.append(article)
             except jsonschema.ValidationError as Exc:
-                logger.info(Exc, exc_info=False)
+                stats.invalid(logger, Exc)
                 self.validation_failed = True
         else:
             self.articles.append(article)
+
+    def release(self) -> None:
+        """Drop the record, the articles must have been materialized"""
+        self.record = None
+        self.header.record = None
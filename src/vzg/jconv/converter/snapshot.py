@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Articles without their source document
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import functools
+import json
+from zope.interface import implementer
+from vzg.jconv.interfaces import IArticle
+from vzg.jconv.interfaces import IConverter
+
+
+@implementer(IArticle)
+class ArticleSnapshot:
+    """Article restored from its JSON representation
+
+    Parameters
+    ----------
+    data : str
+        The article as JSON string, as created by a converter
+    """
+
+    def __init__(self, data: str) -> None:
+        self.__json__ = data
+
+    @functools.cached_property
+    def jdict(self) -> dict:
+        return json.loads(self.__json__)
+
+    @property
+    def json(self) -> str:
+        return self.__json__
+
+    @property
+    def journal(self) -> dict:
+        return self.jdict.get("journal", {})
+
+    @property
+    def lang_code(self) -> list:
+        return self.jdict.get("lang_code", [])
+
+    @property
+    def primary_id(self) -> dict:
+        return self.jdict.get("primary_id", {})
+
+    @property
+    def title(self) -> str:
+        return self.jdict.get("title", "")
+
+
+@implementer(IConverter)
+class CachedConverter:
+    """Converter with the articles of a former conversion
+
+    Parameters
+    ----------
+    articles : list
+        The articles as JSON strings
+    name : str
+        Optional name of the source file
+    header : vzg.jconv.archives.oai.Header
+        Header of OAI records
+    """
+
+    def __init__(self, articles: list, name: str = "", header=None) -> None:
+        self.data = articles
+        self.name = name
+        self.header = header
+        self.validation_failed = False
+
+        self.articles = []
+
+    def run(self) -> None:
+        self.articles = [ArticleSnapshot(data) for data in self.data]
+
+    def release(self) -> None:
+        pass
+
+
+def materialize(converter: IConverter) -> IConverter:
+    """Replace the articles of a converter by snapshots and drop the document
+
+    Articles like `JatsArticle` extract their values from the document
+    on every access and keep it alive. The snapshots hold only the JSON,
+    so the memory of the document is released as soon as the converter
+    is not referenced any more.
+    """
+    converter.articles = [
+        (
+            article
+            if isinstance(article, ArticleSnapshot)
+            else ArticleSnapshot(article.json)
+        )
+        for article in converter.articles
+    ]
+    converter.release()
+
+    return converter
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""Duplicate suppression across deliveries
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import hashlib
+import io
+import json
+import logging
+import math
+import os
+import sqlite3
+import struct
+from enum import Enum
+from lxml import etree
+from pathlib import Path
+from zope.interface import implementer
+from vzg.jconv.converter.snapshot import ArticleSnapshot
+from vzg.jconv.gapi import JATS_SPRINGER_PUBTYPE
+from vzg.jconv.interfaces import IConverter
+
+BLOOM_MAGIC = b"VZGBLOM2"
+BLOOM_HEADER = struct.Struct(">8sQBQ")
+
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pending (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class DEDUP_POLICIES(Enum):
+    """What happens with documents, which have already been converted"""
+
+    skip = "skip"
+    overwrite = "overwrite"
+    update = "update"
+
+
+class BloomFilter:
+    """Bloom filter of strings, stored in a file
+
+    Parameters
+    ----------
+    capacity : int
+        Expected number of keys
+    error_rate : float
+        False positive rate at the expected number of keys
+
+    The `generation` of the store is saved with the filter,
+    a filter of another generation is outdated.
+    """
+
+    def __init__(self, capacity: int = 1000000, error_rate: float = 0.001) -> None:
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+        self.generation = 0
+
+    def __positions__(self, key: str):
+        digest = hashlib.sha256(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self.__positions__(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self.__positions__(key)
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "BloomFilter":
+        """Read a filter written with `save`
+
+        Raises
+        ------
+        ValueError
+            If the file is no Bloom filter
+        """
+        with open(path, "rb") as fh:
+            header = fh.read(BLOOM_HEADER.size)
+
+            if len(header) < BLOOM_HEADER.size:
+                raise ValueError(f"{path} is no Bloom filter")
+
+            magic, size, hashes, generation = BLOOM_HEADER.unpack(header)
+
+            if magic != BLOOM_MAGIC:
+                raise ValueError(f"{path} is no Bloom filter")
+
+            bloom = cls.__new__(cls)
+            bloom.size = size
+            bloom.hashes = hashes
+            bloom.generation = generation
+            bloom.bits = bytearray(fh.read())
+
+        return bloom
+
+    def save(self, path: Path) -> None:
+        """Write the filter atomically"""
+        tmppath = Path(f"{path}.tmp")
+
+        with open(tmppath, "wb") as fh:
+            fh.write(
+                BLOOM_HEADER.pack(BLOOM_MAGIC, self.size, self.hashes, self.generation)
+            )
+            fh.write(self.bits)
+
+        os.replace(tmppath, path)
+
+
+class Deduplicator:
+    """Keys of the documents converted in former runs
+
+    A Bloom filter in `<path>.bloom` answers most lookups of new keys
+    without touching the exact store, a SQLite database in `path`.
+    The filter is saved with every flush. If it is missing or belongs
+    to another generation of the store, e.g. after a crash, it is
+    rebuilt from the store.
+
+    The keys of a run are pending until `flush` is called after the
+    outputs of their documents have been committed. Pending keys of
+    an interrupted run are dropped, so its documents are converted
+    again instead of being skipped.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the SQLite database
+    policy : DEDUP_POLICIES
+        What happens with duplicates
+    capacity : int
+        Expected number of keys of the Bloom filter
+    batch_size : int
+        Number of pending keys kept in memory
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        policy: DEDUP_POLICIES = DEDUP_POLICIES.skip,
+        capacity: int = 1000000,
+        batch_size: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.bloompath = self.path.with_name(f"{self.path.name}.bloom")
+        self.policy = policy
+        self.batch_size = batch_size
+
+        self.pending = {}
+        self.duplicates = 0
+
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(DEDUP_SCHEMA)
+
+        # The outputs of an interrupted run have not been committed
+        with self.db:
+            self.db.execute("DELETE FROM pending")
+
+        self.bloom = self.__bloom__(capacity)
+
+    @property
+    def generation(self) -> int:
+        """Number of flushes of the store"""
+        return self.db.execute("PRAGMA user_version").fetchone()[0]
+
+    def __bloom__(self, capacity: int) -> BloomFilter:
+        """The saved Bloom filter, if it matches the store"""
+        logger = logging.getLogger(__name__)
+
+        generation = self.generation
+
+        if self.bloompath.is_file():
+            try:
+                bloom = BloomFilter.load(self.bloompath)
+            except ValueError:
+                bloom = None
+
+            if bloom is not None and bloom.generation == generation:
+                return bloom
+
+            msg = f"Bloom filter {self.bloompath} is outdated, rebuilding it"
+            logger.warning(msg)
+
+        bloom = BloomFilter(capacity)
+        bloom.generation = generation
+
+        for (key,) in self.db.execute("SELECT key FROM keys"):
+            bloom.add(key)
+
+        return bloom
+
+    def __known__(self, key: str) -> bool:
+        if key not in self.bloom:
+            return False
+
+        if key in self.pending:
+            return True
+
+        row = self.db.execute(
+            "SELECT 1 FROM keys WHERE key = ? UNION ALL "
+            "SELECT 1 FROM pending WHERE key = ?",
+            (key, key),
+        )
+        return row.fetchone() is not None
+
+    def duplicate(self, keys: list[str]) -> bool:
+        """Have all keys of a document been seen before?"""
+        if len(keys) == 0:
+            return False
+
+        if all(self.__known__(key) for key in keys):
+            self.duplicates += 1
+            return True
+
+        return False
+
+    def add(self, keys: list[str], source: str) -> None:
+        """Remember the keys of a converted document"""
+        for key in keys:
+            self.bloom.add(key)
+            self.pending[key] = source
+
+        if len(self.pending) >= self.batch_size:
+            self.__spill__()
+
+    def __spill__(self) -> None:
+        """Move the pending keys from memory into the database"""
+        if len(self.pending) > 0:
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO pending VALUES (?, ?)",
+                    self.pending.items(),
+                )
+
+            self.pending = {}
+
+    def flush(self) -> None:
+        """The outputs are committed, their keys become durable"""
+        self.__spill__()
+
+        generation = self.generation + 1
+
+        with self.db:
+            self.db.execute("INSERT OR REPLACE INTO keys SELECT * FROM pending")
+            self.db.execute("DELETE FROM pending")
+            self.db.execute(f"PRAGMA user_version = {generation}")
+
+        self.bloom.generation = generation
+        self.bloom.save(self.bloompath)
+
+    def close(self) -> None:
+        """Close the store, the keys not flushed are dropped"""
+        logger = logging.getLogger(__name__)
+
+        self.db.close()
+
+        msg = f"Dedup {self.path}: {self.duplicates} duplicate(s), {self.policy.value}"
+        logger.info(msg)
+
+
+def jats_keys(data: bytes) -> list[str]:
+    """DOI and publication type of the articles of a JATS document
+
+    Only the article-meta is parsed. The publication types are
+    guessed like in `vzg.jconv.converter.jats.JatsConverter.pubtypes`.
+    """
+    doi = None
+    pubdates = []
+
+    try:
+        context = etree.iterparse(
+            io.BytesIO(data),
+            events=("end",),
+            tag=("article-id", "pub-date", "article-meta"),
+        )
+
+        for event, elem in context:
+            if elem.tag == "article-meta":
+                break
+
+            parent = elem.getparent()
+            if parent is None or parent.tag != "article-meta":
+                continue
+
+            if elem.tag == "pub-date":
+                pubdates.append(dict(elem.attrib))
+            elif doi is None and elem.get("pub-id-type") == "doi" and elem.text:
+                doi = elem.text.strip().lower()
+    except etree.Error:
+        return []
+
+    if doi is None:
+        return []
+
+    # Springer, deGruyter or basic
+    if any(attrs.get("date-type") == "pub" for attrs in pubdates):
+        values = {attrs.get("publication-format") for attrs in pubdates}
+        pubtypes = [entry for entry in JATS_SPRINGER_PUBTYPE if entry.name in values]
+    elif any("pub-type" in attrs for attrs in pubdates):
+        values = {attrs.get("pub-type") for attrs in pubdates}
+        pubtypes = [entry for entry in JATS_SPRINGER_PUBTYPE if entry.value in values]
+    else:
+        values = {attrs.get("date-type") for attrs in pubdates}
+        pubtypes = [entry for entry in JATS_SPRINGER_PUBTYPE if entry.value in values]
+
+    return [f"{doi}#{entry.value}" for entry in pubtypes]
+
+
+@implementer(IConverter)
+class UpdateConverter:
+    """The articles of a converter, marked as updates of former articles"""
+
+    def __init__(self, converter: IConverter) -> None:
+        self.converter = converter
+        self.articles = []
+
+    @property
+    def name(self) -> str:
+        return getattr(self.converter, "name", "")
+
+    @property
+    def validation_failed(self) -> bool:
+        return self.converter.validation_failed
+
+    def run(self) -> None:
+        self.converter.run()
+
+        self.articles = []
+        for article in self.converter.articles:
+            jdict = json.loads(article.json)
+            jdict["update"] = True
+            self.articles.append(ArticleSnapshot(json.dumps(jdict)))
+
+    def release(self) -> None:
+        self.converter.release()
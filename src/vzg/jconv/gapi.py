@@ -11,6 +11,7 @@
 from enum import Enum, auto
 from pathlib import Path
 import json
+import jsonschema
 
 
 __schema_path__ = Path(__file__).parent.absolute() / "schema" / "article_schema.json"
@@ -28,6 +29,9 @@ NAMESPACES = {
 with open(__schema_path__, "rt") as fh:
     JSON_SCHEMA = json.load(fh)
 
+# The schema is checked once, not for every validated article
+JSON_VALIDATOR = jsonschema.validators.validator_for(JSON_SCHEMA)(JSON_SCHEMA)
+
 
 class OAI_ARTICLES_TYPES(Enum):
     cairn = auto()
@@ -134,30 +138,54 @@ JATS_XPATHS["subjects-lang_code"] = "//article-meta/kwd-group/@xml:lang"
 JATS_XPATHS["subjects"] = "//article-meta/kwd-group"
 
 OAI_DC_RECORD_XPATHS = {
-    "title": ("textList", "//oai_dc:dc/dc:title/text()"),
-    "creator": ("textList", "//oai_dc:dc/dc:creator/text()"),
-    "subject": ("textList", "//oai_dc:dc/dc:subject/text()"),
-    "description": ("textList", "//oai_dc:dc/dc:description/text()"),
-    "description_language": ("textList", "//oai_dc:dc/dc:description/@xml:lang"),
-    "publisher": ("textList", "//oai_dc:dc/dc:publisher/text()"),
-    "contributor": ("textList", "//oai_dc:dc/dc:contributor/text()"),
-    "date": ("textList", "//oai_dc:dc/dc:date/text()"),
-    "type": ("textList", "//oai_dc:dc/dc:type/text()"),
-    "format": ("textList", "//oai_dc:dc/dc:format/text()"),
-    "identifier": ("textList", "//oai_dc:dc/dc:identifier/text()"),
-    "source": ("textList", "//oai_dc:dc/dc:source/text()"),
-    "language": ("textList", "//oai_dc:dc/dc:language/text()"),
-    "relation": ("textList", "//oai_dc:dc/dc:relation/text()"),
-    "coverage": ("textList", "//oai_dc:dc/dc:coverage/text()"),
-    "rights": ("textList", "//oai_dc:dc/dc:rights/text()"),
-    "access_rights": ("textList", "//oai_dc:dc/dcterms:accessRights/text()"),
+    "title": ("textList", ".//oai_dc:dc/dc:title/text()"),
+    "creator": ("textList", ".//oai_dc:dc/dc:creator/text()"),
+    "subject": ("textList", ".//oai_dc:dc/dc:subject/text()"),
+    "description": ("textList", ".//oai_dc:dc/dc:description/text()"),
+    "description_language": ("textList", ".//oai_dc:dc/dc:description/@xml:lang"),
+    "publisher": ("textList", ".//oai_dc:dc/dc:publisher/text()"),
+    "contributor": ("textList", ".//oai_dc:dc/dc:contributor/text()"),
+    "date": ("textList", ".//oai_dc:dc/dc:date/text()"),
+    "type": ("textList", ".//oai_dc:dc/dc:type/text()"),
+    "format": ("textList", ".//oai_dc:dc/dc:format/text()"),
+    "identifier": ("textList", ".//oai_dc:dc/dc:identifier/text()"),
+    "source": ("textList", ".//oai_dc:dc/dc:source/text()"),
+    "language": ("textList", ".//oai_dc:dc/dc:language/text()"),
+    "relation": ("textList", ".//oai_dc:dc/dc:relation/text()"),
+    "coverage": ("textList", ".//oai_dc:dc/dc:coverage/text()"),
+    "rights": ("textList", ".//oai_dc:dc/dc:rights/text()"),
+    "access_rights": ("textList", ".//oai_dc:dc/dcterms:accessRights/text()"),
+}
+
+OAI_DC_TAG = f"{{{NAMESPACES['oai_dc']}}}dc"
+
+OAI_DC_RECORD_TAGS = {
+    f"{{{NAMESPACES['dc']}}}{name}": name
+    for name in (
+        "title",
+        "creator",
+        "subject",
+        "description",
+        "publisher",
+        "contributor",
+        "date",
+        "type",
+        "format",
+        "identifier",
+        "source",
+        "language",
+        "relation",
+        "coverage",
+        "rights",
+    )
 }
+OAI_DC_RECORD_TAGS[f"{{{NAMESPACES['dcterms']}}}accessRights"] = "access_rights"
 
 OAI_DC_HEADER_XPATHS = {
-    "identifier": "//oai:header/oai:identifier[1]/text()",
-    "datestamp": "//oai:header/oai:datestamp/text()",
-    "setspec": "//oai:header/oai:setSpec/text()",
-    "deleted": "//oai:record/@status = 'deleted'",
+    "identifier": ".//oai:header/oai:identifier[1]/text()",
+    "datestamp": ".//oai:header/oai:datestamp/text()",
+    "setspec": ".//oai:header/oai:setSpec/text()",
+    "deleted": "descendant-or-self::oai:header/@status = 'deleted'",
 }
 
 CAIRN_REGEX = {
@@ -165,3 +193,5 @@ CAIRN_REGEX = {
     "publish_date": r"^(?P<year>.\d*)-(?P<month>.\d*)-(?P<day>.\d*)$",
     "pages": r"^p\.\s*(?P<start>.\d*)-(?P<end>.\d*)$",
 }
+
+MARC_BINARY_SUFFIXES = (".mrc", ".marc", ".iso2709")
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""Index of converted articles
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    delivery TEXT NOT NULL,
+    location TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    PRIMARY KEY (id, type, delivery, location)
+) WITHOUT ROWID;
+"""
+
+
+def article_ids(jdict: dict) -> list[tuple[str, str]]:
+    """The DOIs and the primary id of an article as (id, type)
+
+    DOIs are case insensitive and stored in lower case.
+    """
+    ids = []
+
+    for other_id in jdict.get("other_ids", []):
+        if other_id.get("type") == "doi" and other_id.get("id", "") != "":
+            ids.append((other_id["id"].lower(), "doi"))
+
+    primary_id = jdict.get("primary_id", {})
+    if primary_id.get("id", "") != "":
+        ids.append((primary_id["id"], primary_id.get("type", "")))
+
+    return ids
+
+
+class ArticleIndex:
+    """SQLite index of DOIs and primary ids
+
+    Maps the identifiers of the converted articles to the delivery
+    signature, the output location and a hash of the article.
+    The rows are inserted in batches of `batch_size`.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the SQLite database
+    batch_size : int
+        Number of articles per insert
+    """
+
+    def __init__(self, path: Path, batch_size: int = 1000) -> None:
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.rows = []
+        self.num_articles = 0
+
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(INDEX_SCHEMA)
+
+    def add(self, data: str, delivery: str, location: str) -> None:
+        """Add an article given as JSON string"""
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+        for aid, atype in article_ids(json.loads(data)):
+            self.rows.append((aid, atype, str(delivery), location, digest))
+
+        self.num_articles += 1
+
+        if self.num_articles % self.batch_size == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert the pending rows"""
+        if len(self.rows) > 0:
+            with self.db:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)",
+                    self.rows,
+                )
+
+            self.rows = []
+
+    def lookup(self, identifier: str) -> list[dict]:
+        """Where has an article with this DOI or primary id been written?"""
+        self.flush()
+
+        rows = self.db.execute(
+            "SELECT id, type, delivery, location, hash FROM articles "
+            "WHERE id IN (?, ?) ORDER BY delivery, location",
+            (identifier, identifier.lower()),
+        )
+
+        return [
+            dict(zip(("id", "type", "delivery", "location", "hash"), row))
+            for row in rows
+        ]
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
@@ -27,6 +27,26 @@ class IArchive(Interface):
     converters = Attribute("List of IConverter objects")
 
 
+class ISink(Interface):
+    """Output of the converted articles"""
+
+    def write(name, data):
+        """Write an article as JSON string, returns its location"""
+
+    def flush():
+        """Make the written articles durable, returns the sizes of the output files"""
+
+    def close():
+        """Finish the output"""
+
+
+class ISource(Interface):
+    """Files of a delivery, e.g. a ZIP file or a directory"""
+
+    members = Attribute("Iterator of the files")
+    num_files = Attribute("Number of files, None if not known beforehand")
+
+
 class IConverter(Interface):
     """Converter"""
 
@@ -36,6 +56,9 @@ class IConverter(Interface):
     def run(self):
         """Start the conversion"""
 
+    def release(self):
+        """Drop the source document after the conversion, the articles stay"""
+
 
 class IJournal(Interface):
     """Journal"""
@@ -9,8 +9,12 @@
 ##############################################################################
 """
 
+import functools
+import hashlib
 import logging
 import re
+from collections import OrderedDict
+from dataclasses import dataclass
 from zope.interface import implementer
 from vzg.jconv.interfaces import IJournal
 from vzg.jconv.gapi import NAMESPACES
@@ -21,17 +25,133 @@ from vzg.jconv.gapi import JATS_XPATHS
 from vzg.jconv.gapi import CAIRN_REGEX
 from vzg.jconv.utils.date import JatsDate
 from vzg.jconv.utils import get_pubtype_suffix
+from vzg.jconv import stats
 from lxml import etree
 from urllib.parse import urlparse
 
+logger = logging.getLogger(__name__)
+
+CAIRN_PATTERNS = {key: re.compile(pattern) for key, pattern in CAIRN_REGEX.items()}
+
+# Longer Cairn sources are not cached, the cache would keep them alive
+MAX_CACHED_SOURCE = 1024
+
+
+@dataclass(frozen=True)
+class JournalMeta:
+    """Values of a journal-meta, shared by the articles of a journal"""
+
+    ids: tuple
+    title: str
+    publisher: tuple
+
+
+class JournalMetaCache:
+    """Least recently used journal-meta values
+
+    The key is a hash of the canonical journal-meta, the publication
+    type and the source of the publication types.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> JournalMeta | None:
+        meta = self.entries.get(key)
+
+        if meta is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+
+        return meta
+
+    def put(self, key: tuple, meta: JournalMeta) -> None:
+        self.entries[key] = meta
+
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+JOURNAL_META_CACHE = JournalMetaCache()
+
 
 @implementer(IJournal)
 class JatsJournal:
-    def __init__(self, article: etree._ElementTree) -> None:
-        self.article = article
+    """Journal of a JATS article
+
+    Journal ids, title and publisher depend only on the journal-meta
+    and are taken from `JOURNAL_META_CACHE` for repeated journals.
+    Volume, issue, pages and dates are extracted for each article.
+    """
+
+    def __init__(self, article) -> None:
+        # Only the values of the article, the journal must not keep it alive
+        self.dom = article.dom
+        self.pubtype = article.pubtype
+        self.pubtype_source = article.pubtype_source
+        self.__meta__ = None
+
+    @property
+    def fingerprint(self) -> bytes | None:
+        """Hash of the canonical journal-meta"""
+        nodes = self.xpath("//journal-meta")
+
+        if len(nodes) == 0:
+            return None
+
+        return hashlib.sha1(etree.tostring(nodes[0], method="c14n")).digest()
+
+    @property
+    def meta(self) -> JournalMeta:
+        if self.__meta__ is not None:
+            return self.__meta__
+
+        fingerprint = self.fingerprint
+        key = (fingerprint, self.pubtype, self.pubtype_source)
+
+        meta = None if fingerprint is None else JOURNAL_META_CACHE.get(key)
+
+        if meta is None:
+            meta = JournalMeta(
+                ids=tuple(tuple(jid.items()) for jid in self.__ids__()),
+                title=self.__title__(),
+                publisher=tuple(self.__publisher__().items()),
+            )
+
+            if fingerprint is not None:
+                JOURNAL_META_CACHE.put(key, meta)
+
+        self.__meta__ = meta
+        self.__events__(meta)
+
+        return meta
+
+    @staticmethod
+    def __events__(meta: JournalMeta) -> None:
+        """Count the missing values, cached values are counted too"""
+        publisher = dict(meta.publisher)
+
+        if "name" not in publisher:
+            stats.event("missing", "journal.publisher.name")
+
+        if "place" not in publisher:
+            stats.event("missing", "journal.publisher.place")
+
+        if meta.title == "":
+            stats.event("missing", "journal.title")
 
     def as_dict(self) -> dict:
-        logger = logging.getLogger(__name__)
         journal = {"title": self.title, "year": "", "journal_ids": self.ids}
         jdate = self.date
 
@@ -59,19 +179,23 @@ class JatsJournal:
             try:
                 journal[attr] = node[0]
             except IndexError:
-                logger.debug(f"no journal {attr}")
+                stats.event("missing", f"journal.{attr}")
+                logger.debug("no journal %s", attr)
 
         return journal
 
-    @property
+    @functools.cached_property
     def date(self) -> JatsDate:
-        """Look for the earliest date"""
+        """Look for the earliest date
+
+        The article asks for the date several times, it is searched once.
+        """
         date_node = None
 
         for pubtype in JATS_SPRINGER_PUBTYPE:
-            if self.article.pubtype_source == PUBTYPE_SOURCES.springer:
+            if self.pubtype_source == PUBTYPE_SOURCES.springer:
                 expression = JATS_XPATHS["pub-date-format"].format(pubtype=pubtype.name)
-            elif self.article.pubtype_source == PUBTYPE_SOURCES.degruyter:
+            elif self.pubtype_source == PUBTYPE_SOURCES.degruyter:
                 expression = JATS_XPATHS["pub-date-pubtype-val"].format(
                     pubtype=pubtype.value
                 )
@@ -97,15 +221,15 @@ class JatsJournal:
             "emerald": [JATS_XPATHS["journal-id"].format(journaltype="publisher")],
             "basic": [JATS_XPATHS["journal-id"].format(journaltype="publisher-id")],
             "doi": [JATS_XPATHS["journal-id"].format(journaltype="doi")],
-            self.article.pubtype.value: [
-                JATS_XPATHS["journal-issn"].format(pubtype=self.article.pubtype.value),
+            self.pubtype.value: [
+                JATS_XPATHS["journal-issn"].format(pubtype=self.pubtype.value),
                 JATS_XPATHS["journal-issn-pformat"].format(
-                    pubtype=self.article.pubtype.name
+                    pubtype=self.pubtype.name
                 ),
             ],
         }
 
-        if self.article.pubtype_source == PUBTYPE_SOURCES.degruyter:
+        if self.pubtype_source == PUBTYPE_SOURCES.degruyter:
             if JATS_SPRINGER_PUBTYPE.electronic.value in jids:
                 jids[JATS_SPRINGER_PUBTYPE.electronic.value].append(
                     JATS_XPATHS["journal-issn"].format(
@@ -123,8 +247,9 @@ class JatsJournal:
 
     @property
     def ids(self) -> list:
-        logger = logging.getLogger(__name__)
+        return [dict(jid) for jid in self.meta.ids]
 
+    def __ids__(self) -> list:
         _ids = []
 
         for jtype, expressions in self.jids.items():
@@ -137,17 +262,16 @@ class JatsJournal:
                 node = self.xpath(expression)
 
                 if len(node) == 0:
-                    msg = f"no {jtype} journal_id ({expression})"
-                    logger.debug(msg)
+                    logger.debug("no %s journal_id (%s)", jtype, expression)
                     continue
 
                 jid = {"type": jtype, "id": node[0]}
 
                 if jtype == "basic":
                     jid["type"] = "springer"
-                    if self.article.pubtype_source == PUBTYPE_SOURCES.degruyter:
+                    if self.pubtype_source == PUBTYPE_SOURCES.degruyter:
                         jid["type"] = "degruyter"
-                        jid["id"] += get_pubtype_suffix(self.article.pubtype.value)
+                        jid["id"] += get_pubtype_suffix(self.pubtype.value)
 
                 if jid["type"] in JATS_SPRINGER_JOURNALTYPE.__members__:
                     jid["type"] = JATS_SPRINGER_JOURNALTYPE[jid["type"]].value
@@ -160,8 +284,9 @@ class JatsJournal:
 
     @property
     def publisher(self) -> dict:
-        logger = logging.getLogger(__name__)
+        return dict(self.meta.publisher)
 
+    def __publisher__(self) -> dict:
         publisher = {}
 
         expression = JATS_XPATHS["publisher-name"]
@@ -187,8 +312,9 @@ class JatsJournal:
         Returns:
             str: title
         """
-        logger = logging.getLogger(__name__)
+        return self.meta.title
 
+    def __title__(self) -> str:
         title = ""
 
         for expression in (
@@ -200,12 +326,61 @@ class JatsJournal:
                 title = node[0].strip()
                 break
             except IndexError:
-                logger.debug(f"no journal title {expression}")
+                logger.debug("no journal title %s", expression)
 
         return title
 
     def xpath(self, expression):
-        return self.article.dom.xpath(expression, namespaces=NAMESPACES)
+        return self.dom.xpath(expression, namespaces=NAMESPACES)
+
+
+@dataclass(frozen=True)
+class CairnSource:
+    """Parsed Cairn source string"""
+
+    parts: tuple
+    issn: str | None = None
+    start_page: str | None = None
+    end_page: str | None = None
+    volume: str | None = None
+    pdate_day: str | None = None
+    pdate_month: str | None = None
+    pdate_year: str | None = None
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_cairn_source(source: str) -> CairnSource:
+    """Parse a Cairn source string
+
+    The issues of a journal share the same source strings,
+    so the results are cached.
+    """
+    source_parts = tuple(val.strip() for val in source.split("|"))
+
+    if len(source_parts) != 6:
+        msg = f"Unknown source: {source}"
+        raise TypeError(msg)
+
+    data = {"volume": source_parts[2]}
+    parts = source_parts[2:]
+
+    if match := CAIRN_PATTERNS["issn"].match(source_parts[-1]):
+        data["issn"] = match.group("issn")
+        parts = source_parts[2:-1]
+
+    for value in reversed(parts):
+        match = CAIRN_PATTERNS["pages"].match(value)
+        if "start_page" not in data and match:
+            data["start_page"] = match.group("start")
+            data["end_page"] = match.group("end")
+
+        match = CAIRN_PATTERNS["publish_date"].match(value)
+        if "pdate_day" not in data and match:
+            data["pdate_day"] = match.group("day")
+            data["pdate_month"] = match.group("month")
+            data["pdate_year"] = match.group("year")
+
+    return CairnSource(parts=source_parts, **data)
 
 
 @implementer(IJournal)
@@ -217,44 +392,26 @@ class CairnJournal:
             raise TypeError("Unknown source")
 
         self.source = self.record.getField("source")[0]
-        self.source_parts = [val.strip() for val in self.source.split("|")]
 
+        if len(self.source) > MAX_CACHED_SOURCE:
+            parsed = parse_cairn_source.__wrapped__(self.source)
+        else:
+            parsed = parse_cairn_source(self.source)
+
+        self.source_parts = parsed.parts
         self.source_type = len(self.source_parts)
-        if self.source_type != 6:
-            msg = f"Unknown source: {self.source}"
-            raise TypeError(msg)
 
         (self.issn, self.start_page, self.end_page, self.volume) = (
-            None,
-            None,
-            None,
-            None,
+            parsed.issn,
+            parsed.start_page,
+            parsed.end_page,
+            parsed.volume,
+        )
+        (self.pdate_day, self.pdate_month, self.pdate_year) = (
+            parsed.pdate_day,
+            parsed.pdate_month,
+            parsed.pdate_year,
         )
-        (self.pdate_day, self.pdate_month, self.pdate_year) = (None, None, None)
-
-        self.__parse_parts__()
-
-    def __parse_parts__(self) -> None:
-        parts = self.source_parts[2:]
-
-        if match := re.match(CAIRN_REGEX["issn"], self.source_parts[-1]):
-            self.issn = match.group("issn")
-            parts = self.source_parts[2:-1]
-
-        for value in reversed(parts):
-            match = re.match(CAIRN_REGEX["pages"], value)
-            if self.start_page is None and match:
-                self.start_page = match.group("start")
-                self.end_page = match.group("end")
-
-            match = re.match(CAIRN_REGEX["publish_date"], value)
-            if self.pdate_day is None and match:
-                self.pdate_day = match.group("day")
-                self.pdate_month = match.group("month")
-                self.pdate_year = match.group("year")
-
-        if self.source_type == 6:
-            self.volume = self.source_parts[2]
 
     def as_dict(self):
         """Dict representation"""
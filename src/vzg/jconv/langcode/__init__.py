@@ -9,6 +9,7 @@
 ##############################################################################
 """
 
+import functools
 import json
 from pathlib import Path
 
@@ -35,9 +36,17 @@ class ISO_639:
         cfld = Path(__file__).parent.absolute()
         self.cdatapath = cfld / "language-codes.json"
 
-        with open(self.cdatapath) as fh:
-            self.jdata = json.load(fh)
+        (self.jdata, self.i1toi2, self.i2toi1) = load_codes(self.cdatapath)
 
-        self.i1toi2 = {lentry["alpha2"]: lentry["alpha3-b"] for lentry in self.jdata}
 
-        self.i2toi1 = {lentry["alpha3-b"]: lentry["alpha2"] for lentry in self.jdata}
+@functools.cache
+def load_codes(cdatapath: Path) -> tuple[list, dict, dict]:
+    """Load the ISO data only once per process"""
+    with open(cdatapath) as fh:
+        jdata = json.load(fh)
+
+    i1toi2 = {lentry["alpha2"]: lentry["alpha3-b"] for lentry in jdata}
+
+    i2toi1 = {lentry["alpha3-b"]: lentry["alpha2"] for lentry in jdata}
+
+    return (jdata, i1toi2, i2toi1)
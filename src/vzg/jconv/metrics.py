@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""Metrics of a conversion run as textfile of the node exporter
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import os
+import time
+from pathlib import Path
+from vzg.jconv.stats import Stats
+
+# Upper bounds of the histograms of the stage times in seconds
+STAGE_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Publisher label of runs without a publisher option
+UNKNOWN_PUBLISHER = "unknown"
+
+# Counters of the stats as metrics
+METRIC_COUNTERS = {
+    "documents": ("jconv_documents_total", "Converted documents"),
+    "articles": ("jconv_articles_total", "Converted articles"),
+    "validation_failed": (
+        "jconv_validation_failures_total",
+        "Documents with articles failing the JSON Schema validation",
+    ),
+    "failed": ("jconv_failed_documents_total", "Documents which could not be read"),
+    "skipped": ("jconv_skipped_documents_total", "Documents which were skipped"),
+    "empty": ("jconv_empty_documents_total", "Documents without articles"),
+    "bytes_in": ("jconv_bytes_in_total", "Bytes of the read documents"),
+    "bytes": ("jconv_bytes_out_total", "Bytes of the written articles"),
+}
+
+
+def escape(value: str) -> str:
+    """Escape a label value"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def label_set(labels: dict) -> str:
+    if len(labels) == 0:
+        return ""
+
+    pairs = ",".join(f'{name}="{escape(value)}"' for name, value in labels.items())
+    return f"{{{pairs}}}"
+
+
+def number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(value)
+
+
+def render(runstats: Stats, labels: dict = None, started: float = None) -> str:
+    """The stats in the text format of Prometheus
+
+    Parameters
+    ----------
+    runstats : Stats
+        Stats of the run, histograms are written if it has buckets
+    labels : dict
+        Labels of every sample, like the subcommand and the publisher
+    started : float
+        Start of the run as Unix time
+    """
+    labels = {} if labels is None else labels
+    lines = []
+
+    def family(name: str, mtype: str, text: str) -> None:
+        lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {mtype}")
+
+    def sample(name: str, value, **extra) -> None:
+        lines.append(f"{name}{label_set(labels | extra)} {value}")
+
+    if started is not None:
+        family("jconv_start_time_seconds", "gauge", "Start of the run (Unix time)")
+        sample("jconv_start_time_seconds", number(started))
+
+    for key, (name, text) in METRIC_COUNTERS.items():
+        family(name, "counter", text)
+        sample(name, runstats.counters.get(key, 0))
+
+    family(
+        "jconv_conversion_errors_total",
+        "counter",
+        "Conversion problems by exception type",
+    )
+    for (kind, key), (num, examples) in sorted(runstats.events.items()):
+        if kind == "problem":
+            sample("jconv_conversion_errors_total", num, exception=key)
+
+    if runstats.histograms is None:
+        return "\n".join(lines) + "\n"
+
+    name = "jconv_stage_duration_seconds"
+    family(name, "histogram", "Time of a stage, without the nested stages")
+
+    for stage, counts in runstats.histograms.items():
+        cumulative = 0
+
+        for bound, num in zip(runstats.buckets + (float("inf"),), counts):
+            cumulative += num
+            sample(f"{name}_bucket", cumulative, stage=stage, le=number(bound))
+
+        sample(f"{name}_sum", number(runstats.seconds.get(stage, 0.0)), stage=stage)
+        sample(f"{name}_count", cumulative, stage=stage)
+
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: Path, text: str) -> None:
+    """Replace the file atomically, the exporter never reads a partial file"""
+    tmppath = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+    with open(tmppath, "w") as fh:
+        fh.write(text)
+
+    os.replace(tmppath, path)
+
+
+class MetricsExporter:
+    """Write the metrics of a run periodically to a textfile
+
+    The node exporter collects the files ending with .prom from
+    the directory of its textfile collector.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the textfile
+    runstats : Stats
+        Stats of the run
+    labels : dict
+        Labels of every sample
+    interval : float
+        Minimal seconds between two writes
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        runstats: Stats,
+        labels: dict = None,
+        interval: float = 15.0,
+    ) -> None:
+        if path.suffix != ".prom":
+            raise ValueError(f"{path.name} does not end with .prom")
+
+        self.path = path
+        self.stats = runstats
+        self.labels = {} if labels is None else labels
+        self.interval = interval
+        self.started = time.time()
+        self.next = time.perf_counter() + interval
+
+    def update(self, now: float) -> None:
+        """Write the metrics, if the interval has passed"""
+        if now >= self.next:
+            self.write()
+            self.next = now + self.interval
+
+    def write(self) -> None:
+        self.path.parent.mkdir(0o755, parents=True, exist_ok=True)
+        write_textfile(
+            self.path, render(self.stats, labels=self.labels, started=self.started)
+        )
+
+
+def create_exporter(options, runstats: Stats) -> MetricsExporter | None:
+    """The exporter selected by the options, None if disabled
+
+    Without a --publisher option the publisher label is "unknown",
+    so the runs of a command share their series.
+    """
+    if options.metrics is None:
+        return None
+
+    labels = {
+        "command": options.func.__name__,
+        "publisher": getattr(options, "publisher", "") or UNKNOWN_PUBLISHER,
+    }
+
+    return MetricsExporter(
+        Path(options.metrics).absolute(),
+        runstats,
+        labels=labels,
+        interval=options.metrics_interval,
+    )
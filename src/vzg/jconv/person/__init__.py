@@ -14,11 +14,26 @@ from lxml import etree
 from vzg.jconv.gapi import JATS_SPRINGER_AUTHORTYPE
 from vzg.jconv.gapi import PERSON_ID_TYPES
 from vzg.jconv.utils import flatten_line
+from vzg.jconv import stats
+
+logger = logging.getLogger(__name__)
 
 
 class Person:
-    def __init__(self, node: etree._Element) -> None:
+    """Person of a JATS contrib node
+
+    Parameters
+    ----------
+    node : etree._Element
+        contrib node
+    affiliations : dict
+        aff nodes of the document by id, see `affiliation_index`.
+        Without it every person searches the whole document.
+    """
+
+    def __init__(self, node: etree._Element, affiliations: dict = None) -> None:
         self.node = node
+        self.affiliations = affiliations
 
     @property
     def __name_node__(self) -> etree._Element | None:
@@ -82,8 +97,6 @@ class Person:
         Returns:
             str | None: _description_
         """
-        logger = logging.getLogger(__name__)
-
         role = None
 
         try:
@@ -101,8 +114,6 @@ class Person:
         Returns:
             dict | None: _description_
         """
-        logger = logging.getLogger(__name__)
-
         stm_int_org_name = """institution[@content-type="org-name"]/text()"""
         stm_inst_name = """institution/text()"""
 
@@ -120,13 +131,15 @@ class Person:
             logger.debug(msg)
             return None
 
-        aff_expression = """//article-meta/contrib-group/aff[@id="{rid}"]""".format(
-            rid=rid
-        )
+        if self.affiliations is not None:
+            affnode = self.affiliations.get(rid)
+        else:
+            aff_expression = (
+                """//article-meta/contrib-group/aff[@id="{rid}"]""".format(rid=rid)
+            )
+            affnode = next(iter(self.node.xpath(aff_expression)), None)
 
-        try:
-            affnode = self.node.xpath(aff_expression)[0]
-        except IndexError:
+        if affnode is None:
             msg = "no affiliation"
             logger.debug(msg)
             return None
@@ -196,8 +209,6 @@ class Person:
         Returns:
             dict: _description_
         """
-        logger = logging.getLogger(__name__)
-
         person = {
             "firstname": self.firstname,
             "lastname": self.lastname,
@@ -208,17 +219,30 @@ class Person:
 
         for key, value in person.items():
             if value is None:
-                msg = f"Missing {key} for person"
-                logger.debug(msg)
+                stats.event("missing", f"person.{key}")
+                logger.debug("Missing %s for person", key)
                 return None
 
-        if isinstance(self.role, str):
-            person["role"] = self.role
+        role = self.role
+        if isinstance(role, str):
+            person["role"] = role
 
-        if isinstance(self.affiliation, dict):
-            person["affiliation"] = self.affiliation
+        affiliation = self.affiliation
+        if isinstance(affiliation, dict):
+            person["affiliation"] = affiliation
 
-        if len(self.person_ids) > 0:
-            person["person_ids"] = self.person_ids
+        person_ids = self.person_ids
+        if len(person_ids) > 0:
+            person["person_ids"] = person_ids
 
         return person
+
+
+def affiliation_index(dom: etree._ElementTree) -> dict:
+    """The aff nodes of the contrib groups by id, the first one wins"""
+    affiliations = {}
+
+    for affnode in dom.xpath("//article-meta/contrib-group/aff[@id]"):
+        affiliations.setdefault(affnode.get("id"), affnode)
+
+    return affiliations
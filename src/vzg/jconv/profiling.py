@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""Profiling of conversion runs
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+PROFILE_FORMATS = ("pstats", "collapsed")
+
+# Deeper stacks are cut, recursion is not followed
+MAX_DEPTH = 64
+
+# Calls below a microsecond are left out of the collapsed stacks
+MIN_SECONDS = 1e-6
+
+
+def output_path(path: str | Path) -> Path:
+    """The path with {pid} replaced, every process gets its own file"""
+    return Path(str(path).replace("{pid}", str(os.getpid()))).absolute()
+
+
+def frame_name(func: tuple) -> str:
+    filename, lineno, name = func
+
+    if filename == "~":
+        # Built-in functions
+        return name
+
+    return f"{Path(filename).name}:{lineno}:{name}"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    """Stacks in the collapsed format of flame graphs, in microseconds
+
+    cProfile records the callers of a function, but not the complete
+    stacks. Below the first level, the time of a function is split
+    between its callers by their share of its cumulative time.
+    """
+    callees = defaultdict(list)
+    roots = []
+
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if len(callers) == 0:
+            roots.append((func, tt, ct))
+
+        for caller, (ecc, enc, ett, ect) in callers.items():
+            callees[caller].append((func, ett, ect))
+
+    stacks = defaultdict(int)
+
+    def walk(func, path: tuple, tt: float, ct: float, scale: float):
+        if ct * scale < MIN_SECONDS:
+            return None
+
+        path = path + (frame_name(func),)
+        micros = round(tt * scale * 1e6)
+
+        if micros > 0:
+            stacks[";".join(path)] += micros
+
+        if len(path) >= MAX_DEPTH:
+            return None
+
+        total = stats.stats[func][3]
+        if total <= 0:
+            return None
+
+        for callee, ett, ect in callees.get(func, []):
+            if frame_name(callee) in path:
+                continue
+
+            walk(callee, path, ett, ect, scale * ct / total)
+
+    for func, tt, ct in roots:
+        walk(func, (), tt, ct, 1.0)
+
+    return dict(stacks)
+
+
+class RunProfiler:
+    """cProfile and tracemalloc for the documents of a run
+
+    Parameters
+    ----------
+    profile : pathlib.Path
+        Output of cProfile, None disables it
+    profile_format : str
+        pstats (for pstats.Stats and snakeviz) or collapsed stacks
+        (for flamegraph.pl and speedscope)
+    every : int
+        Profile only every N-th document
+    tracemalloc_path : pathlib.Path
+        Text file with the top allocators, None disables it
+    tracemalloc_every : int
+        Take a snapshot after every N documents
+    tracemalloc_top : int
+        Number of the allocating lines of a snapshot
+    """
+
+    def __init__(
+        self,
+        profile: Path = None,
+        profile_format: str = "pstats",
+        every: int = 1,
+        tracemalloc_path: Path = None,
+        tracemalloc_every: int = 100,
+        tracemalloc_top: int = 20,
+    ) -> None:
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format {profile_format}")
+
+        if every < 1 or tracemalloc_every < 1:
+            raise ValueError("The intervals must be positive")
+
+        self.profile = profile
+        self.profile_format = profile_format
+        self.every = every
+        self.tracemalloc_path = tracemalloc_path
+        self.tracemalloc_every = tracemalloc_every
+        self.tracemalloc_top = tracemalloc_top
+
+        self.profiler = None if profile is None else cProfile.Profile()
+        self.enabled = False
+        self.documents = 0
+        self.__fh__ = None
+
+    def sampled(self, index: int) -> bool:
+        return index % self.every == 0
+
+    def start(self, index: int) -> None:
+        """Start before the document `index` is read"""
+        if self.tracemalloc_path is not None:
+            self.tracemalloc_path.parent.mkdir(0o755, parents=True, exist_ok=True)
+            self.__fh__ = open(self.tracemalloc_path, "w")
+            tracemalloc.start()
+
+        if self.profiler is not None and self.sampled(index):
+            self.profiler.enable()
+            self.enabled = True
+
+    def document(self, index: int) -> None:
+        """The document `index` is written, the next one follows"""
+        self.documents += 1
+
+        # The snapshots are not part of the profile
+        if self.enabled:
+            self.profiler.disable()
+            self.enabled = False
+
+        if self.__fh__ is not None and self.documents % self.tracemalloc_every == 0:
+            self.snapshot()
+
+        if self.profiler is not None and self.sampled(index + 1):
+            self.profiler.enable()
+            self.enabled = True
+
+    def snapshot(self) -> None:
+        """Write the top allocators to the tracemalloc file"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),)
+        )
+        current, peak = tracemalloc.get_traced_memory()
+
+        self.__fh__.write(
+            f"# {self.documents} documents, current {current / 1e6:.1f} MB, "
+            f"peak {peak / 1e6:.1f} MB\n"
+        )
+
+        for stat in snapshot.statistics("lineno")[: self.tracemalloc_top]:
+            self.__fh__.write(f"{stat}\n")
+
+        self.__fh__.write("\n")
+        self.__fh__.flush()
+
+    def close(self) -> None:
+        """Stop profiling and write the outputs"""
+        logger = logging.getLogger(__name__)
+
+        if self.profiler is not None:
+            if self.enabled:
+                self.profiler.disable()
+                self.enabled = False
+
+            self.profile.parent.mkdir(0o755, parents=True, exist_ok=True)
+
+            if self.profile_format == "pstats":
+                self.profiler.dump_stats(self.profile)
+            else:
+                stacks = collapsed_stacks(pstats.Stats(self.profiler))
+
+                with open(self.profile, "w") as fh:
+                    for stack, micros in sorted(stacks.items()):
+                        fh.write(f"{stack} {micros}\n")
+
+            msg = f"Profil {self.profile} gespeichert"
+            logger.info(msg)
+
+        if self.__fh__ is not None:
+            if self.documents % self.tracemalloc_every != 0:
+                self.snapshot()
+
+            tracemalloc.stop()
+            self.__fh__.close()
+            self.__fh__ = None
+
+
+def create_profiler(options) -> RunProfiler | None:
+    """The profiler selected by the options, None if profiling is disabled"""
+    if options.profile is None and options.tracemalloc is None:
+        return None
+
+    return RunProfiler(
+        profile=None if options.profile is None else output_path(options.profile),
+        profile_format=options.profile_format,
+        every=options.profile_every,
+        tracemalloc_path=(
+            None if options.tracemalloc is None else output_path(options.tracemalloc)
+        ),
+        tracemalloc_every=options.tracemalloc_every,
+        tracemalloc_top=options.tracemalloc_top,
+    )
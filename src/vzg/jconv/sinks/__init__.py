@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Output sinks for converted articles
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+
+class SinkBase:
+    """Context manager support for sinks"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def flush(self) -> dict:
+        return {}
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""One JSON file per article
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+from pathlib import Path
+from zope.interface import implementer
+from vzg.jconv.interfaces import ISink
+from vzg.jconv.sinks import SinkBase
+
+
+@implementer(ISink)
+class DirectorySink(SinkBase):
+    """Write each article into its own file of a directory"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+        if not self.path.exists():
+            self.path.mkdir(0o755, parents=True)
+
+    def write(self, name: str, data: str) -> str:
+        jpath = self.path / name
+
+        with jpath.open("w") as jfh:
+            jfh.write(data)
+
+        return jpath.as_posix()
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""Articles as JSON Lines
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+import sys
+from pathlib import Path
+from zope.interface import implementer
+from vzg.jconv.interfaces import ISink
+from vzg.jconv.sinks import SinkBase
+
+COMPRESSIONS = {
+    "gzip": (".gz", lambda fh: gzip.GzipFile(fileobj=fh, mode="wb")),
+    "bz2": (".bz2", lambda fh: bz2.BZ2File(fh, mode="wb")),
+    "lzma": (".xz", lambda fh: lzma.LZMAFile(fh, mode="wb")),
+}
+
+# Readers of the continued files, the streams may be concatenated
+DECOMPRESSIONS = {"gzip": gzip.open, "bz2": bz2.open, "lzma": lzma.open}
+
+CHUNK_SIZE = 1024 * 1024
+
+STDOUT = "-"
+
+
+@implementer(ISink)
+class JsonLinesSink(SinkBase):
+    """Write the articles as JSON Lines, one article per line
+
+    Parameters
+    ----------
+    path : pathlib.Path | str
+        Path of the output file, `-` writes to stdout
+    compression : str
+        None, gzip, bz2 or lzma
+    max_records : int
+        Start a new file after this number of articles, 0 means never
+    max_bytes : int
+        Start a new file after this number of uncompressed bytes, 0 means never
+
+    positions : dict
+        Sizes of the output files of a former run, which is continued.
+        The files are truncated to these sizes, other files are replaced.
+        The lines of the continued file are counted, so the locations
+        and the rotation continue where the former run stopped.
+
+    With rotation the files are numbered, e.g. `articles-00001.jsonl.gz`.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        compression: str = None,
+        max_records: int = 0,
+        max_bytes: int = 0,
+        positions: dict = None,
+    ) -> None:
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression}")
+
+        self.path = path if path == STDOUT else Path(path)
+        self.compression = compression
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+
+        self.paths = []
+        self.raw = None
+        self.fh = None
+        self.num_records = 0
+        self.num_bytes = 0
+        self.positions = {} if positions is None else positions
+        self.sizes = dict(self.positions)
+
+        # Continue with the last file of the former run
+        while self.rotate and self.__filename__() in self.positions:
+            self.paths.append(self.__filename__())
+
+        if len(self.paths) > 0:
+            self.paths.pop()
+
+        self.__open__()
+
+    @property
+    def rotate(self) -> bool:
+        return self.path != STDOUT and (self.max_records > 0 or self.max_bytes > 0)
+
+    def __filename__(self) -> str:
+        """Name of the next file"""
+        if self.path == STDOUT:
+            return STDOUT
+
+        path = self.path
+        suffix = "" if self.compression is None else COMPRESSIONS[self.compression][0]
+
+        if self.rotate:
+            path = path.with_name(f"{path.stem}-{len(self.paths) + 1:05}{path.suffix}")
+
+        return path.with_name(path.name + suffix).as_posix()
+
+    def __count__(self, fname: str) -> tuple[int, int]:
+        """Number of lines and uncompressed bytes of a continued file"""
+        opener = DECOMPRESSIONS.get(self.compression, open)
+        num_records = 0
+        num_bytes = 0
+
+        with opener(fname, "rb") as fh:
+            while chunk := fh.read(CHUNK_SIZE):
+                num_records += chunk.count(b"\n")
+                num_bytes += len(chunk)
+
+        return num_records, num_bytes
+
+    def __open__(self) -> None:
+        fname = self.__filename__()
+        self.num_records = 0
+        self.num_bytes = 0
+
+        if fname == STDOUT:
+            raw = sys.stdout.buffer
+        elif fname in self.positions:
+            raw = open(fname, "r+b")
+            raw.truncate(self.positions[fname])
+            raw.seek(0, os.SEEK_END)
+
+            self.num_records, self.num_bytes = self.__count__(fname)
+        else:
+            raw = open(fname, "wb")
+
+        self.raw = raw
+        self.__compressor__()
+        self.paths.append(fname)
+
+    def __compressor__(self) -> None:
+        if self.compression is None:
+            self.fh = self.raw
+        else:
+            self.fh = COMPRESSIONS[self.compression][1](self.raw)
+
+    def __close__(self) -> None:
+        if self.fh is not self.raw:
+            self.fh.close()
+
+        if self.raw is sys.stdout.buffer:
+            self.raw.flush()
+        else:
+            self.sizes[self.paths[-1]] = self.raw.tell()
+            self.raw.close()
+
+    def write(self, name: str, data: str) -> str:
+        if self.rotate and self.num_records > 0:
+            if (self.max_records > 0 and self.num_records >= self.max_records) or (
+                self.max_bytes > 0 and self.num_bytes >= self.max_bytes
+            ):
+                self.__close__()
+                self.__open__()
+
+        line = data.encode("utf-8") + b"\n"
+        self.fh.write(line)
+
+        self.num_records += 1
+        self.num_bytes += len(line)
+
+        return f"{self.paths[-1]}#{self.num_records}"
+
+    def flush(self) -> dict:
+        """Finish the compressed stream, a new one is started for the next writes
+
+        All supported formats allow concatenated streams.
+        """
+        if self.fh is not self.raw:
+            self.fh.close()
+
+        self.raw.flush()
+
+        if self.raw is not sys.stdout.buffer:
+            os.fsync(self.raw.fileno())
+            self.sizes[self.paths[-1]] = self.raw.tell()
+
+        if self.fh is not self.raw:
+            self.__compressor__()
+
+        return dict(self.sizes)
+
+    def close(self) -> None:
+        if self.fh is not None:
+            self.__close__()
+            self.fh = None
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""Articles split into shards
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+import os
+import re
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+from zope.interface import implementer
+from vzg.jconv.gapi import JATS_SPRINGER_JOURNALTYPE
+from vzg.jconv.interfaces import ISink
+from vzg.jconv.sinks import SinkBase
+
+MANIFEST_NAME = "manifest.json"
+
+UNKNOWN_KEY = "unknown"
+
+# Open sinks of the partitions, each may hold a thread and buffers
+MAX_OPEN_SHARDS = 32
+
+# Journal id types of the ISSNs, the preferred first
+ISSN_TYPES = (
+    JATS_SPRINGER_JOURNALTYPE.ppub.value,
+    JATS_SPRINGER_JOURNALTYPE.epub.value,
+)
+
+
+def publisher_key(article: dict) -> str:
+    """Partition by the type of the primary id"""
+    return article.get("primary_id", {}).get("type", UNKNOWN_KEY)
+
+
+def issn_key(article: dict) -> str:
+    """Partition by the ISSN of the journal
+
+    The print ISSN is preferred, so the electronic and print articles
+    of a journal with both ISSNs are in the same partition.
+    """
+    issns = {}
+
+    for jid in article.get("journal", {}).get("journal_ids", []):
+        jtype = jid.get("type", "")
+
+        if jtype in ISSN_TYPES and jid.get("id"):
+            issns.setdefault(jtype, jid["id"].strip().upper())
+
+    for jtype in ISSN_TYPES:
+        if jtype in issns:
+            return issns[jtype]
+
+    return UNKNOWN_KEY
+
+
+SHARD_KEYS = {"publisher": publisher_key, "issn": issn_key}
+
+
+class Shard:
+    """A single shard and its counters
+
+    While the shard is closed, `sink` is None and `positions` holds
+    the sizes of its files to continue them.
+    """
+
+    def __init__(self, name: str, key: str, path: Path, sink: ISink) -> None:
+        self.name = name
+        self.key = key
+        self.path = path
+        self.sink = sink
+        self.records = 0
+        self.bytes = 0
+        self.paths = []
+        self.positions = {}
+
+    def __paths__(self) -> list:
+        """The files written by the sink, rotated JSON Lines have several"""
+        if self.sink is None:
+            return self.paths
+
+        return list(getattr(self.sink, "paths", [Path(self.sink.path).as_posix()]))
+
+    def close(self) -> None:
+        self.paths = self.__paths__()
+        self.sink.close()
+        self.sink = None
+
+        self.positions = {
+            fname: Path(fname).stat().st_size
+            for fname in self.paths
+            if Path(fname).is_file()
+        }
+
+    @property
+    def manifest(self) -> dict:
+        paths = [Path(fname).name for fname in self.__paths__()]
+
+        return {
+            "name": self.name,
+            "path": paths[0],
+            "paths": paths,
+            "key": self.key,
+            "records": self.records,
+            "bytes": self.bytes,
+        }
+
+
+@implementer(ISink)
+class ShardedSink(SinkBase):
+    """Split the articles into shards of similar size or by a key
+
+    Each shard is written by its own sink, created by the factory
+    from the name of the shard. With a key function the articles are
+    partitioned by the key, the size limits apply to each partition.
+
+    At most `max_open` sinks are open at once, the least recently
+    written shard is closed and continued with the positions of its
+    files when it gets the next article. Each ZIP sink has a writer
+    thread and each compressed JSON Lines sink its buffers.
+
+    When closed, `manifest.json` is written into the output directory,
+    listing the shards with their files, number of records and bytes.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Output directory
+    factory : callable
+        Creates the sink of a shard, gets the path without suffix.
+        A closed shard is continued with the `positions` keyword.
+    max_records : int
+        Start a new shard after this number of articles, 0 means never
+    max_bytes : int
+        Start a new shard after this number of bytes, 0 means never
+    key : callable
+        Gets the article as dict and returns the partition
+    max_open : int
+        Maximal number of open sinks
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        factory: Callable[[Path], ISink],
+        max_records: int = 0,
+        max_bytes: int = 0,
+        key: Callable[[dict], str] = None,
+        max_open: int = MAX_OPEN_SHARDS,
+    ) -> None:
+        self.path = Path(path)
+        self.factory = factory
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.key = key
+        self.max_open = max(max_open, 1)
+
+        self.shards = []
+        self.current = {}
+        self.open = OrderedDict()
+
+        self.path.mkdir(0o755, parents=True, exist_ok=True)
+
+    @staticmethod
+    def __safe__(key: str) -> str:
+        """Partition key usable as file name"""
+        return re.sub(r"[^\w.-]+", "_", key) or UNKNOWN_KEY
+
+    def __full__(self, shard: Shard) -> bool:
+        if self.max_records > 0 and shard.records >= self.max_records:
+            return True
+
+        return self.max_bytes > 0 and shard.bytes >= self.max_bytes
+
+    def __shard__(self, key: str) -> Shard:
+        shard = self.current.get(key)
+
+        if shard is None or self.__full__(shard):
+            if shard is not None and shard.sink is not None:
+                del self.open[id(shard)]
+                shard.close()
+
+            num = len([s for s in self.shards if s.key == key]) + 1
+            prefix = "shard" if key is None else self.__safe__(key)
+            name = f"{prefix}-{num:05}"
+            path = self.path / name
+
+            shard = Shard(name, key, path, self.factory(path))
+            self.shards.append(shard)
+            self.current[key] = shard
+        elif shard.sink is None:
+            shard.sink = self.factory(shard.path, positions=shard.positions)
+
+        # Least recently written shards are closed first
+        self.open[id(shard)] = shard
+        self.open.move_to_end(id(shard))
+
+        while len(self.open) > self.max_open:
+            self.open.popitem(last=False)[1].close()
+
+        return shard
+
+    def write(self, name: str, data: str) -> str:
+        key = None if self.key is None else self.key(json.loads(data))
+        shard = self.__shard__(key)
+
+        location = shard.sink.write(name, data)
+
+        shard.records += 1
+        shard.bytes += len(data.encode("utf-8"))
+
+        return location
+
+    @property
+    def manifest(self) -> dict:
+        return {
+            "records": sum(shard.records for shard in self.shards),
+            "bytes": sum(shard.bytes for shard in self.shards),
+            "shards": [shard.manifest for shard in self.shards],
+        }
+
+    def close(self) -> None:
+        for shard in self.open.values():
+            shard.close()
+
+        self.open = OrderedDict()
+        self.current = {}
+
+        mpath = self.path / MANIFEST_NAME
+        tmppath = mpath.with_name(f"{mpath.name}.tmp")
+
+        with tmppath.open("w") as fh:
+            json.dump(self.manifest, fh, indent=2)
+
+        os.replace(tmppath, mpath)
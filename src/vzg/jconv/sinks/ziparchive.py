@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Articles as members of a ZIP file
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import base64
+import queue
+import threading
+import zipfile
+from pathlib import Path
+from zope.interface import implementer
+from vzg.jconv.interfaces import ISink
+from vzg.jconv.sinks import SinkBase
+
+COMPRESSION_METHODS = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+
+@implementer(ISink)
+class ZipSink(SinkBase):
+    """Write each article as member of a ZIP file
+
+    The members are compressed and written by a writer thread, so the
+    conversion does not wait for the compression. The compressors of
+    the standard library release the GIL while compressing.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        Path of the ZIP file
+    method : str
+        stored, deflated, bzip2 or lzma
+    compresslevel : int
+        Compression level of the method, None is the default level
+    max_pending : int
+        Maximal number of articles waiting for the writer thread,
+        `write` blocks while the queue is full
+    positions : dict
+        Committed state of the ZIP file of a former run, which is
+        continued. Either the size of a closed file or the offset and
+        the central directory returned by `flush`. The members written
+        after the commit overwrote that directory, so the file is
+        truncated to the offset and the directory is written again.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        method: str = "deflated",
+        compresslevel: int = None,
+        max_pending: int = 256,
+        positions: dict = None,
+    ) -> None:
+        if method not in COMPRESSION_METHODS:
+            raise ValueError(f"Unknown compression method {method}")
+
+        self.path = Path(path)
+        self.compress_type = COMPRESSION_METHODS[method]
+        self.compresslevel = compresslevel
+
+        position = {} if positions is None else positions
+        position = position.get(self.path.as_posix())
+
+        if position is None:
+            self.zfh = zipfile.ZipFile(self.path, "w")
+        else:
+            if isinstance(position, int):
+                offset, directory = position, b""
+            else:
+                offset = position["offset"]
+                directory = base64.b64decode(position["directory"])
+
+            with self.path.open("r+b") as fh:
+                fh.truncate(offset)
+                fh.seek(offset)
+                fh.write(directory)
+
+            self.zfh = zipfile.ZipFile(self.path, "a")
+        self.error = None
+
+        self.queue = queue.Queue(maxsize=max(max_pending, 1))
+        self.thread = threading.Thread(
+            target=self.__writer__, name=f"ZipSink {self.path.name}", daemon=True
+        )
+        self.thread.start()
+
+    def __writer__(self) -> None:
+        """Compress and append the pending articles one by one"""
+        while True:
+            item = self.queue.get()
+
+            if item is None:
+                self.queue.task_done()
+                return None
+
+            # After an error keep consuming, the producer must not block
+            if self.error is None:
+                name, data = item
+
+                try:
+                    self.zfh.writestr(
+                        name,
+                        data,
+                        compress_type=self.compress_type,
+                        compresslevel=self.compresslevel,
+                    )
+                except Exception as exc:
+                    self.error = exc
+
+            self.queue.task_done()
+
+    def __raise__(self) -> None:
+        if self.error is not None:
+            raise OSError(f"Writing {self.path} failed") from self.error
+
+    def write(self, name: str, data: str) -> str:
+        self.__raise__()
+
+        self.queue.put((name, data))
+
+        return f"{self.path.as_posix()}#{name}"
+
+    def flush(self) -> dict:
+        """Write the central directory
+
+        The ZIP file is closed and reopened for appending,
+        this costs a rewrite of the central directory. The next
+        member overwrites the directory, so it is returned with
+        its offset to continue the file after a crash.
+        """
+        self.queue.join()
+        self.__raise__()
+
+        self.zfh.close()
+        self.zfh = zipfile.ZipFile(self.path, "a")
+
+        # The directory starts where the next member will be written
+        offset = self.zfh.start_dir
+
+        with self.path.open("rb") as fh:
+            fh.seek(offset)
+            directory = fh.read()
+
+        return {
+            self.path.as_posix(): {
+                "offset": offset,
+                "directory": base64.b64encode(directory).decode("ascii"),
+            }
+        }
+
+    def close(self) -> None:
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+            self.zfh.close()
+
+        self.__raise__()
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""Counters and timers of a conversion run
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import bisect
+import datetime
+import heapq
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Generator, Iterable
+
+STAGES = (
+    "read",
+    "parse",
+    "pubtype",
+    "extract",
+    "validate",
+    "serialize",
+    "write",
+)
+
+COUNTERS = (
+    "documents",
+    "articles",
+    "bytes",
+    "bytes_in",
+    "skipped",
+    "failed",
+    "validation_failed",
+    "empty",
+)
+
+# Events of a run and the level of their log messages
+EVENT_LEVELS = {
+    "missing": logging.INFO,
+    "invalid": logging.WARNING,
+    "problem": logging.ERROR,
+}
+
+# Names of the documents kept per event
+MAX_EXAMPLES = 3
+
+# Stats of the running conversion, see collect
+__active__ = None
+
+__notimer__ = nullcontext()
+
+__end__ = object()
+
+
+class Timer:
+    """Measure a stage, the time of nested stages is not included"""
+
+    __slots__ = ("stats", "stage", "start", "inner")
+
+    def __init__(self, stats: "Stats", stage: str) -> None:
+        self.stats = stats
+        self.stage = stage
+        self.start = 0.0
+        self.inner = 0.0
+
+    def __enter__(self) -> "Timer":
+        self.stats.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        elapsed = time.perf_counter() - self.start
+        stack = self.stats.stack
+
+        stack.pop()
+        self.stats.seconds[self.stage] += elapsed - self.inner
+        self.stats.calls[self.stage] += 1
+
+        if self.stats.histograms is not None:
+            self.stats.observe(self.stage, elapsed - self.inner)
+
+        if len(stack) > 0:
+            stack[-1].inner += elapsed
+
+        return False
+
+
+class Stats:
+    """Counters, cumulative stage times and the slowest documents
+
+    The stages are timed exclusively, so the parse time does not
+    include the reading of the files. The costs are two clock
+    reads per stage, the stats can always be collected.
+
+    Parameters
+    ----------
+    slowest : int
+        Number of the slowest documents to remember
+    buckets : tuple
+        Upper bounds in seconds of the histograms of the stage
+        times, None records no histograms
+    """
+
+    def __init__(self, slowest: int = 10, buckets: tuple = None) -> None:
+        self.slowest = slowest
+        self.buckets = buckets
+        self.histograms = (
+            None
+            if buckets is None
+            else {stage: [0] * (len(buckets) + 1) for stage in STAGES}
+        )
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.stack = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+        self.events = {}
+
+        self.__documents__ = []
+        self.__seq__ = 0
+
+    def timer(self, stage: str) -> Timer:
+        return Timer(self, stage)
+
+    def count(self, name: str, num: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + num
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Add a time of a stage to its histogram"""
+        if stage not in self.histograms:
+            self.histograms[stage] = [0] * (len(self.buckets) + 1)
+
+        self.histograms[stage][bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def event(self, kind: str, key: str, example: str = "") -> None:
+        """Count an event, like a missing field, with an example document"""
+        entry = self.events.get((kind, key))
+
+        if entry is None:
+            entry = self.events[(kind, key)] = [0, []]
+
+        entry[0] += 1
+
+        if example and len(entry[1]) < MAX_EXAMPLES and example not in entry[1]:
+            entry[1].append(example)
+
+    def log_events(self) -> None:
+        """Log every event once with its count, the most frequent first"""
+        logger = logging.getLogger(__name__)
+
+        for (kind, key), (num, examples) in sorted(
+            self.events.items(), key=lambda item: -item[1][0]
+        ):
+            level = EVENT_LEVELS.get(kind, logging.INFO)
+
+            if not logger.isEnabledFor(level):
+                continue
+
+            msg = f"{kind} {key}: {num}x"
+            if len(examples) > 0:
+                msg += f", e.g. {', '.join(examples)}"
+
+            logger.log(level, msg)
+
+    def document(self, name: str, index: int, seconds: float) -> None:
+        """Remember the duration of a document, if it is among the slowest"""
+        if self.slowest < 1:
+            return None
+
+        self.__seq__ += 1
+        entry = (seconds, self.__seq__, name, index)
+
+        if len(self.__documents__) < self.slowest:
+            heapq.heappush(self.__documents__, entry)
+        elif seconds > self.__documents__[0][0]:
+            heapq.heapreplace(self.__documents__, entry)
+
+    def stop(self) -> None:
+        self.elapsed = time.perf_counter() - self.started
+
+    @property
+    def documents(self) -> list[dict]:
+        """The slowest documents, the slowest first"""
+        return [
+            {"name": name, "index": index, "seconds": seconds}
+            for seconds, seq, name, index in sorted(self.__documents__, reverse=True)
+        ]
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed if self.elapsed > 0 else None
+
+        return {
+            "seconds": self.elapsed,
+            "docs_per_s": (
+                self.counters["documents"] / elapsed if elapsed is not None else None
+            ),
+            "counters": dict(self.counters),
+            "stages": {
+                stage: {"seconds": self.seconds[stage], "calls": self.calls[stage]}
+                for stage in STAGES
+            },
+            "slowest": self.documents,
+            "events": [
+                {"kind": kind, "key": key, "count": num, "examples": examples}
+                for (kind, key), (num, examples) in self.events.items()
+            ],
+        }
+
+    def summary(self) -> str:
+        """Human readable summary"""
+        counters = ", ".join(
+            f"{name.replace('_', ' ')} {num}" for name, num in self.counters.items()
+        )
+        documents = max(self.counters["documents"], 1)
+        elapsed = self.elapsed if self.elapsed > 0 else float("nan")
+
+        lines = [
+            counters,
+            f"{self.elapsed:.3f} s, "
+            f"{self.counters['documents'] / elapsed:.1f} documents/s",
+        ]
+
+        for stage in STAGES:
+            seconds = self.seconds[stage]
+            lines.append(
+                f"  {stage:<10} {seconds:10.3f} s {seconds / elapsed:7.1%} "
+                f"{seconds / documents * 1000:10.3f} ms/document"
+            )
+
+        if len(self.__documents__) > 0:
+            lines.append("slowest documents")
+
+        for entry in self.documents:
+            lines.append(
+                f"  {entry['seconds']:10.3f} s  {entry['name']} (#{entry['index']})"
+            )
+
+        if len(self.events) > 0:
+            lines.append("events")
+
+        for (kind, key), (num, examples) in sorted(
+            self.events.items(), key=lambda item: -item[1][0]
+        ):
+            lines.append(f"  {num:10}  {kind} {key}")
+
+        return "\n".join(lines)
+
+    def save(self, path: Path) -> None:
+        with open(path, "w") as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+            fh.write("\n")
+
+
+class Progress:
+    """Rate limited progress of a run
+
+    The progress is logged at most once per interval, with the
+    throughput, the estimated remaining time, the failures and the
+    CPU utilization of the process since the last report.
+
+    Parameters
+    ----------
+    stats : Stats
+        Stats of the run
+    total : int
+        Number of documents, None if unknown
+    interval : float
+        Minimal seconds between two reports, 0 disables the reports
+    start : int
+        Documents of a former run, which are skipped
+    """
+
+    def __init__(
+        self,
+        stats: Stats,
+        total: int = None,
+        interval: float = 10.0,
+        start: int = 0,
+    ) -> None:
+        self.stats = stats
+        self.total = total
+        self.interval = interval
+        self.position = start
+        self.reported = None
+
+        self.started = self.last = time.perf_counter()
+        self.next = self.started + interval
+        self.cpu = time.process_time()
+
+    def update(self, now: float, position: int) -> None:
+        """The document before `position` is done"""
+        self.position = position
+
+        if now >= self.next and self.interval > 0:
+            self.report(now)
+
+    def report(self, now: float) -> None:
+        """Log the progress, unless it has already been reported"""
+        if self.interval <= 0 or self.position == self.reported:
+            return None
+
+        self.reported = self.position
+
+        logger = logging.getLogger(__name__)
+
+        counters = self.stats.counters
+        elapsed = max(now - self.started, 1e-9)
+        rate = counters["documents"] / elapsed
+
+        cpu = time.process_time()
+        utilization = (cpu - self.cpu) / max(now - self.last, 1e-9)
+        self.cpu = cpu
+        self.last = now
+        self.next = now + self.interval
+
+        position = f"{self.position} documents"
+        eta = "-"
+
+        if self.total is not None and self.position <= self.total:
+            position = f"{self.position}/{self.total} documents"
+            position += f" ({self.position / max(self.total, 1):.1%})"
+
+            if rate > 0:
+                seconds = round((self.total - self.position) / rate)
+                eta = str(datetime.timedelta(seconds=seconds))
+
+        msg = (
+            f"{position}, {rate:.1f} docs/s, "
+            f"{counters['bytes'] / 1e6 / elapsed:.2f} MB/s, ETA {eta}, "
+            f"{counters['failed']} failed, {counters['validation_failed']} invalid, "
+            f"CPU {utilization:.0%}"
+        )
+        logger.info(msg)
+
+
+@contextmanager
+def collect(stats: Stats) -> Generator[Stats, None, None]:
+    """Collect the stats of the conversion within the context"""
+    global __active__
+
+    previous = __active__
+    __active__ = stats
+
+    try:
+        yield stats
+    finally:
+        __active__ = previous
+        stats.stop()
+
+
+def timer(stage: str):
+    """Time a stage of the running conversion, if stats are collected"""
+    if __active__ is None:
+        return __notimer__
+
+    return __active__.timer(stage)
+
+
+def event(kind: str, key: str, example: str = "") -> None:
+    """Count an event of the running conversion"""
+    if __active__ is not None:
+        __active__.event(kind, key, example)
+
+
+def problem(
+    logger: logging.Logger, msg: str, key: str = "", example: str = "", exc_info=True
+) -> None:
+    """A document, or a part of it, could not be converted
+
+    Within a run the problem is counted and logged once at the end,
+    the message of the single document is a debug message. Without
+    a run the message is logged as error.
+
+    Parameters
+    ----------
+    logger : logging.Logger
+        Logger of the message
+    msg : str
+        Message with the document
+    key : str
+        Kind of the problem, default: the class of the exception
+    example : str
+        Name of the document
+    exc_info : bool or BaseException
+        Exception, True for the handled one
+    """
+    if __active__ is None:
+        logger.error(msg, exc_info=exc_info)
+        return None
+
+    if key == "":
+        exc = sys.exc_info()[1] if exc_info is True else exc_info
+        key = "unknown" if not exc else type(exc).__name__
+
+    __active__.event("problem", key, example)
+    logger.debug(msg, exc_info=exc_info)
+
+
+def invalid(logger: logging.Logger, exc: Exception) -> None:
+    """An article failed the JSON Schema validation"""
+    if __active__ is not None:
+        path = "/".join(str(part) for part in exc.absolute_path) or "/"
+        __active__.event("invalid", f"{path} {exc.validator}")
+
+    logger.debug("%s", exc)
+
+
+def count(name: str, num: int = 1) -> None:
+    """Increase a counter of the running conversion"""
+    if __active__ is not None:
+        __active__.count(name, num)
+
+
+def timed(iterable: Iterable, stage: str) -> Generator:
+    """Time the creation of every item of an iterable as stage"""
+    iterator = iter(iterable)
+
+    while True:
+        with timer(stage):
+            item = next(iterator, __end__)
+
+        if item is __end__:
+            return None
+
+        yield item
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import pytest
+from pathlib import Path
+from vzg.jconv.bench.adversarial import WORST_CASES, WorstCase, measure
+
+# Growth of the time and memory for a four times larger document. Linear
+# costs grow by four, quadratic ones by sixteen. The absolute seconds of
+# a production worst case are checked by the opt-in benchmark gate.
+MAX_GROWTH = 8
+
+# Small documents are dominated by fixed costs and timer noise
+SLACK_SECONDS = 0.02
+
+# Python allocations per byte of the document, plus a fixed amount
+MAX_PEAK_PER_BYTE = 32
+MAX_PEAK_BASE = 4 * 1024 * 1024
+
+
+@pytest.mark.parametrize("case", WORST_CASES, ids=[case.name for case in WORST_CASES])
+def test_worst_case(case: WorstCase, tmp_path: Path):
+    """Pathological documents are converted in linear time and memory"""
+    small = measure(case, case.size // 4, tmp_path, repeat=3)
+    large = measure(case, case.size, tmp_path, repeat=3)
+
+    assert large.articles > 0
+    assert large.seconds < small.seconds * MAX_GROWTH + SLACK_SECONDS
+    assert large.peak < large.bytes * MAX_PEAK_PER_BYTE + MAX_PEAK_BASE
+    assert large.peak < small.peak * MAX_GROWTH + MAX_PEAK_BASE
@@ -9,6 +9,9 @@
 ##############################################################################
 """
 
+import gzip
+import logging
+import pymarc
 import pytest
 import unittest
 import zipfile
@@ -22,6 +25,7 @@ from vzg.jconv.converter.jats import JatsConverter
 from vzg.jconv.converter.MarcXmlConverter import MarcConverter
 from vzg.jconv.converter.oai import OAIDCConverter
 from vzg.jconv.interfaces import IConverter
+from vzg.jconv.tools.simple_conv import create_parser
 
 
 @dataclass
@@ -39,6 +43,39 @@ def setup_marcxml() -> MarcXMLBase:
     return marcxml_base
 
 
+def marc_record(num: int) -> pymarc.Record:
+    record = pymarc.Record(force_utf8=True)
+    record.add_field(
+        pymarc.Field(tag="001", data=f"record-{num}"),
+        pymarc.Field(
+            tag="245",
+            indicators=pymarc.Indicators("0", "0"),
+            subfields=[pymarc.Subfield("a", f"Title {num}")],
+        ),
+        pymarc.Field(
+            tag="490",
+            indicators=pymarc.Indicators("0", " "),
+            subfields=[pymarc.Subfield("a", "In: Zeitschrift; 12 (2025) 3")],
+        ),
+    )
+
+    return record
+
+
+@pytest.fixture(params=[".mrc", ".mrc.gz"])
+def setup_marcbinary(request, tmp_path) -> MarcXMLBase:
+    """"""
+    data = b"".join(marc_record(num).as_marc() for num in range(3))
+    archive = tmp_path / f"records{request.param}"
+
+    if request.param.endswith(".gz"):
+        data = gzip.compress(data)
+
+    archive.write_bytes(data)
+
+    return MarcXMLBase(archive=archive)
+
+
 class TestSpringer(unittest.TestCase):
     def setUp(self) -> None:
         self.archive = Path("data/tests/springer/test_archive.zip")
@@ -108,3 +145,47 @@ def test_marcxml_num(setup_marcxml: MarcXMLBase):
 
     archive = MarcArchive(setup_marcxml.archive)
     assert archive.num_files == 7
+
+
+def test_marcbinary_num(setup_marcbinary: MarcXMLBase):
+    archive = MarcArchive(setup_marcbinary.archive)
+
+    # The records are not counted beforehand
+    assert archive.is_binary
+    assert archive.num_files is None
+
+
+def test_marcbinary_converter(setup_marcbinary: MarcXMLBase):
+    archive = MarcArchive(setup_marcbinary.archive, validate=False)
+
+    converters = list(archive.converters)
+    assert len(converters) == 3
+
+    for num, conv in enumerate(converters):
+        assert isinstance(conv, MarcConverter)
+        assert conv.record["001"].value() == f"record-{num}"
+        assert conv.name == f"{setup_marcbinary.archive.name}#{num}"
+
+        conv.run()
+        assert conv.articles[0].primary_id["id"] == f"record-{num}"
+
+
+def test_marcbinary_cli(setup_marcbinary: MarcXMLBase, tmp_path: Path, caplog):
+    """Records without a total are logged by their name"""
+    opath = tmp_path / "output"
+    args = ["marc", "-o", str(opath), "-f", "jsonl", "--compression", "none"]
+    options = create_parser().parse_args(args + [str(setup_marcbinary.archive)])
+
+    with caplog.at_level(logging.DEBUG):
+        options.func(options)
+
+    assert f"{setup_marcbinary.archive.name}#2" in caplog.messages
+    assert len((opath / "records.jsonl").read_text().splitlines()) == 3
+
+
+def test_marc_suffix(tmp_path: Path):
+    archive = tmp_path / "records.xml"
+    archive.write_text("<collection/>")
+
+    with pytest.raises(ValueError):
+        MarcArchive(archive)
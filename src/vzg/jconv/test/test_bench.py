@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+import pytest
+from pathlib import Path
+from vzg.jconv.bench import STAGES, Report, StageTimer, percentile
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.bench.targets import Corpus, run_benchmarks
+from vzg.jconv.test.test_memory import JATS as JATS_BASE
+from vzg.jconv.tools.bench import create_parser
+
+# Valid articles need a journal title
+JATS = JATS_BASE.replace(
+    "<journal-meta>",
+    "<journal-meta>\n      <journal-title-group>"
+    "<journal-title>Journal</journal-title></journal-title-group>",
+)
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Corpus:
+    dpath = tmp_path / "jats"
+    dpath.mkdir()
+
+    for num in range(3):
+        (dpath / f"{num}.xml").write_text(JATS.format(num=num, paras="<p>Text</p>"))
+
+    return Corpus("jats", dpath)
+
+
+def test_percentile():
+    """"""
+    values = [float(num) for num in range(1, 101)]
+
+    assert percentile([], 50) is None
+    assert percentile([2.0], 99) == 2.0
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+
+
+def test_stage_timer():
+    """The latency of a document is the sum of its stages"""
+    timer = StageTimer()
+
+    for stage in STAGES:
+        with timer.stage(stage):
+            pass
+
+    timer.done()
+
+    with timer.stage("parse"):
+        pass
+
+    timer.discard()
+
+    assert len(timer.latencies) == 1
+    assert timer.latencies[0] == pytest.approx(
+        sum(durations[0] for durations in timer.stages.values())
+    )
+
+
+def test_benchmarks(corpus: Corpus, tmp_path: Path):
+    """All targets, the report can be compared across commits"""
+    report = run_benchmarks([corpus], repeat=2)
+
+    assert list(report.results) == ["jats/converter", "jats/archive", "jats/cli"]
+
+    for name, result in report.results.items():
+        assert result["documents"] == 6
+        assert result["articles"] == 12
+        assert result["bytes"] > 0
+        assert result["docs_per_s"] > 0
+
+        if name == "jats/cli":
+            assert result["latency"] is None
+            continue
+
+        assert result["invalid"] == 0
+        assert list(result["stages"]) == list(STAGES)
+        assert result["latency"]["p50"] <= result["latency"]["p99"]
+
+    rpath = tmp_path / "report.json"
+    report.save(rpath)
+
+    loaded = Report.load(rpath)
+
+    assert loaded.as_dict() == json.loads(report.dumps())
+    assert loaded.meta["format"] == 1
+
+
+def test_cli(corpus: Corpus, tmp_path: Path):
+    """"""
+    rpath = tmp_path / "report.json"
+    args = ["run", "--jats", str(corpus.path), "-t", "converter", "-o", str(rpath)]
+
+    options = create_parser().parse_args(args)
+    options.func(options)
+
+    with open(rpath) as fh:
+        assert list(json.load(fh)["results"]) == ["jats/converter"]
+
+
+def test_cli_marc_binary(tmp_path: Path):
+    """The documents of the cli target are the records, not the files"""
+    generator = CorpusGenerator(CorpusSpec("marc", "binary"))
+
+    mpath = tmp_path / "records.mrc"
+    mpath.write_bytes(b"".join(generator.marc(num).as_marc() for num in range(3)))
+
+    corpus = Corpus("marc", mpath)
+    report = run_benchmarks([corpus], targets=["cli"], repeat=2)
+
+    assert corpus.num_files == 1
+    assert report.results["marc/cli"]["documents"] == 6
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+from pathlib import Path
+from vzg.jconv import cache as cache_module
+from vzg.jconv.archives.oai import MarcArchive
+from vzg.jconv.cache import ResultCache
+from vzg.jconv.converter.MarcXmlConverter import MarcConverter
+from vzg.jconv.converter.snapshot import CachedConverter
+from vzg.jconv.test.test_archives import marc_record
+
+
+def convert(archive: MarcArchive) -> list:
+    articles = []
+
+    for conv in archive.converters:
+        conv.run()
+        articles += [article.json for article in conv.articles]
+
+    return articles
+
+
+def test_cache(tmp_path: Path):
+    """Unchanged records are not converted again"""
+    mpath = tmp_path / "records.mrc"
+    mpath.write_bytes(b"".join(marc_record(num).as_marc() for num in range(3)))
+
+    cache = ResultCache(tmp_path / "cache.db")
+    expected = convert(MarcArchive(mpath, cache=cache, validate=False))
+
+    assert cache.stats["misses"] == 3
+    assert cache.stats["hits"] == 0
+    cache.close()
+
+    cache = ResultCache(tmp_path / "cache.db")
+    archive = MarcArchive(mpath, cache=cache, validate=False)
+
+    assert all(isinstance(conv, CachedConverter) for conv in archive.converters)
+    assert convert(archive) == expected
+    assert cache.hit_rate == 1.0
+
+    # Other options, other keys
+    archive = MarcArchive(mpath, cache=cache, validate=True)
+    assert all(isinstance(conv, MarcConverter) for conv in archive.converters)
+    cache.close()
+
+
+def test_converter_version(tmp_path: Path, monkeypatch):
+    """Results of another conversion version are not used"""
+    mpath = tmp_path / "records.mrc"
+    mpath.write_bytes(marc_record(0).as_marc())
+
+    cache = ResultCache(tmp_path / "cache.db")
+    convert(MarcArchive(mpath, cache=cache, validate=False))
+
+    monkeypatch.setattr(
+        cache_module, "CONVERTER_VERSION", cache_module.CONVERTER_VERSION + 1
+    )
+    archive = MarcArchive(mpath, cache=cache, validate=False)
+
+    assert all(isinstance(conv, MarcConverter) for conv in archive.converters)
+    cache.close()
+
+
+def test_eviction(tmp_path: Path):
+    """Least recently used results are removed"""
+    mpath = tmp_path / "records.mrc"
+    mpath.write_bytes(b"".join(marc_record(num).as_marc() for num in range(5)))
+
+    cache = ResultCache(tmp_path / "cache.db")
+    convert(MarcArchive(mpath, cache=cache, validate=False))
+    size = cache.size
+    cache.close()
+
+    cache = ResultCache(tmp_path / "cache.db", max_bytes=size // 2)
+    convert(MarcArchive(mpath, cache=cache, validate=False))
+
+    assert cache.size <= size // 2
+    assert cache.db.execute("SELECT COUNT(*) FROM results").fetchone()[0] < 5
+    cache.close()
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import gzip
+import json
+import multiprocessing
+import os
+import signal
+import time
+import zipfile
+from pathlib import Path
+import pytest
+from vzg.jconv.archives import checkpoint as checkpoint_module
+from vzg.jconv.archives.sources import open_source
+from vzg.jconv.index import ArticleIndex
+from vzg.jconv.tools.simple_conv import convert, create_parser
+
+NUM_MEMBERS = 6
+
+
+class Article:
+    def __init__(self, name: str, payload: str = "") -> None:
+        self.json = json.dumps(
+            {"name": name, "primary_id": {"id": name}, "payload": payload}
+        )
+
+
+class Converter:
+    def __init__(
+        self, name: str, fail: bool, kill: bool = False, payload: str = ""
+    ) -> None:
+        self.name = name
+        self.fail = fail
+        self.kill = kill
+        self.payload = payload
+        self.articles = []
+        self.validation_failed = False
+
+    def run(self) -> None:
+        if self.kill:
+            # The writer thread of the ZIP output writes the former member
+            time.sleep(0.2)
+            os.kill(os.getpid(), signal.SIGKILL)
+
+        if self.fail:
+            raise MemoryError(self.name)
+
+        self.articles = [Article(self.name, self.payload)]
+
+    def release(self) -> None:
+        pass
+
+
+class Archive:
+    """One converter per member, fails at the member `fail`"""
+
+    def __init__(self, path: Path, fail: str = None, kill: str = None) -> None:
+        self.source = open_source(path)
+        self.fail = fail
+        self.kill = kill
+
+    @property
+    def converters(self):
+        for member in self.source.members:
+            yield Converter(
+                member.name, member.name == self.fail, member.name == self.kill
+            )
+
+    @property
+    def num_files(self) -> int:
+        return self.source.num_files
+
+
+class Clock:
+    """Time of the checkpoints, only advanced by the archive"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class TickingArchive(Archive):
+    """The checkpoint interval passes with the member `tick`
+
+    The articles are larger than the buffers of the files,
+    so they are on disk when the process is killed.
+    """
+
+    def __init__(self, path: Path, clock: Clock, tick: str, kill: str) -> None:
+        super().__init__(path, kill=kill)
+        self.clock = clock
+        self.tick = tick
+
+    @property
+    def converters(self):
+        for conv in super().converters:
+            if conv.name == self.tick:
+                self.clock.now += 3600
+
+            conv.payload = os.urandom(32768).hex()
+            yield conv
+
+
+def describe(conv, i: int, num: float) -> str:
+    return conv.name
+
+
+def killed(options, archive: Archive) -> None:
+    """Convert in a child process, which is killed without any cleanup"""
+    process = multiprocessing.get_context("fork").Process(
+        target=convert, args=(options, archive, "delivery", describe)
+    )
+    process.start()
+    process.join()
+
+    assert process.exitcode == -signal.SIGKILL
+
+
+def names(opath: Path, output_format: str) -> list:
+    if output_format == "zip":
+        with zipfile.ZipFile(opath / "delivery.zip") as zfh:
+            return [json.loads(zfh.read(name))["name"] for name in zfh.namelist()]
+
+    with gzip.open(opath / "delivery.jsonl.gz", "rt") as fh:
+        return [json.loads(line)["name"] for line in fh]
+
+
+@pytest.mark.parametrize("output_format", ["zip", "jsonl"])
+def test_resume(tmp_path: Path, output_format):
+    """An interrupted conversion is continued"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    for num in range(NUM_MEMBERS):
+        (dpath / f"{num}.xml").write_text("<xml/>")
+
+    opath = tmp_path / "output"
+    args = ["jats", "-o", str(opath), "-f", output_format, "--compression", "gzip"]
+    args += ["--checkpoint-interval", "0", str(dpath)]
+
+    options = create_parser().parse_args(args + ["--resume"])
+    describe = lambda conv, i, num: conv.name
+
+    with pytest.raises(MemoryError):
+        convert(options, Archive(dpath, fail="3.xml"), "delivery", describe)
+
+    # Output of the crashed member
+    if output_format == "jsonl":
+        with (opath / "delivery.jsonl.gz").open("ab") as fh:
+            fh.write(b"\x1f\x8b\x08garbage")
+
+    checkpoint = json.loads((opath / "delivery.checkpoint").read_text())
+    assert sorted(checkpoint["members"]) == ["0.xml", "1.xml", "2.xml"]
+
+    assert convert(options, Archive(dpath), "delivery", describe)
+
+    assert names(opath, output_format) == [f"{num}.xml" for num in range(NUM_MEMBERS)]
+
+    # Nothing left to do
+    assert convert(options, Archive(dpath, fail="0.xml"), "delivery", describe)
+
+
+@pytest.mark.parametrize("compression", ["none", "gzip"])
+def test_resume_locations(tmp_path: Path, compression):
+    """The locations of a resumed JSON Lines output point at the articles"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    for num in range(NUM_MEMBERS):
+        (dpath / f"{num}.xml").write_text("<xml/>")
+
+    opath = tmp_path / "output"
+    args = ["jats", "-o", str(opath), "-f", "jsonl", "--compression", compression]
+    args += ["--rotate-records", "4", "--checkpoint-interval", "0", str(dpath)]
+
+    options = create_parser().parse_args(args + ["--resume"])
+    describe = lambda conv, i, num: conv.name
+
+    with pytest.raises(MemoryError):
+        convert(options, Archive(dpath, fail="3.xml"), "delivery", describe)
+
+    assert convert(options, Archive(dpath), "delivery", describe)
+
+    checkpoint = json.loads((opath / "delivery.checkpoint").read_text())
+    opener = gzip.open if compression == "gzip" else open
+
+    for name, entry in checkpoint["members"].items():
+        fname, num = entry["outputs"][0].split("#")
+
+        with opener(fname, "rt") as fh:
+            lines = fh.readlines()
+
+        assert len(lines) <= 4
+        assert json.loads(lines[int(num) - 1])["name"] == name
+
+
+def test_without_resume(tmp_path: Path):
+    """Checkpoints are only written with --resume"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+    (dpath / "0.xml").write_text("<xml/>")
+
+    opath = tmp_path / "output"
+    opath.mkdir()
+    (opath / "delivery.checkpoint").write_text("{}")
+
+    options = create_parser().parse_args(["jats", "-o", str(opath), str(dpath)])
+    assert convert(options, Archive(dpath), "delivery", lambda conv, i, num: "")
+
+    assert not (opath / "delivery.checkpoint").exists()
+
+
+def test_resume_binary_marc(tmp_path: Path):
+    """Binary MARC files cannot be resumed"""
+    mpath = tmp_path / "records.mrc"
+    mpath.write_bytes(b"00000nam a2200000 a 4500\x1e\x1d")
+
+    args = ["marc", "-o", str(tmp_path / "output"), "--resume", str(mpath)]
+    options = create_parser().parse_args(args)
+
+    with pytest.raises(SystemExit):
+        options.func(options)
+
+    assert not (tmp_path / "output" / "records.checkpoint").exists()
+
+
+def test_resume_index(tmp_path: Path):
+    """The index has the articles of a killed and resumed conversion"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    for num in range(NUM_MEMBERS):
+        (dpath / f"{num}.xml").write_text("<xml/>")
+
+    opath = tmp_path / "output"
+    ipath = tmp_path / "index.db"
+    args = ["jats", "-o", str(opath), "-f", "jsonl", "--index", str(ipath)]
+    args += ["--resume", "--checkpoint-interval", "0", str(dpath)]
+
+    options = create_parser().parse_args(args)
+    killed(options, Archive(dpath, kill="3.xml"))
+
+    assert convert(options, Archive(dpath), "delivery", describe)
+
+    index = ArticleIndex(ipath)
+
+    for num in range(NUM_MEMBERS):
+        entries = index.lookup(f"{num}.xml")
+        assert len(entries) == 1
+        assert entries[0]["location"].endswith(f"#{num + 1}")
+
+    index.close()
+
+
+def test_resume_zip_killed(tmp_path: Path, monkeypatch):
+    """A killed ZIP output keeps the members of the checkpoint"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    for num in range(NUM_MEMBERS):
+        (dpath / f"{num}.xml").write_text("<xml/>")
+
+    clock = Clock()
+    monkeypatch.setattr(checkpoint_module, "time", clock)
+
+    opath = tmp_path / "output"
+    args = ["jats", "-o", str(opath), "-f", "zip", "--zip-method", "stored"]
+    args += ["--resume", str(dpath)]
+
+    options = create_parser().parse_args(args)
+    killed(options, TickingArchive(dpath, clock, tick="1.xml", kill="3.xml"))
+
+    # 2.xml has been written over the central directory of the checkpoint
+    checkpoint = json.loads((opath / "delivery.checkpoint").read_text())
+    assert sorted(checkpoint["members"]) == ["0.xml", "1.xml"]
+
+    assert convert(options, Archive(dpath), "delivery", describe)
+
+    assert names(opath, "zip") == [f"{num}.xml" for num in range(NUM_MEMBERS)]
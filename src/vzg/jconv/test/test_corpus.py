@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import pytest
+import zipfile
+from pathlib import Path
+from vzg.jconv.bench.corpus import DIALECTS, CorpusGenerator, CorpusSpec
+from vzg.jconv.bench.targets import create_archive
+from vzg.jconv.gapi import JSON_VALIDATOR
+
+SPECS = [(kind, dialect) for kind, dialects in DIALECTS.items() for dialect in dialects]
+
+
+@pytest.mark.parametrize("kind,dialect", SPECS)
+def test_dialects(tmp_path: Path, kind: str, dialect: str):
+    """The generated documents are converted to valid articles"""
+    spec = CorpusSpec(
+        kind=kind,
+        dialect=dialect,
+        documents=4,
+        records=1 if dialect == "marcxml" else 2,
+        mathml=0.5,
+        tex=0.5,
+        scripts=0.1,
+        body_paragraphs=1,
+    )
+
+    corpus = CorpusGenerator(spec).write(tmp_path / "delivery.zip")
+
+    documents = 0
+
+    for conv in create_archive(corpus).converters:
+        conv.run()
+
+        assert len(conv.articles) > 0
+
+        for article in conv.articles:
+            JSON_VALIDATOR.validate(article.jdict)
+
+        documents += 1
+
+    assert documents == 4
+
+
+def test_seed(tmp_path: Path):
+    """The same seed gives the same delivery"""
+    paths = []
+
+    for num, seed in enumerate((1, 1, 2)):
+        spec = CorpusSpec(documents=3, seed=seed, mathml=0.2, scripts=0.1)
+        paths.append(CorpusGenerator(spec).write(tmp_path / f"{num}.zip").path)
+
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+    assert paths[0].read_bytes() != paths[2].read_bytes()
+
+    # A larger delivery starts with the smaller one
+    small = list(CorpusGenerator(CorpusSpec(documents=2)).members())
+    large = list(CorpusGenerator(CorpusSpec(documents=5)).members())
+
+    assert large[:2] == small
+
+
+def test_knobs(tmp_path: Path):
+    """"""
+    spec = CorpusSpec(documents=1, authors=(3, 3), keywords=7, body_paragraphs=4)
+    name, data = next(CorpusGenerator(spec).members())
+
+    assert data.count(b'<contrib contrib-type="author">') == 3
+    assert data.count(b"<kwd>") == 7
+    assert data.count(b"<sec>") == 4
+    assert b"inline-formula" not in data
+
+    spec = CorpusSpec(documents=1000, max_bytes=10000)
+    CorpusGenerator(spec).write(tmp_path / "limited.zip")
+
+    with zipfile.ZipFile(tmp_path / "limited.zip") as zfh:
+        assert 1 < len(zfh.namelist()) < 1000
+
+    with pytest.raises(ValueError):
+        CorpusSpec(kind="oai", dialect="springer")
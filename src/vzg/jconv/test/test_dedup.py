@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+import jsonschema
+import os
+import signal
+from pathlib import Path
+import pytest
+from vzg.jconv.archives.springer import ArchiveSpringer
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.dedup import DEDUP_POLICIES
+from vzg.jconv.dedup import BloomFilter
+from vzg.jconv.dedup import Deduplicator
+from vzg.jconv.dedup import UpdateConverter
+from vzg.jconv.dedup import jats_keys
+from vzg.jconv.gapi import JSON_VALIDATOR
+from vzg.jconv.test.test_checkpoint import describe, killed
+from vzg.jconv.test.test_memory import delivery
+from vzg.jconv.tools.simple_conv import convert, create_parser
+
+JATS = """<?xml version="1.0" encoding="UTF-8"?>
+<article>
+  <front>
+    <article-meta>
+      <article-id pub-id-type="publisher-id">s1</article-id>
+      <article-id pub-id-type="doi">10.1007/S1</article-id>
+      <pub-date publication-format="electronic" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+      <pub-date publication-format="print" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+    </article-meta>
+  </front>
+</article>
+"""
+
+
+def test_bloom(tmp_path: Path):
+    """"""
+    bloom = BloomFilter(capacity=100)
+
+    for num in range(100):
+        bloom.add(f"key-{num}")
+
+    bloom.save(tmp_path / "keys.bloom")
+    bloom = BloomFilter.load(tmp_path / "keys.bloom")
+
+    assert all(f"key-{num}" in bloom for num in range(100))
+    assert sum(f"other-{num}" in bloom for num in range(1000)) < 20
+
+
+def test_jats_keys():
+    """"""
+    assert jats_keys(JATS.encode()) == ["10.1007/s1#epub", "10.1007/s1#ppub"]
+    assert jats_keys(b"<article>") == []
+
+
+def test_dedup(tmp_path: Path):
+    """Documents of former deliveries are skipped or marked as updates"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+    (dpath / "article.xml").write_text(JATS)
+
+    dedup = Deduplicator(tmp_path / "dedup.db")
+    assert len(list(ArchiveSpringer(dpath, dedup=dedup).converters)) == 1
+    dedup.flush()
+    dedup.close()
+
+    dedup = Deduplicator(tmp_path / "dedup.db")
+    assert list(ArchiveSpringer(dpath, dedup=dedup).converters) == []
+    assert dedup.duplicates == 1
+    dedup.close()
+
+    # The exact store rebuilds a lost Bloom filter
+    (tmp_path / "dedup.db.bloom").unlink()
+
+    dedup = Deduplicator(tmp_path / "dedup.db", policy=DEDUP_POLICIES.update)
+    converters = list(ArchiveSpringer(dpath, dedup=dedup).converters)
+    assert [type(conv) for conv in converters] == [UpdateConverter]
+    dedup.close()
+
+
+def test_update_valid(tmp_path: Path):
+    """Articles marked as updates are valid"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    spec = CorpusSpec("jats", "springer", documents=1, seed=1)
+    for name, data in CorpusGenerator(spec).members():
+        (dpath / name).write_bytes(data)
+
+    archive = ArchiveSpringer(dpath, converter_kwargs={"validate": True})
+    conv = UpdateConverter(next(iter(archive.converters)))
+    conv.run()
+
+    assert not conv.validation_failed
+    assert len(conv.articles) == 2
+
+    for article in conv.articles:
+        jdict = json.loads(article.json)
+
+        assert jdict["update"] is True
+        JSON_VALIDATOR.validate(jdict)
+
+    # Other types are not
+    jdict["update"] = "yes"
+    with pytest.raises(jsonschema.ValidationError):
+        JSON_VALIDATOR.validate(jdict)
+
+
+class KilledArchive(ArchiveSpringer):
+    """Killed before the converter of the member `kill`"""
+
+    kill = None
+
+    @property
+    def converters(self):
+        for conv in super().converters:
+            if conv.name == self.kill:
+                os.kill(os.getpid(), signal.SIGKILL)
+
+            yield conv
+
+
+@pytest.mark.parametrize("interval", ["0", "3600"])
+def test_dedup_resume(tmp_path: Path, interval):
+    """The documents of a killed conversion are not skipped after a resume"""
+    dpath = delivery(tmp_path / "delivery", 4)
+    opath = tmp_path / "output"
+    dbpath = tmp_path / "dedup.db"
+
+    args = ["jats", "-o", str(opath), "-f", "jsonl", "--resume"]
+    args += ["--checkpoint-interval", interval, str(dpath)]
+    options = create_parser().parse_args(args)
+
+    # Without a checkpoint before the kill, the outputs are replaced
+    dedup = Deduplicator(dbpath, batch_size=1)
+    archive = KilledArchive(dpath, dedup=dedup)
+    archive.kill = "002.xml"
+    killed(options, archive)
+
+    dedup = Deduplicator(dbpath, batch_size=1)
+    assert convert(options, KilledArchive(dpath, dedup=dedup), "delivery", describe)
+    dedup.flush()
+    dedup.close()
+
+    with (opath / "delivery.jsonl").open() as fh:
+        titles = [json.loads(line)["title"] for line in fh]
+
+    # One article per publication type
+    assert titles == [f"Title {num}" for num in range(4) for _ in range(2)]
+
+    # All of them are duplicates now
+    dedup = Deduplicator(dbpath)
+    assert list(ArchiveSpringer(dpath, dedup=dedup).converters) == []
+    dedup.close()
+
+
+def test_bloom_outdated(tmp_path: Path):
+    """An outdated Bloom filter is rebuilt from the store"""
+    dedup = Deduplicator(tmp_path / "dedup.db")
+    dedup.add(["first"], "delivery")
+    dedup.flush()
+
+    outdated = (tmp_path / "dedup.db.bloom").read_bytes()
+
+    dedup.add(["second"], "delivery")
+    dedup.flush()
+    dedup.close()
+
+    # Saved by a run, which crashed after its last flush
+    (tmp_path / "dedup.db.bloom").write_bytes(outdated)
+
+    dedup = Deduplicator(tmp_path / "dedup.db")
+    assert dedup.duplicate(["first"])
+    assert dedup.duplicate(["second"])
+    assert not dedup.duplicate(["third"])
+    dedup.close()
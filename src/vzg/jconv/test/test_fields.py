@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+from lxml import etree
+from pathlib import Path
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.bench.fields import FieldProfiler, inspect_document
+from vzg.jconv.converter.jats import JatsArticle, JatsConverter
+from vzg.jconv.person import Person
+
+
+def document(tmp_path: Path) -> Path:
+    spec = CorpusSpec("jats", "springer", documents=1, seed=3, authors=(2, 2))
+    name, data = next(CorpusGenerator(spec).members())
+
+    jpath = tmp_path / name
+    jpath.write_bytes(data)
+
+    return jpath
+
+
+def convert(jpath: Path) -> list:
+    conv = JatsConverter(jpath)
+    conv.run()
+
+    return [article.json for article in conv.articles]
+
+
+def test_inspect_document(tmp_path: Path):
+    """Every field is timed with its XPath evaluations"""
+    jpath = document(tmp_path)
+
+    inspection = inspect_document(jpath, repeat=2)
+    fields = {timing.name: timing for timing in inspection.fields}
+
+    assert inspection.articles == 2
+    assert fields["JatsConverter.pubtypes"].calls == 2
+    # Once per person and conversion
+    assert fields["Person.affiliation"].calls == 4
+    assert fields["Person.affiliation"].xpaths > 0
+    assert fields["JatsArticle.jdict"].seconds >= fields["JatsArticle.title"].seconds
+    assert sum(timing.xpaths for timing in inspection.fields) == inspection.xpaths
+
+    owns = [timing.own for timing in inspection.fields]
+    assert owns == sorted(owns, reverse=True)
+
+    assert "Person.affiliation" in inspection.summary()
+
+
+def test_instrument_restores(tmp_path: Path):
+    """The classes and the parser are unchanged after the inspection"""
+    jpath = document(tmp_path)
+    expected = convert(jpath)
+
+    abstracts = vars(JatsArticle)["abstracts"]
+    as_dict = vars(Person)["as_dict"]
+
+    with FieldProfiler().instrument():
+        assert vars(JatsArticle)["abstracts"] is not abstracts
+        assert convert(jpath) == expected
+
+    assert vars(JatsArticle)["abstracts"] is abstracts
+    assert vars(Person)["as_dict"] is as_dict
+    assert type(etree.fromstring("<a/>")) is etree._Element
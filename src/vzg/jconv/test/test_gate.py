@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import copy
+from pathlib import Path
+from vzg.jconv.bench import Report
+from vzg.jconv.bench.adversarial import WORST_CASES
+from vzg.jconv.bench.corpus import CorpusSpec
+from vzg.jconv.bench.gate import GateResult, best_of, check_worst_cases, compare
+from vzg.jconv.bench.gate import run_gate_benchmarks
+
+SPECS = (
+    CorpusSpec("jats", "springer", documents=3, seed=1, mathml=0.2, scripts=0.1),
+    CorpusSpec("oai", "cairn", documents=4, seed=2, records=2),
+)
+
+
+def report(docs_per_s: float = 100.0, peak_rss: int = 1000, digest: str = "a"):
+    rep = Report(meta={"corpora": {"jats-springer": "x"}})
+    rep.results["jats-springer/converter"] = {
+        "documents": 10,
+        "articles": 20,
+        "invalid": 0,
+        "docs_per_s": docs_per_s,
+        "stages": {"parse": {"mean": 0.001}, "extract": {"mean": 0.002}},
+        "peak_rss": peak_rss,
+        "digest": digest,
+    }
+
+    return rep
+
+
+def test_compare():
+    """Regressions beyond the tolerances fail the gate"""
+    baseline = report()
+
+    assert compare(baseline, report(docs_per_s=95.0)).passed
+    assert compare(baseline, report(peak_rss=1050)).passed
+
+    result = compare(baseline, report(docs_per_s=80.0))
+    assert not result.passed
+    assert "throughput" in result.failures[0]
+    assert any(line.strip().startswith("parse") for line in result.lines)
+
+    assert not compare(baseline, report(peak_rss=2000)).passed
+    assert not compare(baseline, report(digest="b")).passed
+    assert compare(baseline, report(docs_per_s=80.0), throughput_tolerance=0.25).passed
+
+    other = report()
+    other.meta["corpora"] = {"jats-springer": "y"}
+    assert not compare(baseline, other).passed
+
+    empty = Report(meta=copy.deepcopy(baseline.meta))
+    assert not compare(baseline, empty).passed
+
+
+def test_best_of():
+    """The fastest round counts, the peak memory is the maximum"""
+    best = best_of([report(docs_per_s=90.0, peak_rss=3), report(peak_rss=2)])
+    result = best.results["jats-springer/converter"]
+
+    assert result["docs_per_s"] == 100.0
+    assert result["peak_rss"] == 3
+
+
+def test_gate_benchmarks(tmp_path: Path):
+    """The fixed corpora give the same data in every run"""
+    targets = ["converter", "archive"]
+
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+
+    first = run_gate_benchmarks(tmp_path / "a", SPECS, targets=targets, rounds=1)
+    second = run_gate_benchmarks(tmp_path / "b", SPECS, targets=targets, rounds=2)
+
+    assert list(first.meta["corpora"]) == ["jats-springer", "oai-cairn"]
+    assert first.meta["corpora"] == second.meta["corpora"]
+
+    for name in ("jats-springer", "oai-cairn"):
+        converter = first.results[f"{name}/converter"]
+        archive = first.results[f"{name}/archive"]
+
+        assert converter["digest"] == archive["digest"]
+        assert converter["articles"] > 0
+
+    result = compare(first, second, throughput_tolerance=1.0, memory_tolerance=1.0)
+    assert result.passed, result.failures
+
+
+def test_worst_cases(tmp_path: Path):
+    """Worst cases beyond the seconds fail the gate"""
+    cases = WORST_CASES[:1]
+
+    result = GateResult()
+    check_worst_cases(result, tmp_path, max_seconds=60.0, cases=cases)
+    assert result.passed, result.failures
+
+    result = GateResult()
+    check_worst_cases(result, tmp_path, max_seconds=1e-9, cases=cases)
+    assert len(result.failures) == 1
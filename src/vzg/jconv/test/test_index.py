@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+from pathlib import Path
+from vzg.jconv.index import ArticleIndex
+
+ARTICLE = {
+    "primary_id": {"type": "SPRINGER", "id": "s10551-020-01-e"},
+    "other_ids": [{"type": "doi", "id": "10.1007/S10551-020-01"}],
+}
+
+
+def test_index(tmp_path: Path):
+    """DOIs and primary ids across deliveries"""
+    index = ArticleIndex(tmp_path / "index.db", batch_size=2)
+
+    for delivery in ("first", "second"):
+        index.add(json.dumps(ARTICLE), delivery, f"{delivery}.zip#0.json")
+
+    index.close()
+
+    index = ArticleIndex(tmp_path / "index.db")
+
+    entries = index.lookup("10.1007/s10551-020-01")
+    assert [entry["delivery"] for entry in entries] == ["first", "second"]
+    assert entries[0]["location"] == "first.zip#0.json"
+    assert entries[0]["hash"] == entries[1]["hash"]
+
+    assert index.lookup("10.1007/S10551-020-01") == entries
+    assert index.lookup("s10551-020-01-e")[0]["type"] == "SPRINGER"
+    assert index.lookup("unknown") == []
+
+    index.close()
@@ -10,6 +10,7 @@
 """
 
 import sys
+import tempfile
 import unittest
 import logging
 from pathlib import Path
@@ -120,6 +121,56 @@ class AricleConverter(unittest.TestCase):
             self.assertIsInstance(article, JatsArticle, "article")
 
 
+SHARED_ARTICLE = """<article xml:lang="en">
+  <front>
+    <journal-meta>
+      <publisher><publisher-name>Springer</publisher-name></publisher>
+    </journal-meta>
+    <article-meta>
+      <article-id pub-id-type="doi">10.1007/s1</article-id>
+      <title-group><article-title>Shared title</article-title></title-group>
+      <pub-date publication-format="electronic" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+      <pub-date publication-format="print" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+    </article-meta>
+  </front>
+</article>
+"""
+
+
+class SharedExtraction(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.fpath = Path(self.tmpdir.name) / "article.xml"
+        self.fpath.write_text(SHARED_ARTICLE)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test01_shared(self):
+        jconv = JatsConverter(self.fpath)
+        jconv.run()
+
+        epub, ppub = jconv.articles
+
+        self.assertIs(epub.shared, ppub.shared, "shared")
+        self.assertEqual(epub.title, "Shared title", "title")
+        self.assertEqual(ppub.title, "Shared title", "title")
+        self.assertNotEqual(epub.primary_id["id"], ppub.primary_id["id"], "id")
+
+    def test02_copies(self):
+        jconv = JatsConverter(self.fpath)
+        jconv.run()
+
+        epub, ppub = jconv.articles
+        epub.other_ids[0]["id"] = "changed"
+
+        self.assertEqual(ppub.other_ids[0]["id"], "10.1007/s1", "copy")
+
+
 # if __name__ == "__main__":
 #     suite = unittest.TestSuite()
 #     suite.addTest(unittest.makeSuite(AricleConverter))
@@ -14,7 +14,7 @@ import unittest
 import json
 from lxml import etree
 from pathlib import Path
-from vzg.jconv.journal import JatsJournal
+from vzg.jconv.journal import JOURNAL_META_CACHE, JatsJournal
 from vzg.jconv.converter.jats import JatsArticle
 from vzg.jconv.gapi import JATS_SPRINGER_PUBTYPE, PUBTYPE_SOURCES
 from vzg.jconv.utils.date import JatsDate
@@ -135,3 +135,56 @@ class TestClassDeGruyter(unittest.TestCase):
             self.testdata["journal"]["publisher"],
             "publisher",
         )
+
+
+JOURNAL_META = """<article>
+  <front>
+    <journal-meta>
+      <journal-id journal-id-type="publisher-id">10551</journal-id>
+      <journal-title-group>
+        <journal-title>Journal of Business Ethics</journal-title>
+      </journal-title-group>
+      <issn pub-type="ppub">0167-4544</issn>
+      <issn pub-type="epub">1573-0697</issn>
+      <publisher>
+        <publisher-name>Springer</publisher-name>
+      </publisher>
+    </journal-meta>
+    <article-meta>
+      <volume>{volume}</volume>
+      <pub-date date-type="ppub"><year>2025</year></pub-date>
+    </article-meta>
+  </front>
+</article>
+"""
+
+
+class TestClassJournalCache(unittest.TestCase):
+    def setUp(self) -> None:
+        JOURNAL_META_CACHE.clear()
+
+    def journal(self, volume: int) -> JatsJournal:
+        dom = etree.fromstring(JOURNAL_META.format(volume=volume)).getroottree()
+        article = JatsArticle(
+            dom, JATS_SPRINGER_PUBTYPE.print, pubtype_source=PUBTYPE_SOURCES.basic
+        )
+
+        return JatsJournal(article)
+
+    def test01_cache(self):
+        first = self.journal(1).as_dict()
+        second = self.journal(2).as_dict()
+
+        self.assertEqual(JOURNAL_META_CACHE.misses, 1, "misses")
+        self.assertEqual(JOURNAL_META_CACHE.hits, 1, "hits")
+
+        self.assertEqual(first["title"], "Journal of Business Ethics", "title")
+        self.assertEqual(first["journal_ids"], second["journal_ids"], "ids")
+        self.assertEqual(second["publisher"], {"name": "Springer"}, "publisher")
+        self.assertEqual((first["volume"], second["volume"]), ("1", "2"), "volume")
+
+    def test02_copies(self):
+        journal = self.journal(1)
+        journal.ids[0]["id"] = "changed"
+
+        self.assertNotEqual(self.journal(1).ids[0]["id"], "changed", "copy")
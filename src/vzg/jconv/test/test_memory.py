@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import gc
+import logging
+from lxml import etree
+from pathlib import Path
+from vzg.jconv.archives.springer import ArchiveSpringer
+from vzg.jconv.converter.jats import JatsArticle, JatsConverter
+from vzg.jconv.converter.snapshot import ArticleSnapshot
+from vzg.jconv.gapi import JATS_SPRINGER_PUBTYPE, PUBTYPE_SOURCES
+from vzg.jconv.tools import simple_conv
+from vzg.jconv.tools.simple_conv import convert, create_parser
+
+JATS = """<article xml:lang="en">
+  <front>
+    <journal-meta>
+      <publisher><publisher-name>Springer</publisher-name></publisher>
+    </journal-meta>
+    <article-meta>
+      <article-id pub-id-type="doi">10.1007/s{num}</article-id>
+      <title-group><article-title>Title {num}</article-title></title-group>
+      <pub-date publication-format="electronic" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+      <pub-date publication-format="print" date-type="pub">
+        <year>2025</year>
+      </pub-date>
+      <abstract xml:lang="en">{paras}</abstract>
+    </article-meta>
+  </front>
+</article>
+"""
+
+
+def delivery(path: Path, num: int) -> Path:
+    """Directory with num JATS documents"""
+    paras = "".join(f"<p>Paragraph {num} of the abstract.</p>" for num in range(100))
+
+    path.mkdir()
+
+    for i in range(num):
+        (path / f"{i:03}.xml").write_text(JATS.format(num=i, paras=paras))
+
+    return path
+
+
+def peak_documents(dpath: Path) -> int:
+    """Peak number of documents alive while converting a delivery
+
+    The trees of lxml are not visible for tracemalloc,
+    so the converters and articles holding them are counted.
+    """
+    options = create_parser().parse_args(["jats", "--dry-run", str(dpath)])
+    archive = ArchiveSpringer(dpath)
+    alive = []
+
+    def describe(conv, i, num):
+        holders = [
+            obj
+            for obj in gc.get_objects()
+            if isinstance(obj, (JatsConverter, JatsArticle))
+        ]
+        alive.append(len({id(getattr(obj, "dom", None)) for obj in holders}))
+        return conv.name
+
+    # describe is only called for the debug messages
+    logger = logging.getLogger("vzg.jconv.tools.simple_conv")
+    level = logger.level
+    logger.setLevel(logging.DEBUG)
+
+    gc.collect()
+    gc.disable()
+
+    try:
+        convert(options, archive, "delivery", describe)
+    finally:
+        gc.enable()
+        logger.setLevel(level)
+
+    return max(alive)
+
+
+def test_bounded_memory(tmp_path: Path):
+    """The documents are released without the cyclic garbage collector"""
+    few = peak_documents(delivery(tmp_path / "few", 3))
+    many = peak_documents(delivery(tmp_path / "many", 30))
+
+    assert many == few
+
+
+def test_dry_run(tmp_path: Path, monkeypatch):
+    """The articles are not serialized in a dry run"""
+    dpath = delivery(tmp_path / "delivery", 3)
+
+    def materialize(conv):
+        raise AssertionError(conv.name)
+
+    monkeypatch.setattr(simple_conv, "materialize", materialize)
+
+    options = create_parser().parse_args(["jats", "--dry-run", str(dpath)])
+    describe = lambda conv, i, num: conv.name
+
+    assert convert(options, ArchiveSpringer(dpath), "delivery", describe)
+
+
+def test_journal_without_article():
+    """The journal does not keep its article alive and does not need it"""
+    dom = etree.ElementTree(etree.fromstring(JATS.format(num=1, paras="")))
+    article = JatsArticle(
+        dom,
+        JATS_SPRINGER_PUBTYPE.electronic,
+        pubtype_source=PUBTYPE_SOURCES.springer,
+    )
+    journal = article._journal
+
+    del article
+    gc.collect()
+
+    assert journal.as_dict()["year"] == "2025"
+
+
+def test_snapshot():
+    """"""
+    article = ArticleSnapshot('{"title": "Title", "primary_id": {"id": "1"}}')
+
+    assert article.title == "Title"
+    assert article.primary_id == {"id": "1"}
+    assert article.lang_code == []
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import pytest
+from pathlib import Path
+from vzg.jconv import stats
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.metrics import create_exporter, render
+from vzg.jconv.stats import Stats, collect
+from vzg.jconv.tools.simple_conv import create_parser
+
+
+def samples(text: str) -> dict:
+    """The samples of the text format by name and labels"""
+    values = {}
+
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+
+        name, value = line.rsplit(" ", 1)
+        values[name] = float(value)
+
+    return values
+
+
+def test_render():
+    """Counters, errors by exception type and cumulative histograms"""
+    runstats = Stats(buckets=(0.001, 0.1))
+
+    with collect(runstats):
+        stats.count("documents", 3)
+        stats.event("problem", "XMLSyntaxError", "broken.xml")
+        stats.event("missing", "copyright", "a.xml")
+
+    runstats.observe("parse", 0.0005)
+    runstats.observe("parse", 0.05)
+    runstats.observe("parse", 5.0)
+
+    text = render(runstats, labels={"command": "jats", "publisher": 'a "b"'})
+    values = samples(text)
+
+    labels = 'command="jats",publisher="a \\"b\\""'
+
+    assert "# TYPE jconv_documents_total counter" in text
+    assert values[f"jconv_documents_total{{{labels}}}"] == 3
+    assert (
+        values[f'jconv_conversion_errors_total{{{labels},exception="XMLSyntaxError"}}']
+        == 1
+    )
+    assert "copyright" not in text
+
+    bucket = f'jconv_stage_duration_seconds_bucket{{{labels},stage="parse"'
+    assert values[f'{bucket},le="0.001"}}'] == 1
+    assert values[f'{bucket},le="0.1"}}'] == 2
+    assert values[f'{bucket},le="+Inf"}}'] == 3
+    assert values[f'jconv_stage_duration_seconds_count{{{labels},stage="parse"}}'] == 3
+
+    # Without buckets no histograms
+    assert "histogram" not in render(Stats())
+
+
+def test_metrics_option(tmp_path: Path):
+    """simple-conv writes the textfile at the end of the run"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    spec = CorpusSpec("jats", "springer", documents=3, seed=1)
+    for name, data in CorpusGenerator(spec).members():
+        (dpath / name).write_bytes(data)
+
+    (dpath / "broken.xml").write_text("<article>")
+
+    mpath = tmp_path / "metrics" / "jconv.prom"
+    args = ["jats", "-o", str(tmp_path / "output"), "-f", "jsonl", "-p", "Springer"]
+    args += ["--metrics", str(mpath), str(dpath)]
+
+    options = create_parser().parse_args(args)
+    options.func(options)
+
+    values = samples(mpath.read_text())
+    labels = 'command="jats",publisher="Springer"'
+
+    assert values[f"jconv_documents_total{{{labels}}}"] == 3
+    assert values[f"jconv_articles_total{{{labels}}}"] == 6
+    assert values[f"jconv_bytes_in_total{{{labels}}}"] > 0
+    assert values[f"jconv_bytes_out_total{{{labels}}}"] > 0
+    assert values[f"jconv_failed_documents_total{{{labels}}}"] == 1
+    assert (
+        values[f'jconv_conversion_errors_total{{{labels},exception="XMLSyntaxError"}}']
+        == 1
+    )
+    assert values[f'jconv_stage_duration_seconds_count{{{labels},stage="write"}}'] == 6
+    assert list(mpath.parent.iterdir()) == [mpath]
+
+
+def test_metrics_labels(tmp_path: Path):
+    """Without a publisher option the publisher is unknown"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    spec = CorpusSpec("jats", "springer", documents=1, seed=1)
+    for name, data in CorpusGenerator(spec).members():
+        (dpath / name).write_bytes(data)
+
+    mpath = tmp_path / "jconv.prom"
+    args = ["jats", "-o", str(tmp_path / "output"), "-f", "jsonl"]
+    args += ["--metrics", str(mpath), str(dpath)]
+
+    options = create_parser().parse_args(args)
+    options.func(options)
+
+    values = samples(mpath.read_text())
+    assert values['jconv_documents_total{command="jats",publisher="unknown"}'] == 1
+
+    # The node exporter ignores other textfiles
+    options.metrics = str(tmp_path / "jconv.txt")
+
+    with pytest.raises(ValueError):
+        create_exporter(options, Stats())
@@ -11,12 +11,14 @@
 
 import json
 import unittest
+from lxml import etree
 from pathlib import Path
 from zope.interface import providedBy
-from vzg.jconv.archives.oai import ArchiveOAIDC
+from vzg.jconv.archives.oai import ArchiveOAIDC, Header, Metadata
 from vzg.jconv.converter.oai import OAIArticle_Openedition, OAIArticle_Cairn
 from vzg.jconv.interfaces import IArticle
-from vzg.jconv.gapi import OAI_ARTICLES_TYPES
+from vzg.jconv.gapi import NAMESPACES, OAI_ARTICLES_TYPES, OAI_DC_RECORD_XPATHS
+from vzg.jconv.journal import parse_cairn_source
 
 
 class Cairn(unittest.TestCase):
@@ -208,3 +210,88 @@ class OpeneditionValidate(unittest.TestCase):
     def test_title(self):
         """"""
         self.assertEqual(self.article.title, self.testdata["title"], "title")
+
+
+CAIRN_RECORD = b"""<record xmlns="http://www.openarchives.org/OAI/2.0/">
+  <header>
+    <identifier>oai:cairn.info:REV_012_0011</identifier>
+    <datestamp>2024-01-23T10:59:52Z</datestamp>
+  </header>
+  <metadata>
+    <oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/"
+               xmlns:dc="http://purl.org/dc/elements/1.1/"
+               xmlns:dcterms="http://purl.org/dc/terms/">
+      <dc:title>Un titre</dc:title>
+      <dc:creator>Dupont, Marie</dc:creator>
+      <dc:creator>Martin, Paul</dc:creator>
+      <dc:subject>histoire / politique</dc:subject>
+      <dc:description xml:lang="fr">Un r\xc3\xa9sum\xc3\xa9</dc:description>
+      <dc:description>Without language</dc:description>
+      <dc:date>2023-12-01</dc:date>
+      <dc:identifier>https://shs.cairn.info/revue-012-page-11</dc:identifier>
+      <dc:identifier>https://doi.org/10.3917/rev.012.0011</dc:identifier>
+      <dc:source>Revue | 2023/4 | 12 | 2023-12-01 | p. 11-34 | 1234-5678</dc:source>
+      <dc:language>fr</dc:language>
+      <dc:rights>CC BY</dc:rights>
+      <dcterms:accessRights>free access</dcterms:accessRights>
+    </oai_dc:dc>
+  </metadata>
+</record>"""
+
+
+class Decoder(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dom = etree.fromstring(CAIRN_RECORD)
+        self.header = Header(self.dom)
+        self.record = Metadata(self.dom, OAI_DC_RECORD_XPATHS)
+
+    def test_fields(self):
+        """Single walk decoding equals the XPath results"""
+        for name, (rtype, xstm) in OAI_DC_RECORD_XPATHS.items():
+            expected = self.dom.xpath(xstm, namespaces=NAMESPACES)
+
+            self.assertEqual(list(self.record.getField(name)), expected, name)
+
+        self.assertIsNone(self.record.getField("unknown"), "unknown field")
+
+        with self.assertRaises(TypeError):
+            self.record.fields["title"] = ("other",)
+
+    def test_article(self):
+        """"""
+        article = OAIArticle_Cairn(self.header, self.record)
+        jdict = article.jdict
+
+        self.assertEqual(jdict["title"], "Un titre", "title")
+        self.assertEqual(len(jdict["persons"]), 2, "persons")
+        self.assertEqual(
+            jdict["subject_terms"],
+            [
+                {
+                    "lang_code": "fre",
+                    "scheme": "OpenEdition",
+                    "terms": ["histoire", "politique"],
+                }
+            ],
+            "subject_terms",
+        )
+        self.assertEqual(jdict["journal"]["journal_ids"][0]["id"], "1234-5678")
+        self.assertEqual(jdict["journal"]["start_page"], "11", "start_page")
+        self.assertEqual(jdict["journal"]["year"], "2023", "year")
+        self.assertEqual(jdict["urls"][0]["access_info"], "LF", "urls")
+
+    def test_cairn_source(self):
+        """Parse each Cairn source only once"""
+        source = self.record.getField("source")[0]
+
+        parse_cairn_source.cache_clear()
+
+        for i in range(3):
+            OAIArticle_Cairn(self.header, self.record).journal
+
+        info = parse_cairn_source.cache_info()
+        self.assertEqual(info.misses, 1, "misses")
+        self.assertEqual(info.hits, 2, "hits")
+
+        with self.assertRaises(TypeError):
+            parse_cairn_source(source + " | extra")
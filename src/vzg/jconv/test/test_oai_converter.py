@@ -10,12 +10,18 @@
 """
 
 import datetime
+import pytest
 import unittest
+import zipfile
 from pathlib import Path
 from zope.interface import providedBy
+from vzg.jconv.archives import oai
 from vzg.jconv.archives.oai import ArchiveOAIDC
-from vzg.jconv.converter.oai import OAIDCConverter
+from vzg.jconv.archives.watermark import Watermark
+from vzg.jconv.converter.oai import OAIDCConverter, OAITombstone
+from vzg.jconv.gapi import OAI_ARTICLES_TYPES
 from vzg.jconv.interfaces import IConverter
+from vzg.jconv.tools.simple_conv import document_name
 
 
 class TestOAIDC(unittest.TestCase):
@@ -33,3 +39,172 @@ class TestOAIDC(unittest.TestCase):
             self.assertIsInstance(conv, OAIDCConverter, "Konverter")
 
             conv.run()
+
+
+LISTRECORDS = """<?xml version="1.0" encoding="UTF-8"?>
+<OAI-PMH xmlns="http://www.openarchives.org/OAI/2.0/">
+  <responseDate>2024-01-23T10:59:52Z</responseDate>
+  <request verb="ListRecords">https://oai.example.org</request>
+  <ListRecords>{records}</ListRecords>
+</OAI-PMH>
+"""
+
+RECORD = """
+    <record>
+      <header>
+        <identifier>oai:example.org:{num}</identifier>
+        <datestamp>2024-01-{day:02}T10:00:00Z</datestamp>
+        <setSpec>journals</setSpec>
+      </header>
+      <metadata>
+        <oai_dc:dc xmlns:oai_dc="http://www.openarchives.org/OAI/2.0/oai_dc/"
+                   xmlns:dc="http://purl.org/dc/elements/1.1/">
+          <dc:title>Title {num}</dc:title>
+          <dc:identifier>https://doi.org/10.1234/example.{num}</dc:identifier>
+          <dc:type>article</dc:type>
+        </oai_dc:dc>
+      </metadata>
+    </record>"""
+
+# Deleted records have a status in their header and no metadata
+DELETED = """
+    <record>
+      <header status="deleted">
+        <identifier>oai:example.org:{num}</identifier>
+        <datestamp>2024-01-{day:02}T10:00:00Z</datestamp>
+        <setSpec>journals</setSpec>
+      </header>
+    </record>"""
+
+
+@pytest.fixture
+def listrecords_archive(tmp_path) -> Path:
+    archive = tmp_path / "listrecords.zip"
+
+    with zipfile.ZipFile(archive, "w") as zfh:
+        for page in range(2):
+            records = "".join(
+                RECORD.format(num=page * 3 + num, day=num + 1) for num in range(3)
+            )
+            zfh.writestr(f"page-{page}.xml", LISTRECORDS.format(records=records))
+
+    return archive
+
+
+def test_listrecords(listrecords_archive: Path):
+    """Stream the records of ListRecords responses"""
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True)
+
+    assert archive.num_files == 2
+
+    identifiers = []
+
+    for num, conv in enumerate(archive.converters):
+        assert isinstance(conv, OAIDCConverter)
+        assert conv.name == f"page-{num // 3}.xml"
+        assert conv.header.datestamp.date() == datetime.date(2024, 1, num % 3 + 1)
+        assert conv.record.getField("title") == (f"Title {num}",)
+
+        identifiers.append(conv.header.identifier)
+        assert document_name(conv) == conv.header.identifier
+
+    assert identifiers == [f"oai:example.org:{num}" for num in range(6)]
+
+
+def test_watermark(listrecords_archive: Path, tmp_path: Path):
+    """Skip records below the watermark"""
+    wpath = tmp_path / "watermark.json"
+
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+
+    assert len([conv.header.identifier for conv in archive.converters]) == 6
+
+    watermark.save()
+
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+
+    assert watermark.datestamp.day == 3
+    assert len(watermark.identifiers) == 2
+    assert [conv.header.identifier for conv in archive.converters] == []
+
+    # Another source set starts from scratch
+    watermark = Watermark(wpath, "other")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+
+    assert len([conv.header.identifier for conv in archive.converters]) == 6
+
+    # A new record with the same datestamp and a newer deleted record
+    records = RECORD.format(num=6, day=3)
+    records += DELETED.format(num=7, day=4)
+
+    with zipfile.ZipFile(listrecords_archive, "w") as zfh:
+        zfh.writestr("page-2.xml", LISTRECORDS.format(records=records))
+
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(
+        listrecords_archive,
+        converter_kwargs={"article_type": OAI_ARTICLES_TYPES.openedition},
+        listrecords=True,
+        watermark=watermark,
+    )
+
+    converters = []
+    for conv in archive.converters:
+        conv.run()
+        converters.append(conv)
+
+    assert [conv.header.identifier for conv in converters] == [
+        "oai:example.org:6",
+        "oai:example.org:7",
+    ]
+
+    tombstone = converters[1].articles[0]
+    assert isinstance(tombstone, OAITombstone)
+    assert tombstone.jdict == {
+        "deleted": True,
+        "datestamp": "2024-01-04T10:00:00+00:00",
+        "primary_id": {"type": "oai_id", "id": "oai:example.org:7"},
+    }
+
+
+def test_watermark_converted(listrecords_archive: Path, tmp_path: Path, monkeypatch):
+    """Only written records are added to the watermark"""
+    wpath = tmp_path / "watermark.json"
+
+    def converter(header, record, **kwargs):
+        if header.identifier == "oai:example.org:1":
+            raise ValueError(header.identifier)
+
+        return OAIDCConverter(header, record, **kwargs)
+
+    monkeypatch.setattr(oai, "OAIDCConverter", converter)
+
+    # An interrupted run does not pass its last record
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+    converters = archive.converters
+
+    assert next(converters).header.identifier == "oai:example.org:0"
+    converters.close()
+
+    watermark.save()
+    assert not wpath.exists()
+
+    # The failed record of the second day is converted again
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+
+    assert len(list(archive.converters)) == 5
+
+    watermark.save()
+    watermark = Watermark(wpath, "journals")
+    archive = ArchiveOAIDC(listrecords_archive, listrecords=True, watermark=watermark)
+
+    assert watermark.datestamp.day == 2
+    assert [conv.header.identifier for conv in archive.converters] == [
+        "oai:example.org:2",
+        "oai:example.org:4",
+        "oai:example.org:5",
+    ]
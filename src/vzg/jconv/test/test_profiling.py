@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import cProfile
+import os
+import pstats
+import time
+from pathlib import Path
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.profiling import collapsed_stacks, output_path
+from vzg.jconv.tools.simple_conv import create_parser
+
+
+def inner():
+    time.sleep(0.01)
+
+
+def outer():
+    inner()
+    time.sleep(0.005)
+
+
+def test_collapsed_stacks():
+    """The time of a function is on the stack of its callers"""
+    profiler = cProfile.Profile()
+    profiler.runcall(outer)
+
+    stacks = collapsed_stacks(pstats.Stats(profiler))
+    sleeps = {
+        tuple(frame.split(":")[-1] for frame in stack.split(";")[:-1]): micros
+        for stack, micros in stacks.items()
+        if stack.endswith("time.sleep>")
+    }
+
+    assert sleeps[("outer", "inner")] >= 10000
+    assert sleeps[("outer",)] >= 5000
+    assert sleeps[("outer", "inner")] > sleeps[("outer",)]
+
+
+def test_output_path():
+    """Every process gets its own file"""
+    assert output_path("prof-{pid}.txt").name == f"prof-{os.getpid()}.txt"
+    assert output_path("prof.txt").is_absolute()
+
+
+def test_profile_options(tmp_path: Path):
+    """simple-conv writes the profile and the tracemalloc snapshots"""
+    spec = CorpusSpec("jats", "springer", documents=5, seed=1)
+    zpath = CorpusGenerator(spec).write(tmp_path / "delivery.zip").path
+
+    ppath = tmp_path / "profile.pstats"
+    mpath = tmp_path / "tracemalloc.txt"
+
+    args = ["jats", "-o", str(tmp_path / "output"), "-f", "jsonl"]
+    args += ["--profile", str(ppath), "--profile-every", "2"]
+    args += ["--tracemalloc", str(mpath), "--tracemalloc-every", "2", str(zpath)]
+
+    options = create_parser().parse_args(args)
+    options.func(options)
+
+    # Documents 0, 2 and 4 are profiled
+    calls = [
+        nc
+        for (filename, lineno, name), (cc, nc, tt, ct, callers) in pstats.Stats(
+            str(ppath)
+        ).stats.items()
+        if name == "run" and filename.endswith("jats.py")
+    ]
+    assert calls == [3]
+
+    headers = [line for line in mpath.read_text().splitlines() if line[:1] == "#"]
+    assert [header.split(",")[0] for header in headers] == [
+        "# 2 documents",
+        "# 4 documents",
+        "# 5 documents",
+    ]
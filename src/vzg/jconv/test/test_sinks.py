@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import gzip
+import json
+import zipfile
+from pathlib import Path
+import pytest
+from zope.interface import providedBy
+from vzg.jconv.interfaces import ISink
+from vzg.jconv.sinks.files import DirectorySink
+from vzg.jconv.sinks.jsonl import STDOUT, JsonLinesSink
+from vzg.jconv.sinks.sharded import MANIFEST_NAME, SHARD_KEYS, ShardedSink
+from vzg.jconv.sinks.ziparchive import COMPRESSION_METHODS, ZipSink
+
+ARTICLES = [json.dumps({"title": f"Article {num}"}) for num in range(5)]
+
+
+def read_lines(fpath: Path) -> list:
+    opener = gzip.open if fpath.suffix == ".gz" else open
+
+    with opener(fpath, "rt") as fh:
+        return [json.loads(line) for line in fh]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "bz2", "lzma"])
+def test_jsonl(tmp_path: Path, compression):
+    """All articles in one file"""
+    with JsonLinesSink(tmp_path / "articles.jsonl", compression=compression) as sink:
+        assert ISink in providedBy(sink)
+
+        for num, data in enumerate(ARTICLES):
+            location = sink.write(f"{num}.json", data)
+
+    assert len(sink.paths) == 1
+    assert location == f"{sink.paths[0]}#5"
+
+    if compression in (None, "gzip"):
+        assert read_lines(Path(sink.paths[0])) == [json.loads(a) for a in ARTICLES]
+
+
+def test_jsonl_rotate(tmp_path: Path):
+    """New files after a number of records or bytes"""
+    with JsonLinesSink(
+        tmp_path / "articles.jsonl", compression="gzip", max_records=2
+    ) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    assert [Path(fname).name for fname in sink.paths] == [
+        "articles-00001.jsonl.gz",
+        "articles-00002.jsonl.gz",
+        "articles-00003.jsonl.gz",
+    ]
+    assert [len(read_lines(Path(fname))) for fname in sink.paths] == [2, 2, 1]
+
+    with JsonLinesSink(tmp_path / "bytes.jsonl", max_bytes=1) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    assert len(sink.paths) == len(ARTICLES)
+
+
+def test_jsonl_stdout(capsysbinary):
+    """"""
+    with JsonLinesSink(STDOUT) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    lines = capsysbinary.readouterr().out.splitlines()
+
+    assert [json.loads(line) for line in lines] == [json.loads(a) for a in ARTICLES]
+
+
+def test_files(tmp_path: Path):
+    """"""
+    with DirectorySink(tmp_path / "output") as sink:
+        location = sink.write("0.json", ARTICLES[0])
+
+    assert json.loads(Path(location).read_text()) == json.loads(ARTICLES[0])
+
+    with ZipSink(tmp_path / "articles.zip") as sink:
+        location = sink.write("0.json", ARTICLES[0])
+
+    assert location.endswith("articles.zip#0.json")
+
+    with zipfile.ZipFile(tmp_path / "articles.zip") as zfh:
+        assert zfh.namelist() == ["0.json"]
+
+
+@pytest.mark.parametrize("method", ["stored", "deflated", "bzip2", "lzma"])
+def test_zip_methods(tmp_path: Path, method):
+    """Members are written by the writer thread"""
+    zpath = tmp_path / "articles.zip"
+
+    with ZipSink(zpath, method=method, compresslevel=1, max_pending=2) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    with zipfile.ZipFile(zpath) as zfh:
+        assert zfh.namelist() == [f"{num}.json" for num in range(len(ARTICLES))]
+        assert {zinfo.compress_type for zinfo in zfh.infolist()} == {
+            COMPRESSION_METHODS[method]
+        }
+        assert zfh.read("4.json").decode() == ARTICLES[4]
+
+
+def test_zip_error(tmp_path: Path):
+    """Errors of the writer thread are raised"""
+    sink = ZipSink(tmp_path / "articles.zip")
+    sink.write("0.json", ARTICLES[0])
+    sink.write("0.json", object())
+
+    with pytest.raises(OSError):
+        sink.close()
+
+
+def test_shards(tmp_path: Path):
+    """Shards of similar size with a manifest"""
+    with ShardedSink(tmp_path / "out", lambda path: ZipSink(path.with_suffix(".zip")), max_records=2) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    manifest = json.loads((tmp_path / "out" / MANIFEST_NAME).read_text())
+
+    assert manifest["records"] == len(ARTICLES)
+    assert manifest["bytes"] == sum(len(data) for data in ARTICLES)
+    assert [shard["records"] for shard in manifest["shards"]] == [2, 2, 1]
+    assert [shard["path"] for shard in manifest["shards"]] == [
+        "shard-00001.zip",
+        "shard-00002.zip",
+        "shard-00003.zip",
+    ]
+
+
+def test_shards_open(tmp_path: Path):
+    """Only the recently written partitions are open"""
+    articles = [
+        json.dumps({"primary_id": {"type": ptype, "id": str(num)}})
+        for num, ptype in enumerate(["a", "b", "c", "a", "b", "c", "a"])
+    ]
+
+    def factory(path: Path, positions: dict = None) -> ISink:
+        return ZipSink(path.with_suffix(".zip"), positions=positions)
+
+    with ShardedSink(
+        tmp_path, factory, key=SHARD_KEYS["publisher"], max_open=2
+    ) as sink:
+        for num, data in enumerate(articles):
+            sink.write(f"{num}.json", data)
+            assert len(sink.open) <= 2
+
+    for key, names in (("a", ["0", "3", "6"]), ("b", ["1", "4"]), ("c", ["2", "5"])):
+        with zipfile.ZipFile(tmp_path / f"{key}-00001.zip") as zfh:
+            assert zfh.namelist() == [f"{name}.json" for name in names]
+
+
+def test_shards_rotated(tmp_path: Path):
+    """The manifest lists the rotated files of a shard"""
+
+    def factory(path: Path, positions: dict = None) -> ISink:
+        return JsonLinesSink(
+            path.with_suffix(".jsonl"), max_records=2, positions=positions
+        )
+
+    with ShardedSink(tmp_path, factory, max_records=3) as sink:
+        for num, data in enumerate(ARTICLES):
+            sink.write(f"{num}.json", data)
+
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text())
+
+    assert [shard["paths"] for shard in manifest["shards"]] == [
+        ["shard-00001-00001.jsonl", "shard-00001-00002.jsonl"],
+        ["shard-00002-00001.jsonl"],
+    ]
+    assert manifest["shards"][0]["path"] == "shard-00001-00001.jsonl"
+
+
+def test_partitions(tmp_path: Path):
+    """Partitions by the type of the primary id"""
+    articles = [
+        json.dumps({"primary_id": {"type": ptype, "id": str(num)}})
+        for num, ptype in enumerate(["springer", "cairn", "springer"])
+    ]
+
+    with ShardedSink(
+        tmp_path, lambda path: DirectorySink(path), key=SHARD_KEYS["publisher"]
+    ) as sink:
+        for num, data in enumerate(articles):
+            sink.write(f"{num}.json", data)
+
+    assert {shard["key"]: shard["records"] for shard in sink.manifest["shards"]} == {
+        "springer": 2,
+        "cairn": 1,
+    }
+    assert sorted(path.name for path in (tmp_path / "springer-00001").iterdir()) == [
+        "0.json",
+        "2.json",
+    ]
+
+
+def test_issn_key():
+    """The print ISSN is preferred"""
+    issn_key = SHARD_KEYS["issn"]
+    pissn = {"type": "pissn", "id": "1234-567x"}
+    eissn = {"type": "eissn", "id": "8765-4321"}
+
+    assert issn_key({"journal": {"journal_ids": [eissn, pissn]}}) == "1234-567X"
+    assert issn_key({"journal": {"journal_ids": [pissn, eissn]}}) == "1234-567X"
+    assert issn_key({"journal": {"journal_ids": [eissn]}}) == "8765-4321"
+    assert issn_key({"journal": {"journal_ids": [{"type": "doi", "id": "x"}]}}) == (
+        "unknown"
+    )
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import logging
+import pytest
+import tarfile
+import zipfile
+from pathlib import Path
+from zope.interface import providedBy
+from vzg.jconv.archives import sources
+from vzg.jconv.archives.oai import ArchiveOAIDC
+from vzg.jconv.archives.sources import DirectorySource
+from vzg.jconv.archives.sources import GlobSource
+from vzg.jconv.archives.sources import TarSource
+from vzg.jconv.archives.sources import ZipSource
+from vzg.jconv.archives.sources import open_source
+from vzg.jconv.archives.sources import source_name
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.interfaces import ISource
+from vzg.jconv.tools.simple_conv import create_parser
+
+FILES = {
+    "a/one.xml": b"<one/>",
+    "a/b/two.xml": b"<two/>",
+    "three.xml": b"<three/>",
+}
+
+
+@pytest.fixture
+def delivery(tmp_path: Path) -> Path:
+    """An unpacked delivery"""
+    dpath = tmp_path / "delivery"
+
+    for name, data in FILES.items():
+        fpath = dpath / name
+        fpath.parent.mkdir(parents=True, exist_ok=True)
+        fpath.write_bytes(data)
+
+    return dpath
+
+
+@pytest.fixture(params=["zip", "tar.gz", "dir", "glob"])
+def source_location(request, tmp_path: Path, delivery: Path) -> tuple[str, type]:
+    if request.param == "zip":
+        location = tmp_path / "delivery.zip"
+        with zipfile.ZipFile(location, "w") as zfh:
+            for name, data in FILES.items():
+                zfh.writestr(name, data)
+        return location, ZipSource
+
+    if request.param == "tar.gz":
+        location = tmp_path / "delivery.tar.gz"
+        with tarfile.open(location, "w:gz") as tfh:
+            tfh.add(delivery, arcname=".")
+        return location, TarSource
+
+    if request.param == "dir":
+        return delivery, DirectorySource
+
+    return f"{delivery.as_posix()}/**/*.xml", GlobSource
+
+
+def test_sources(source_location):
+    """All sources provide the same files"""
+    location, source_cls = source_location
+
+    source = open_source(location)
+
+    assert isinstance(source, source_cls)
+    assert ISource in providedBy(source)
+    # Streamed tar files are not counted beforehand
+    assert source.num_files == (None if source_cls is TarSource else 3)
+
+    contents = {}
+
+    for member in source.members:
+        data = member.read()
+        assert member.size == len(data)
+
+        contents[member.name.split("delivery/")[-1].removeprefix("./")] = data
+
+    assert contents == FILES
+
+
+def test_missing(tmp_path: Path):
+    """"""
+    with pytest.raises(FileNotFoundError):
+        open_source(tmp_path / "missing.zip")
+
+    fpath = tmp_path / "plain.txt"
+    fpath.write_text("plain")
+
+    with pytest.raises(ValueError):
+        open_source(fpath)
+
+
+def test_source_name():
+    """"""
+    assert source_name("/data/delivery.zip") == "delivery"
+    assert source_name("/data/delivery.tar.gz") == "delivery"
+    assert source_name("/data/delivery") == "delivery"
+    assert source_name("/data/delivery/**/*.xml") == "delivery"
+    assert source_name("/data/records.mrc.gz") == "records"
+    assert source_name("/data/records.MRC") == "records"
+    assert source_name("/data/record.xml") == "record"
+    assert source_name("/data/v1.2.zip") == "v1.2"
+
+
+def test_oai_directory(tmp_path: Path):
+    """OAI records from a directory"""
+    from vzg.jconv.test.test_oai_converter import LISTRECORDS, RECORD
+
+    dpath = tmp_path / "oai"
+    dpath.mkdir()
+
+    for num in range(2):
+        records = RECORD.format(num=num, day=num + 1)
+        (dpath / f"{num}.xml").write_text(LISTRECORDS.format(records=records))
+
+    archive = ArchiveOAIDC(dpath)
+
+    assert archive.num_files == 2
+    assert [conv.header.identifier for conv in archive.converters] == [
+        "oai:example.org:0",
+        "oai:example.org:1",
+    ]
+
+
+def test_tar_single_pass(tmp_path: Path, monkeypatch, caplog):
+    """A tar file is read once, without counting its members"""
+    location = tmp_path / "delivery.tar.gz"
+
+    with tarfile.open(location, "w:gz") as tfh:
+        for name, data in CorpusGenerator(CorpusSpec("jats", "springer")).members():
+            fpath = tmp_path / name
+            fpath.write_bytes(data)
+            tfh.add(fpath, arcname=name)
+
+    streams = []
+    open_tar = tarfile.open
+
+    # tarfile.is_tarfile only reads the first header
+    def tar_open(*args, **kwargs):
+        if "r|*" in args:
+            streams.append(args)
+
+        return open_tar(*args, **kwargs)
+
+    monkeypatch.setattr(sources.tarfile, "open", tar_open)
+
+    opath = tmp_path / "output"
+    args = ["jats", "-o", str(opath), "-f", "jsonl", "--compression", "none"]
+    options = create_parser().parse_args(args + [str(location)])
+
+    with caplog.at_level(logging.DEBUG):
+        options.func(options)
+
+    assert len(streams) == 1
+    assert len((opath / "delivery.jsonl").read_text().splitlines()) > 0
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from vzg.jconv import stats
+from vzg.jconv.bench.corpus import CorpusGenerator, CorpusSpec
+from vzg.jconv.converter.jats import JatsConverter
+from vzg.jconv.journal import JOURNAL_META_CACHE
+from vzg.jconv.stats import Progress, Stats, collect
+from vzg.jconv.test.test_memory import delivery
+from vzg.jconv.tools.simple_conv import create_parser
+
+
+def test_nested_timers():
+    """Nested stages are not part of the outer stage"""
+    runstats = Stats()
+
+    with collect(runstats):
+        with stats.timer("extract"):
+            time.sleep(0.01)
+
+            with stats.timer("validate"):
+                time.sleep(0.02)
+
+        stats.count("skipped")
+
+    assert 0.01 <= runstats.seconds["extract"] < 0.02
+    assert runstats.seconds["validate"] >= 0.02
+    assert runstats.calls["extract"] == 1
+    assert runstats.counters["skipped"] == 1
+
+    # Outside of collect nothing is recorded
+    with stats.timer("extract"):
+        stats.count("skipped")
+
+    assert runstats.calls["extract"] == 1
+    assert runstats.counters["skipped"] == 1
+
+
+def test_slowest():
+    """Only the slowest documents are kept"""
+    runstats = Stats(slowest=3)
+
+    for num in (5, 1, 7, 3, 9, 2):
+        runstats.document(f"{num}.xml", num, num / 10)
+
+    assert [entry["name"] for entry in runstats.documents] == [
+        "9.xml",
+        "7.xml",
+        "5.xml",
+    ]
+
+
+def test_progress(caplog):
+    """The progress is logged at most once per interval"""
+    runstats = Stats()
+    progress = Progress(runstats, total=100, interval=3600)
+
+    with caplog.at_level(logging.INFO, logger="vzg.jconv.stats"):
+        for num in range(1, 51):
+            runstats.count("documents")
+            progress.update(time.perf_counter(), num)
+
+        assert len(caplog.records) == 0
+
+        progress.report(time.perf_counter())
+        progress.report(time.perf_counter())
+
+        assert len(caplog.records) == 1
+        assert caplog.records[0].getMessage().startswith("50/100 documents (50.0%)")
+
+        progress.update(progress.next, 51)
+
+        assert len(caplog.records) == 2
+
+
+def test_stats_option(tmp_path: Path):
+    """simple-conv writes the stats of a run"""
+    dpath = tmp_path / "delivery"
+    dpath.mkdir()
+
+    spec = CorpusSpec("jats", "springer", documents=4, seed=1)
+    for name, data in CorpusGenerator(spec).members():
+        (dpath / name).write_bytes(data)
+
+    (dpath / "broken.xml").write_text("<article>")
+    (dpath / "book.xml").write_text("<book/>")
+
+    spath = tmp_path / "stats.json"
+    args = ["jats", "-o", str(tmp_path / "output"), "-f", "jsonl", "--validate"]
+    args += ["--stats", str(spath), "--slowest", "2", str(dpath)]
+
+    options = create_parser().parse_args(args)
+    options.func(options)
+
+    sdict = json.loads(spath.read_text())
+
+    assert sdict["counters"].pop("bytes") > 0
+    assert sdict["counters"].pop("bytes_in") > 0
+    assert sdict["counters"] == {
+        "documents": 5,
+        "articles": 8,
+        "skipped": 0,
+        "failed": 1,
+        "validation_failed": 0,
+        "empty": 1,
+    }
+    assert sdict["stages"]["validate"]["calls"] == 8
+    assert sdict["stages"]["read"]["calls"] == 0
+    assert len(sdict["slowest"]) == 2
+    assert sdict["seconds"] > 0
+
+    problems = [event for event in sdict["events"] if event["kind"] == "problem"]
+    assert problems == [
+        {
+            "kind": "problem",
+            "key": "XMLSyntaxError",
+            "count": 1,
+            "examples": ["broken.xml"],
+        }
+    ]
+
+
+def test_events(caplog):
+    """Events are counted and logged once per run"""
+    logger = logging.getLogger("vzg.jconv.test")
+    runstats = Stats()
+
+    with collect(runstats):
+        for name in ("a.xml", "b.xml", "c.xml", "d.xml", "a.xml"):
+            stats.event("missing", "copyright", name)
+
+        try:
+            raise ValueError("broken")
+        except ValueError:
+            with caplog.at_level(logging.INFO):
+                stats.problem(logger, "Konvertierungsproblem in e.xml", example="e.xml")
+
+    assert runstats.events[("missing", "copyright")] == [5, ["a.xml", "b.xml", "c.xml"]]
+    assert runstats.events[("problem", "ValueError")] == [1, ["e.xml"]]
+
+    # The single problem is not logged as error
+    assert caplog.records == []
+
+    with caplog.at_level(logging.INFO, logger="vzg.jconv.stats"):
+        runstats.log_events()
+
+    assert [(rec.levelno, rec.getMessage()) for rec in caplog.records] == [
+        (logging.INFO, "missing copyright: 5x, e.g. a.xml, b.xml, c.xml"),
+        (logging.ERROR, "problem ValueError: 1x, e.g. e.xml"),
+    ]
+    assert "events" in runstats.summary()
+
+
+def test_cached_journal_events(tmp_path: Path):
+    """Missing journal values are counted for cached journals too"""
+    dpath = delivery(tmp_path / "delivery", 2)
+    runstats = Stats()
+    JOURNAL_META_CACHE.clear()
+
+    with collect(runstats):
+        for fpath in sorted(dpath.iterdir()):
+            conv = JatsConverter(fpath)
+            conv.run()
+
+            for article in conv.articles:
+                article.json
+
+    # Two articles per document, the second document hits the cache
+    assert JOURNAL_META_CACHE.hits == 2
+    assert runstats.events[("missing", "journal.title")][0] == 4
+    assert runstats.events[("missing", "journal.publisher.place")][0] == 4
+    assert ("missing", "journal.publisher.name") not in runstats.events
+
+
+def test_problem_without_run(caplog):
+    """Without a run a problem is logged as error"""
+    logger = logging.getLogger("vzg.jconv.test")
+
+    try:
+        raise ValueError("broken")
+    except ValueError:
+        stats.problem(logger, "Konvertierungsproblem in e.xml")
+
+    stats.event("missing", "copyright")
+
+    assert [rec.levelno for rec in caplog.records] == [logging.ERROR]
+    assert caplog.records[0].exc_info[0] is ValueError
@@ -0,0 +1,388 @@
+# -*- coding: UTF-8 -*-
+"""Beschreibung
+
+##############################################################################
+#
+# Copyright (c) 2025 Verbundzentrale des GBV.
+# All Rights Reserved.
+#
+##############################################################################
+"""
+
+import logging
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+from vzg.jconv.bench.corpus import DIALECTS, CorpusGenerator, CorpusSpec
+from vzg.jconv.bench.gate import WORST_CASE_SECONDS, run_gate
+from vzg.jconv.bench.targets import TARGETS, Corpus, run_benchmarks
+
+
+def benchmark(options):
+    """Run the benchmarks and write the report"""
+    corpora = []
+
+    for kind in ("jats", "oai", "marc"):
+        for location in getattr(options, kind):
+            corpora.append(
+                Corpus(
+                    kind,
+                    Path(location),
+                    publisher=options.publisher,
+                    listrecords=options.listrecords,
+                )
+            )
+
+    targets = options.targets if len(options.targets) > 0 else list(TARGETS)
+
+    report = run_benchmarks(corpora, targets=targets, repeat=options.repeat)
+
+    if options.report == "-":
+        print(report.dumps())
+    else:
+        report.save(Path(options.report).absolute())
+
+
+def corpus(options):
+    """Generate a synthetic delivery"""
+    spec = CorpusSpec(
+        kind=options.kind,
+        dialect=options.dialect or DIALECTS[options.kind][0],
+        documents=options.documents,
+        max_bytes=options.max_bytes,
+        seed=options.seed,
+        authors=(options.min_authors, options.max_authors),
+        affiliations=options.affiliations,
+        abstract_paragraphs=options.abstract_paragraphs,
+        abstract_words=options.abstract_words,
+        keywords=options.keywords,
+        mathml=options.mathml,
+        tex=options.tex,
+        scripts=options.scripts,
+        body_paragraphs=options.body_paragraphs,
+        body_words=options.body_words,
+        records=options.records,
+    )
+
+    CorpusGenerator(spec).write(Path(options.zippath[0]).absolute())
+
+
+def gate(options):
+    """Compare the fixed benchmarks with the baseline, exit 1 on regressions"""
+    result = run_gate(
+        Path(options.baseline).absolute(),
+        update=options.update,
+        throughput_tolerance=options.throughput_tolerance,
+        memory_tolerance=options.memory_tolerance,
+        targets=options.targets if len(options.targets) > 0 else list(TARGETS),
+        rounds=options.rounds,
+        worst_case_seconds=options.worst_case_seconds,
+    )
+
+    for line in result.lines:
+        print(line)
+
+    if not result.passed:
+        print(f"{len(result.failures)} regression(s)")
+        sys.exit(1)
+
+
+def create_parser() -> ArgumentParser:
+    """Command line options"""
+    description = "Benchmarks of the conversion."
+
+    parser = ArgumentParser(description=description)
+
+    subparsers = parser.add_subparsers()
+
+    parser_run = subparsers.add_parser("run", help="Run benchmarks")
+
+    parser_run.add_argument(
+        "--jats",
+        dest="jats",
+        metavar="Location",
+        type=str,
+        action="append",
+        default=[],
+        help="ZIP/tar file, directory or glob pattern with JATS files",
+    )
+
+    parser_run.add_argument(
+        "--oai",
+        dest="oai",
+        metavar="Location",
+        type=str,
+        action="append",
+        default=[],
+        help="ZIP/tar file, directory or glob pattern with OAI records",
+    )
+
+    parser_run.add_argument(
+        "--marc",
+        dest="marc",
+        metavar="Location",
+        type=str,
+        action="append",
+        default=[],
+        help="(gzipped) ISO 2709 file or ZIP/tar file, directory or glob pattern "
+        "with MARCXML records",
+    )
+
+    parser_run.add_argument(
+        "-p",
+        "--publisher",
+        dest="publisher",
+        metavar="Publisher",
+        type=str,
+        default="cairn",
+        help="Article type of the OAI records. Values: [openedition|cairn]",
+    )
+
+    parser_run.add_argument(
+        "--listrecords",
+        dest="listrecords",
+        action="store_true",
+        default=False,
+        help="The OAI members are OAI-PMH ListRecords responses",
+    )
+
+    parser_run.add_argument(
+        "-t",
+        "--target",
+        dest="targets",
+        choices=tuple(TARGETS),
+        action="append",
+        default=[],
+        help="Benchmark only the converters, the archives or simple-conv "
+        "(default: all)",
+    )
+
+    parser_run.add_argument(
+        "-r",
+        "--repeat",
+        dest="repeat",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Convert every corpus N times",
+    )
+
+    parser_run.add_argument(
+        "-o",
+        "--report",
+        dest="report",
+        metavar="Report",
+        type=str,
+        default="-",
+        help="JSON report, '-' writes to stdout",
+    )
+
+    parser_run.set_defaults(func=benchmark)
+
+    parser_corpus = subparsers.add_parser(
+        "corpus", help="Generate a synthetic delivery as ZIP file"
+    )
+
+    parser_corpus.add_argument(
+        "-k",
+        "--kind",
+        dest="kind",
+        choices=tuple(DIALECTS),
+        default="jats",
+        help="Kind of the documents",
+    )
+
+    parser_corpus.add_argument(
+        "-d",
+        "--dialect",
+        dest="dialect",
+        choices=tuple(
+            dialect for dialects in DIALECTS.values() for dialect in dialects
+        ),
+        default=None,
+        help="JATS: springer, degruyter, emerald. OAI: cairn, openedition. "
+        "MARC: marcxml, binary (default: the first one)",
+    )
+
+    parser_corpus.add_argument(
+        "-n",
+        "--documents",
+        dest="documents",
+        metavar="N",
+        type=int,
+        default=100,
+        help="Number of documents (records)",
+    )
+
+    parser_corpus.add_argument(
+        "--max-bytes",
+        dest="max_bytes",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Stop after N uncompressed bytes",
+    )
+
+    parser_corpus.add_argument(
+        "-s",
+        "--seed",
+        dest="seed",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Seed, the same seed gives the same delivery",
+    )
+
+    parser_corpus.add_argument(
+        "--records",
+        dest="records",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Records per OAI ListRecords response or MARC collection",
+    )
+
+    for dest, default, text in (
+        ("min_authors", 1, "Minimal number of authors"),
+        ("max_authors", 6, "Maximal number of authors"),
+        ("affiliations", 3, "Maximal number of affiliations"),
+        ("abstract_paragraphs", 2, "Paragraphs of the abstract"),
+        ("abstract_words", 60, "Words per paragraph of the abstract"),
+        ("keywords", 5, "Number of keywords"),
+        ("body_paragraphs", 0, "Paragraphs of the full text"),
+        ("body_words", 120, "Words per paragraph of the full text"),
+    ):
+        parser_corpus.add_argument(
+            f"--{dest.replace('_', '-')}",
+            dest=dest,
+            metavar="N",
+            type=int,
+            default=default,
+            help=text,
+        )
+
+    for dest, text in (
+        ("mathml", "Probability of a MathML formula per sentence"),
+        ("tex", "Probability of a TeX formula per sentence"),
+        ("scripts", "Probability of sub- or superscript per word"),
+    ):
+        parser_corpus.add_argument(
+            f"--{dest}",
+            dest=dest,
+            metavar="P",
+            type=float,
+            default=0.0,
+            help=text,
+        )
+
+    parser_corpus.add_argument(
+        dest="zippath",
+        metavar="Zipfile",
+        type=str,
+        nargs=1,
+        help="Path of the delivery",
+    )
+
+    parser_corpus.set_defaults(func=corpus)
+
+    parser_gate = subparsers.add_parser(
+        "gate", help="Compare the fixed benchmarks with a stored baseline"
+    )
+
+    parser_gate.add_argument(
+        "-b",
+        "--baseline",
+        dest="baseline",
+        metavar="Baseline",
+        type=str,
+        default="bench-baseline.json",
+        help="JSON report of the baseline (default: bench-baseline.json)",
+    )
+
+    parser_gate.add_argument(
+        "--update",
+        dest="update",
+        action="store_true",
+        default=False,
+        help="Store the results as new baseline",
+    )
+
+    parser_gate.add_argument(
+        "--throughput-tolerance",
+        dest="throughput_tolerance",
+        metavar="Fraction",
+        type=float,
+        default=0.1,
+        help="Allowed drop of the documents per second (default: 0.1)",
+    )
+
+    parser_gate.add_argument(
+        "--memory-tolerance",
+        dest="memory_tolerance",
+        metavar="Fraction",
+        type=float,
+        default=0.1,
+        help="Allowed growth of the peak memory (default: 0.1)",
+    )
+
+    parser_gate.add_argument(
+        "-t",
+        "--target",
+        dest="targets",
+        choices=tuple(TARGETS),
+        action="append",
+        default=[],
+        help="Benchmark only the converters, the archives or simple-conv "
+        "(default: all)",
+    )
+
+    parser_gate.add_argument(
+        "--rounds",
+        dest="rounds",
+        metavar="N",
+        type=int,
+        default=3,
+        help="Run the benchmarks N times, the fastest round counts",
+    )
+
+    parser_gate.add_argument(
+        "--worst-case-seconds",
+        dest="worst_case_seconds",
+        metavar="Seconds",
+        type=float,
+        default=WORST_CASE_SECONDS,
+        help="Maximal seconds of a pathological document of production size, "
+        f"0 skips them (default: {WORST_CASE_SECONDS:g})",
+    )
+
+    parser_gate.set_defaults(func=gate)
+
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        dest="verbose",
+        action="store_true",
+        default=False,
+        help="be verbose",
+    )
+
+    return parser
+
+
+def run():
+    """Start the application"""
+    parser = create_parser()
+    options = parser.parse_args()
+
+    if not hasattr(options, "func"):
+        parser.print_help()
+        sys.exit(2)
+
+    logger = logging.getLogger()
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.WARNING)
+
+    if options.verbose:
+        logger.setLevel(logging.INFO)
+
+    options.func(options)
@@ -9,16 +9,36 @@
 ##############################################################################
 """
 
+import json
 import logging
+import sys
+import time
 import uuid
+from argparse import ArgumentParser
 from pathlib import Path
 import zipfile
 import tempfile
+from vzg.jconv.archives.checkpoint import Checkpoint, CheckpointSource
 from vzg.jconv.archives.oai import MarcArchive
+from vzg.jconv.archives.sources import open_source, source_name
 from vzg.jconv.archives.springer import ArchiveSpringer
 from vzg.jconv.archives.oai import ArchiveOAIDC
+from vzg.jconv.archives.watermark import Watermark
+from vzg.jconv.bench.fields import inspect_document
+from vzg.jconv.cache import ResultCache
 from vzg.jconv.converter.jats import JatsConverter
+from vzg.jconv.converter.snapshot import materialize
+from vzg.jconv.dedup import DEDUP_POLICIES, Deduplicator
 from vzg.jconv.gapi import OAI_ARTICLES_TYPES
+from vzg.jconv.index import ArticleIndex
+from vzg.jconv.interfaces import IArchive, ISink
+from vzg.jconv.metrics import STAGE_BUCKETS, MetricsExporter, create_exporter
+from vzg.jconv.profiling import PROFILE_FORMATS, RunProfiler, create_profiler
+from vzg.jconv.sinks.files import DirectorySink
+from vzg.jconv.sinks.jsonl import STDOUT, JsonLinesSink
+from vzg.jconv.sinks.sharded import MAX_OPEN_SHARDS, SHARD_KEYS, ShardedSink
+from vzg.jconv.sinks.ziparchive import COMPRESSION_METHODS, ZipSink
+from vzg.jconv.stats import Progress, Stats, collect, timed
 
 
 def fromarchive(options):
@@ -73,141 +93,698 @@ def fromarchive(options):
                         break
 
 
-def jats(options):
-    """Use a ZIP Archive as source."""
-    logger = logging.getLogger(__name__)
+def create_sink(options, name: str, positions: dict = None) -> ISink:
+    """Create the output sink selected by the options
+
+    Writing to stdout implies JSON Lines and no shards.
+    With positions the outputs of a former run are continued.
+    """
+    compression = None if options.compression == "none" else options.compression
+
+    if options.outdir == STDOUT:
+        return JsonLinesSink(STDOUT, compression=compression)
 
-    jpath = Path(options.jfiles[0]).absolute()
     opath = Path(options.outdir).absolute()
-    dst = opath / jpath.name
+    opath.mkdir(0o755, parents=True, exist_ok=True)
+
+    def create(path: Path, positions: dict = positions) -> ISink:
+        if options.output_format == "jsonl":
+            return JsonLinesSink(
+                path.with_name(f"{path.name}.jsonl"),
+                compression=compression,
+                max_records=options.rotate_records,
+                max_bytes=options.rotate_bytes,
+                positions=positions,
+            )
+
+        if options.output_format == "zip":
+            return ZipSink(
+                path.with_name(f"{path.name}.zip"),
+                method=options.zip_method,
+                compresslevel=options.compresslevel,
+                positions=positions,
+            )
+
+        return DirectorySink(path)
+
+    if options.shard_records > 0 or options.shard_bytes > 0 or options.shard_key:
+        return ShardedSink(
+            opath / name,
+            create,
+            max_records=options.shard_records,
+            max_bytes=options.shard_bytes,
+            key=SHARD_KEYS.get(options.shard_key),
+            max_open=options.shard_open,
+        )
+
+    if options.output_format == "files":
+        return DirectorySink(opath)
+
+    return create(opath / name)
+
+
+def create_cache(options) -> ResultCache | None:
+    """Open the result cache, if selected"""
+    if options.cache == "":
+        return None
+
+    cpath = Path(options.cache).absolute()
+    cpath.parent.mkdir(0o755, parents=True, exist_ok=True)
+
+    return ResultCache(cpath, max_bytes=options.cache_size * 1024 * 1024)
+
+
+def report_stats(options, runstats: Stats) -> None:
+    """Print the summary of the stats or write them as JSON"""
+    if options.stats is None:
+        return None
+
+    if options.stats == "-":
+        print(runstats.summary(), file=sys.stderr)
+        return None
+
+    spath = Path(options.stats).absolute()
+    spath.parent.mkdir(0o755, parents=True, exist_ok=True)
+    runstats.save(spath)
+
+
+def document_name(conv) -> str:
+    """Name of a document in the stats, the identifier of OAI records
+
+    The records of a ListRecords response share the name of the response.
+    """
+    identifier = getattr(getattr(conv, "header", None), "identifier", None)
+
+    if identifier:
+        return identifier
+
+    return getattr(conv, "name", "")
+
+
+def convert(options, archive: IArchive, name: str, describe) -> bool:
+    """Convert the documents of an archive and write the articles
+
+    The stats of the run are always collected and reported with
+    the --stats option. Missing fields and conversion problems are
+    logged once at the end, with their count. The profiler and the
+    metrics exporter are only created if they are selected.
+
+    Parameters
+    ----------
+    options : argparse.Namespace
+        Command line options
+    archive : IArchive
+        Source of the converters
+    name : str
+        Name of the output
+    describe : callable
+        Log message for a converter, gets the converter,
+        its index and the number of files
+
+    Returns
+    -------
+    bool
+        False if the conversion was stopped
+    """
+    buckets = None if options.metrics is None else STAGE_BUCKETS
+    runstats = Stats(slowest=options.slowest, buckets=buckets)
+    profiler = create_profiler(options)
+    exporter = create_exporter(options, runstats)
+
+    try:
+        with collect(runstats):
+            return convert_documents(
+                options, archive, name, describe, runstats, profiler, exporter
+            )
+    finally:
+        if profiler is not None:
+            profiler.close()
+
+        runstats.log_events()
+        report_stats(options, runstats)
+
+        if exporter is not None:
+            exporter.write()
+
+
+def convert_documents(
+    options,
+    archive: IArchive,
+    name: str,
+    describe,
+    runstats: Stats,
+    profiler: RunProfiler = None,
+    exporter: MetricsExporter = None,
+) -> bool:
+    """The conversion of `convert`, the stats are collected
+
+    The lines of the single documents and articles are logged
+    as debug messages, the progress at most once per interval.
+    """
+    logger = logging.getLogger(__name__)
+    debug = logger.isEnabledFor(logging.DEBUG)
+
     deliverysignature = uuid.uuid4()
+    num_files = archive.num_files
+    start = 0
+
+    checkpoint = None
+    if not options.dry_run and options.outdir != STDOUT:
+        opath = Path(options.outdir).absolute()
+        checkpoint = Checkpoint(
+            opath / f"{name}.checkpoint", interval=options.checkpoint_interval
+        )
+
+        if not options.resume:
+            # The outputs are replaced, an old checkpoint is invalid
+            checkpoint.path.unlink(missing_ok=True)
+            checkpoint = None
+        elif getattr(archive, "source", None) is None:
+            # Binary MARC files have no members to skip
+            sys.exit(f"{name} cannot be resumed, the source has no members")
+        elif checkpoint.load() and checkpoint.finished:
+            msg = f"{name} has already been converted"
+            logger.info(msg)
+            return True
+
+    if checkpoint is not None:
+        deliverysignature = checkpoint.signature
+        start = checkpoint.counter
+        archive.source = CheckpointSource(archive.source, checkpoint)
+
+        # Keys of documents, which are not committed, are not skipped
+        dedup = getattr(archive, "dedup", None)
+        if dedup is not None:
+            checkpoint.commits.append(dedup.flush)
+
+    sink = None
+    index = None
+    if not options.dry_run:
+        positions = None if checkpoint is None else checkpoint.positions
+        sink = create_sink(options, name, positions=positions)
+
+        if checkpoint is not None:
+            checkpoint.sink = sink
+
+        if options.index != "":
+            index = ArticleIndex(Path(options.index).absolute())
+
+            if checkpoint is not None:
+                checkpoint.index = index
+
+    # The records of ListRecords responses and the members of streamed
+    # sources are not counted beforehand
+    total = None if getattr(archive, "listrecords", False) else num_files
+    progress = Progress(
+        runstats, total=total, interval=options.progress_interval, start=start
+    )
 
-    if not opath.exists():
-        opath.mkdir(0o755, parents=True)
+    try:
+        mark = time.perf_counter()
+        converters = timed(archive.converters, "parse")
 
-    with zipfile.ZipFile(dst, "w") as jsonarchive:
-        converter_kwargs = {"validate": options.validate}
-        if options.publisher != "":
-            converter_kwargs["publisher"] = options.publisher
+        if profiler is not None:
+            profiler.start(start)
 
-        xmlarchive = ArchiveSpringer(jpath, converter_kwargs=converter_kwargs)
-        num_xml = float(xmlarchive.num_files)
+        for i, conv in enumerate(converters, start=start):
+            if debug:
+                logger.debug(describe(conv, i, num_files))
 
-        for i, jconv in enumerate(xmlarchive.converters):
-            xpercent = i / num_xml * 100
-            msg = f"{jconv.name} ({xpercent:.2f}%)"
-            logger.info(msg)
+            with runstats.timer("extract"):
+                conv.run()
 
-            jconv.run()
+                # Nothing is written in a dry run
+                if sink is not None:
+                    materialize(conv)
 
-            anum = len(jconv.articles)
-            msg = f"\t{anum} article(s)"
-            logger.info(msg)
+            anum = len(conv.articles)
+            if debug:
+                msg = f"\t{anum} article(s)"
+                logger.debug(msg)
 
-            if options.dry_run is False:
-                for j, article in enumerate(jconv.articles):
+            if sink is not None:
+                for j, article in enumerate(conv.articles):
                     aname = f"{deliverysignature}-{i}-{j}.json"
-                    logger.info(aname)
-                    jsonarchive.writestr(
-                        aname, article.json, compress_type=zipfile.ZIP_DEFLATED
-                    )
+                    if debug:
+                        logger.debug(aname)
+                    data = article.json
+                    runstats.count("bytes", len(data))
+
+                    with runstats.timer("write"):
+                        location = sink.write(aname, data)
 
-            if options.stop and jconv.validation_failed:
+                        if checkpoint is not None:
+                            checkpoint.output(location)
+
+                        if index is not None:
+                            index.add(data, deliverysignature, location)
+
+            if checkpoint is not None:
+                checkpoint.counter = i + 1
+
+            runstats.count("documents")
+            runstats.count("articles", anum)
+
+            if conv.validation_failed:
+                runstats.count("validation_failed")
+            elif anum == 0:
+                runstats.count("empty")
+
+            now = time.perf_counter()
+            runstats.document(document_name(conv), i, now - mark)
+            mark = now
+
+            progress.update(now, i + 1)
+
+            if exporter is not None:
+                exporter.update(now)
+
+            if profiler is not None:
+                profiler.document(i)
+
+            if options.stop and conv.validation_failed:
                 msg = "Validation problem"
                 logger.info(msg)
-                break
+                return False
 
-            del jconv
+            del conv
 
+        progress.report(time.perf_counter())
 
-def marc(options):
-    """Use a OAI responses as source"""
-    logger = logging.getLogger(__name__)
+        if checkpoint is not None:
+            checkpoint.finished = True
+            checkpoint.save()
+    finally:
+        if sink is not None:
+            sink.close()
 
-    deliverysignature = uuid.uuid4()
-    opath = Path(options.outdir).absolute()
+        if index is not None:
+            index.close()
 
-    archive = MarcArchive(
-        Path(options.zippath[0]),
-        validate=options.validate,
+    return True
+
+
+def jats(options):
+    """Use a ZIP Archive as source."""
+    jpath = Path(options.jfiles[0])
+
+    converter_kwargs = {"validate": options.validate}
+    if options.publisher != "":
+        converter_kwargs["publisher"] = options.publisher
+
+    cache = create_cache(options)
+
+    dedup = None
+    if options.dedup != "":
+        dedup = Deduplicator(
+            Path(options.dedup).absolute(),
+            policy=DEDUP_POLICIES(options.dedup_policy),
+            capacity=options.dedup_capacity,
+        )
+
+    xmlarchive = ArchiveSpringer(
+        jpath, converter_kwargs=converter_kwargs, cache=cache, dedup=dedup
     )
-    num_res = float(archive.num_files)
 
-    for i, conv in enumerate(archive.converters):
-        xpercent = i / num_res * 100
-        msg = f"{xpercent:.2f}%"
-        logger.info(msg)
+    def describe(jconv, i, num_xml):
+        if num_xml is None:
+            return jconv.name
 
-        conv.run()
+        xpercent = i / num_xml * 100
+        return f"{jconv.name} ({xpercent:.2f}%)"
 
-        anum = len(conv.articles)
-        msg = f"\t{anum} article(s)"
-        logger.info(msg)
+    try:
+        convert(options, xmlarchive, source_name(jpath), describe)
 
-        if options.dry_run is False:
-            for j, article in enumerate(conv.articles):
-                aname = f"{deliverysignature}-{i}-{j}.json"
-                logger.info(aname)
-                jpath = opath / aname
+        # The outputs are closed, their documents are skipped from now on
+        if dedup is not None and not options.dry_run:
+            dedup.flush()
+    finally:
+        if cache is not None:
+            cache.close()
 
-                with jpath.open("w") as jfh:
-                    jfh.write(article.json)
+        if dedup is not None:
+            dedup.close()
 
-        if options.stop and conv.validation_failed:
-            msg = "Validation problem"
-            logger.info(msg)
-            break
 
-        del conv
+def marc(options):
+    """Use MARCXML or binary MARC records as source"""
+    cache = create_cache(options)
+
+    archive = MarcArchive(
+        Path(options.zippath[0]),
+        cache=cache,
+        validate=options.validate,
+    )
+
+    def describe(conv, i, num_res):
+        if num_res is None:
+            return conv.name
 
+        xpercent = i / num_res * 100
+        return f"{xpercent:.2f}%"
 
-def oai(options):
-    """Use a MARC responses as source"""
-    logger = logging.getLogger(__name__)
+    try:
+        convert(options, archive, source_name(options.zippath[0]), describe)
+    finally:
+        if cache is not None:
+            cache.close()
 
-    deliverysignature = uuid.uuid4()
-    opath = Path(options.outdir).absolute()
 
+def oai(options):
+    """Use OAI responses as source"""
     atype = getattr(OAI_ARTICLES_TYPES, options.publisher, OAI_ARTICLES_TYPES.unknown)
 
+    watermark = None
+    if options.watermark != "":
+        setname = options.setname if options.setname != "" else options.publisher
+        watermark = Watermark(Path(options.watermark).absolute(), setname)
+
+    cache = create_cache(options)
+
     archive = ArchiveOAIDC(
         options.zippath[0],
         converter_kwargs={"article_type": atype, "validate": options.validate},
+        listrecords=options.listrecords,
+        watermark=watermark,
+        cache=cache,
     )
-    num_res = float(archive.num_files)
 
-    for i, conv in enumerate(archive.converters):
+    def describe(conv, i, num_res):
+        if options.listrecords or num_res is None:
+            return f"{conv.header.identifier} ({conv.name})"
+
         xpercent = i / num_res * 100
-        msg = f"{conv.header.identifier} ({xpercent:.2f}%)"
-        logger.info(msg)
+        return f"{conv.header.identifier} ({xpercent:.2f}%)"
 
-        conv.run()
+    try:
+        completed = convert(options, archive, source_name(options.zippath[0]), describe)
+    finally:
+        if cache is not None:
+            cache.close()
 
-        anum = len(conv.articles)
-        msg = f"\t{anum} article(s)"
-        logger.info(msg)
+    if completed and watermark is not None and options.dry_run is False:
+        watermark.save()
 
-        if options.dry_run is False:
-            for j, article in enumerate(conv.articles):
-                aname = f"{deliverysignature}-{i}-{j}.json"
-                logger.info(aname)
-                jpath = opath / aname
 
-                with jpath.open("w") as jfh:
-                    jfh.write(article.json)
+def lookup(options):
+    """Show where articles have been written"""
+    index = ArticleIndex(Path(options.index).absolute())
 
-        if options.stop and conv.validation_failed:
-            msg = "Validation problem"
-            logger.info(msg)
-            break
+    try:
+        for identifier in options.identifiers:
+            for entry in index.lookup(identifier):
+                print(json.dumps(entry))
+    finally:
+        index.close()
 
-        del conv
 
+def inspect(options):
+    """Show the extraction times of the fields of a JATS document"""
+    location = Path(options.location[0])
 
-def run():
-    """Start the application"""
-    from argparse import ArgumentParser
+    def run_inspection(jatspath: Path, name: str):
+        inspection = inspect_document(jatspath, name=name, repeat=options.repeat)
+
+        if options.json:
+            print(json.dumps(inspection.as_dict(), indent=2))
+        else:
+            print(inspection.summary(top=options.top))
+
+    if options.member == "":
+        run_inspection(location, location.name)
+        return None
+
+    for member in open_source(location).members:
+        if options.member not in (member.name, Path(member.name).name):
+            continue
+
+        if member.path is not None:
+            run_inspection(member.path, member.name)
+            return None
+
+        with tempfile.NamedTemporaryFile("w+b") as tmpfh:
+            tmpfh.write(member.read())
+            tmpfh.flush()
+
+            run_inspection(Path(tmpfh.name), member.name)
+
+        return None
+
+    sys.exit(f"{options.member} not found in {location}")
+
+
+def add_cache_arguments(parser) -> None:
+    """Options of the result cache"""
+    parser.add_argument(
+        "--cache",
+        dest="cache",
+        metavar="Cache file",
+        type=str,
+        default="",
+        help="SQLite database with the results of former conversions",
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        dest="cache_size",
+        metavar="MiB",
+        type=int,
+        default=0,
+        help="Maximal size of the cache, least recently used results are removed",
+    )
+
+
+def add_stats_arguments(parser) -> None:
+    """Options of the stats of a run"""
+    parser.add_argument(
+        "--stats",
+        dest="stats",
+        metavar="Stats file",
+        type=str,
+        default=None,
+        help="Write the stage times and counters as JSON, "
+        "'-' prints a summary to stderr",
+    )
+
+    parser.add_argument(
+        "--progress-interval",
+        dest="progress_interval",
+        metavar="Seconds",
+        type=float,
+        default=10,
+        help="Log the progress with -v at most once per interval, "
+        "0 disables it (default: 10)",
+    )
+
+    parser.add_argument(
+        "--metrics",
+        dest="metrics",
+        metavar="Textfile",
+        type=str,
+        default=None,
+        help="Write the counters and stage histograms periodically to a "
+        "textfile of the node exporter, the name must end with .prom. "
+        "The publisher label is unknown without --publisher",
+    )
+
+    parser.add_argument(
+        "--metrics-interval",
+        dest="metrics_interval",
+        metavar="Seconds",
+        type=float,
+        default=15,
+        help="Minimal seconds between two writes of the metrics (default: 15)",
+    )
+
+    parser.add_argument(
+        "--slowest",
+        dest="slowest",
+        metavar="N",
+        type=int,
+        default=10,
+        help="Number of the slowest documents in the stats (default: 10)",
+    )
+
+
+def add_profile_arguments(parser) -> None:
+    """Options of the profiling of a run"""
+    parser.add_argument(
+        "--profile",
+        dest="profile",
+        metavar="Profile file",
+        type=str,
+        default=None,
+        help="Profile the run with cProfile, {pid} in the name is replaced "
+        "by the process id",
+    )
+
+    parser.add_argument(
+        "--profile-format",
+        dest="profile_format",
+        choices=PROFILE_FORMATS,
+        default="pstats",
+        help="pstats file or collapsed stacks for flame graphs (default: pstats)",
+    )
+
+    parser.add_argument(
+        "--profile-every",
+        dest="profile_every",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Profile only every N-th document (default: 1)",
+    )
+
+    parser.add_argument(
+        "--tracemalloc",
+        dest="tracemalloc",
+        metavar="Tracemalloc file",
+        type=str,
+        default=None,
+        help="Write the top allocators of tracemalloc snapshots, {pid} in "
+        "the name is replaced by the process id",
+    )
+
+    parser.add_argument(
+        "--tracemalloc-every",
+        dest="tracemalloc_every",
+        metavar="N",
+        type=int,
+        default=100,
+        help="Take a snapshot after every N documents (default: 100)",
+    )
+
+    parser.add_argument(
+        "--tracemalloc-top",
+        dest="tracemalloc_top",
+        metavar="N",
+        type=int,
+        default=20,
+        help="Number of the allocating lines per snapshot (default: 20)",
+    )
+
+
+def add_output_arguments(parser, output_format: str) -> None:
+    """Options of the output sinks"""
+    parser.add_argument(
+        "-f",
+        "--output-format",
+        dest="output_format",
+        choices=("files", "jsonl", "zip"),
+        default=output_format,
+        help=f"One JSON file per article, JSON Lines or a ZIP file "
+        f"(default: {output_format})",
+    )
 
+    parser.add_argument(
+        "--compression",
+        dest="compression",
+        choices=("none", "gzip", "bz2", "lzma"),
+        default="none",
+        help="Compression of JSON Lines output",
+    )
+
+    parser.add_argument(
+        "--zip-method",
+        dest="zip_method",
+        choices=tuple(COMPRESSION_METHODS),
+        default="deflated",
+        help="Compression method of ZIP output",
+    )
+
+    parser.add_argument(
+        "--compresslevel",
+        dest="compresslevel",
+        metavar="Level",
+        type=int,
+        default=None,
+        help="Compression level of ZIP output",
+    )
+
+    parser.add_argument(
+        "--shard-records",
+        dest="shard_records",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Split the output into shards of N articles",
+    )
+
+    parser.add_argument(
+        "--shard-bytes",
+        dest="shard_bytes",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Split the output into shards of N bytes",
+    )
+
+    parser.add_argument(
+        "--shard-key",
+        dest="shard_key",
+        choices=tuple(SHARD_KEYS),
+        default=None,
+        help="Partition the output by publisher (primary_id type) or journal ISSN",
+    )
+
+    parser.add_argument(
+        "--shard-open",
+        dest="shard_open",
+        metavar="N",
+        type=int,
+        default=MAX_OPEN_SHARDS,
+        help=f"Keep at most N shards open (default: {MAX_OPEN_SHARDS})",
+    )
+
+    parser.add_argument(
+        "--index",
+        dest="index",
+        metavar="Index file",
+        type=str,
+        default="",
+        help="SQLite index of the DOIs and primary ids of the written articles",
+    )
+
+    parser.add_argument(
+        "--resume",
+        dest="resume",
+        action="store_true",
+        default=False,
+        help="Write checkpoints and continue an interrupted conversion "
+        "from the last one",
+    )
+
+    parser.add_argument(
+        "--checkpoint-interval",
+        dest="checkpoint_interval",
+        metavar="Seconds",
+        type=float,
+        default=60,
+        help="Minimal time between two checkpoints (default: 60)",
+    )
+
+    parser.add_argument(
+        "--rotate-records",
+        dest="rotate_records",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Start a new JSON Lines file after N articles",
+    )
+
+    parser.add_argument(
+        "--rotate-bytes",
+        dest="rotate_bytes",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Start a new JSON Lines file after N bytes",
+    )
+
+
+def create_parser() -> ArgumentParser:
+    """Command line options"""
     description = "Simple conversion tool."
 
     parser = ArgumentParser(description=description)
@@ -232,7 +809,7 @@ def run():
         metavar="Output directory",
         type=str,
         default="output",
-        help="Directory of JSON files",
+        help="Directory of JSON files, '-' writes JSON Lines to stdout",
     )
 
     parser_marc.add_argument(
@@ -256,9 +833,18 @@ def run():
         metavar="Zipfile",
         type=str,
         nargs=1,
-        help="Zipfile with MARC records",
+        help="(gzipped) ISO 2709 file or ZIP/tar file, directory or glob pattern "
+        "with MARCXML records",
     )
 
+    add_output_arguments(parser_marc, "files")
+
+    add_cache_arguments(parser_marc)
+
+    add_stats_arguments(parser_marc)
+
+    add_profile_arguments(parser_marc)
+
     parser_marc.set_defaults(func=marc)
 
     parser_oai = subparsers.add_parser("oai", help="Convert OAI responses")
@@ -283,6 +869,32 @@ def run():
         help="""The name of the publisher. Values: [openedition|cairn]""",
     )
 
+    parser_oai.add_argument(
+        "--listrecords",
+        dest="listrecords",
+        action="store_true",
+        default=False,
+        help="The ZIP members are OAI-PMH ListRecords responses",
+    )
+
+    parser_oai.add_argument(
+        "--watermark",
+        dest="watermark",
+        metavar="Watermark file",
+        type=str,
+        default="",
+        help="Skip records converted in former runs and remember the new ones",
+    )
+
+    parser_oai.add_argument(
+        "--set",
+        dest="setname",
+        metavar="Source set",
+        type=str,
+        default="",
+        help="Name of the source set in the watermark file (default: publisher)",
+    )
+
     parser_oai.add_argument(
         "-o",
         "--output-directory",
@@ -290,7 +902,7 @@ def run():
         metavar="Output directory",
         type=str,
         default="output",
-        help="Directory of JSON files",
+        help="Directory of JSON files, '-' writes JSON Lines to stdout",
     )
 
     parser_oai.add_argument(
@@ -314,9 +926,17 @@ def run():
         metavar="Zipfile",
         type=str,
         nargs=1,
-        help="Zipfile with OAI records",
+        help="ZIP/tar file, directory or glob pattern with OAI records",
     )
 
+    add_output_arguments(parser_oai, "files")
+
+    add_cache_arguments(parser_oai)
+
+    add_stats_arguments(parser_oai)
+
+    add_profile_arguments(parser_oai)
+
     parser_oai.set_defaults(func=oai)
 
     parser_springer = subparsers.add_parser(
@@ -350,7 +970,7 @@ def run():
         metavar="Output directory",
         type=str,
         default="output",
-        help="Directory of JSON files",
+        help="Directory of JSON files, '-' writes JSON Lines to stdout",
     )
 
     parser_springer.add_argument(
@@ -374,11 +994,122 @@ def run():
         metavar="ZIP-File",
         type=str,
         nargs=1,
-        help="ZIP file with JATS files",
+        help="ZIP/tar file, directory or glob pattern with JATS files",
+    )
+
+    parser_springer.add_argument(
+        "--dedup",
+        dest="dedup",
+        metavar="Dedup file",
+        type=str,
+        default="",
+        help="SQLite store of the DOIs and publication types of former deliveries",
+    )
+
+    parser_springer.add_argument(
+        "--dedup-policy",
+        dest="dedup_policy",
+        choices=[policy.value for policy in DEDUP_POLICIES],
+        default=DEDUP_POLICIES.skip.value,
+        help="Skip duplicates, convert them as usual or mark them as updates",
+    )
+
+    parser_springer.add_argument(
+        "--dedup-capacity",
+        dest="dedup_capacity",
+        metavar="N",
+        type=int,
+        default=1000000,
+        help="Expected number of articles of the Bloom filter",
     )
 
+    add_output_arguments(parser_springer, "zip")
+
+    add_cache_arguments(parser_springer)
+
+    add_stats_arguments(parser_springer)
+
+    add_profile_arguments(parser_springer)
+
     parser_springer.set_defaults(func=jats)
 
+    parser_lookup = subparsers.add_parser(
+        "lookup", help="Find converted articles by DOI or primary id"
+    )
+
+    parser_lookup.add_argument(
+        "-i",
+        "--index",
+        dest="index",
+        metavar="Index file",
+        type=str,
+        required=True,
+        help="SQLite index written with --index",
+    )
+
+    parser_lookup.add_argument(
+        dest="identifiers",
+        metavar="ID",
+        type=str,
+        nargs="+",
+        help="DOI or primary id",
+    )
+
+    parser_lookup.set_defaults(func=lookup)
+
+    parser_inspect = subparsers.add_parser(
+        "inspect", help="Time the extraction of the fields of a JATS document"
+    )
+
+    parser_inspect.add_argument(
+        "-m",
+        "--member",
+        dest="member",
+        metavar="Member",
+        type=str,
+        default="",
+        help="Name of the document within the ZIP/tar file, directory "
+        "or glob pattern",
+    )
+
+    parser_inspect.add_argument(
+        "-r",
+        "--repeat",
+        dest="repeat",
+        metavar="N",
+        type=int,
+        default=1,
+        help="Convert the document N times",
+    )
+
+    parser_inspect.add_argument(
+        "-t",
+        "--top",
+        dest="top",
+        metavar="N",
+        type=int,
+        default=0,
+        help="Show only the N slowest fields (default: all)",
+    )
+
+    parser_inspect.add_argument(
+        "--json",
+        dest="json",
+        action="store_true",
+        default=False,
+        help="Print the breakdown as JSON",
+    )
+
+    parser_inspect.add_argument(
+        dest="location",
+        metavar="Location",
+        type=str,
+        nargs=1,
+        help="JATS file, or ZIP/tar file, directory or glob pattern with --member",
+    )
+
+    parser_inspect.set_defaults(func=inspect)
+
     parser.add_argument(
         "--logfile", default="", dest="logfile", metavar="Logfile", type=str, nargs="?"
     )
@@ -392,8 +1123,31 @@ def run():
         help="be verbose",
     )
 
+    parser.add_argument(
+        "--debug",
+        dest="debug",
+        action="store_true",
+        default=False,
+        help="Log every document and article",
+    )
+
+    return parser
+
+
+def run():
+    """Start the application"""
+    parser = create_parser()
     options = parser.parse_args()
 
+    if getattr(options, "resume", False) and (
+        options.shard_records > 0 or options.shard_bytes > 0 or options.shard_key
+    ):
+        parser.error("--resume cannot be combined with shards")
+
+    metrics = getattr(options, "metrics", None)
+    if metrics is not None and not metrics.endswith(".prom"):
+        parser.error("the name of the --metrics textfile must end with .prom")
+
     logger = logging.getLogger()
 
     loghandler = logging.StreamHandler()
@@ -408,4 +1162,7 @@ def run():
     if options.verbose:
         logger.setLevel(logging.INFO)
 
+    if options.debug:
+        logger.setLevel(logging.DEBUG)
+
     options.func(options)
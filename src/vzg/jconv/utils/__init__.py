@@ -20,10 +20,11 @@ from vzg.jconv.gapi import JATS_PUBTYPE_SUFFIX
 TEXREX = re.compile(r"(\${1,2}.*\${1,2})")
 # Upper case greek letters within a formula
 GREEX = re.compile(r"\\up(\w+)")
-# Subscript
-SUBREX = re.compile(r"(\s*)(\w+)<sub>(.*?)\</sub>")
+# Subscript, a match starts only at the beginning of a word, otherwise
+# every position of long words and whitespace runs is tried
+SUBREX = re.compile(r"\b(\w+)<sub>(.*?)\</sub>")
 # Superscript
-SUPREX = re.compile(r"(\s*)(\w+)<sup>(.*?)\</sup>")
+SUPREX = re.compile(r"\b(\w+)<sup>(.*?)\</sup>")
 # Strip the chars from a line
 STRIPCHARS = re.compile(r"\s+")
 
@@ -66,15 +67,11 @@ def node2text(node: etree._Element) -> str:
     nodetext = nodebytes.decode()
 
     def repl_sup(matchobj):
-        gc_ = "{0}$ {1}^{{{2}}} $".format(
-            matchobj.group(1), matchobj.group(2), matchobj.group(3)
-        )
+        gc_ = "$ {0}^{{{1}}} $".format(matchobj.group(1), matchobj.group(2))
         return gc_
 
     def repl_sub(matchobj):
-        gc_ = "{0}$ {1}_{{{2}}} $".format(
-            matchobj.group(1), matchobj.group(2), matchobj.group(3)
-        )
+        gc_ = "$ {0}_{{{1}}} $".format(matchobj.group(1), matchobj.group(2))
         return gc_
 
     nodetext = SUPREX.sub(repl_sup, nodetext)